@@ -0,0 +1,64 @@
+"""Engine benchmarks: classify_tier, map_dimensions and the full gate cycle.
+
+Import only after DRAFT_DB_PATH points at a scratch database (run.py does
+this); the cycle benchmark writes real rows through SQLite storage.
+"""
+
+from benchmarks.common import measure
+from benchmarks.corpus import CONTEXTS, MESSAGES
+from benchmarks.provider_modes import provider_mode
+from draft_protocol import engine, storage
+
+MAP_MODES = ("keyword", "embedding", "llm")
+
+
+def bench_classify(iterations: int) -> dict:
+    """classify_tier throughput over the message corpus (one pass = one op)."""
+    results = {}
+    for mode in ("keyword", "llm"):
+        with provider_mode(mode):
+            stats = measure(lambda: [engine.classify_tier(m) for m in MESSAGES], iterations)
+        stats["messages_per_sec"] = round(stats["ops_per_sec"] * len(MESSAGES), 2)
+        results[mode] = stats
+    return results
+
+
+def bench_map(iterations: int) -> dict:
+    """map_dimensions latency per provider mode and context size, fresh session per call."""
+    results = {}
+    for mode in MAP_MODES:
+        with provider_mode(mode):
+            for size, context in CONTEXTS.items():
+                results[f"{mode}_{size}"] = measure(
+                    lambda sid, ctx=context: engine.map_dimensions(sid, ctx),
+                    iterations,
+                    setup=lambda: storage.create_session("TASK", "benchmark"),
+                )
+    return results
+
+
+def _cycle(context: str) -> None:
+    tier, _, _ = engine.classify_tier("build a governance service for tool calls")
+    sid = storage.create_session(tier, "build a governance service for tool calls")
+    dims = engine.map_dimensions(sid, context)
+    answers = {
+        fk: f"Benchmark answer for {fk}"
+        for dk, fields in dims.items()
+        if not fields.get("_screened")
+        for fk in fields
+        if not fk.startswith("_")
+    }
+    engine.confirm_batch(sid, answers)
+    assumptions = engine.generate_assumptions(sid)
+    if assumptions:
+        engine.verify_batch(sid, {str(i): True for i in range(len(assumptions))})
+    gate = engine.check_gate(sid)
+    if not gate["passed"]:
+        raise RuntimeError(f"Benchmark cycle did not pass the gate: {gate['blockers']}")
+    storage.close_session(sid)
+
+
+def bench_cycle(iterations: int) -> dict:
+    """Full intake -> map -> confirm -> assumptions -> verify -> gate cycle on SQLite."""
+    with provider_mode("keyword"):
+        return {"keyword_medium": measure(lambda: _cycle(CONTEXTS["medium"]), iterations)}
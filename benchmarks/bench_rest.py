@@ -0,0 +1,62 @@
+"""REST throughput: requests/sec against an in-process server on a free port."""
+
+import http.client
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from benchmarks.common import summarize
+from benchmarks.provider_modes import provider_mode
+from draft_protocol.rest import DraftHandler
+
+REQUESTS = {
+    "health": ("GET", "/health", None),
+    "classify": ("POST", "/classify", {"message": "implement a caching layer for the API client"}),
+}
+
+
+def _client(port: int, method: str, path: str, body: dict | None, count: int, samples: list[float]) -> None:
+    payload = json.dumps(body).encode() if body is not None else None
+    headers = {"Content-Type": "application/json"} if payload is not None else {}
+    for _ in range(count):
+        t0 = time.perf_counter()
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        conn.request(method, path, body=payload, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        conn.close()
+        if resp.status != 200:
+            raise RuntimeError(f"{method} {path} -> HTTP {resp.status}")
+        samples.append(time.perf_counter() - t0)
+
+
+def bench_rest(requests_per_client: int, clients: int = 4) -> dict:
+    """Drive each endpoint from `clients` concurrent connections; report requests/sec."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DraftHandler)
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    results = {}
+    try:
+        with provider_mode("keyword"):
+            for name, (method, path, body) in REQUESTS.items():
+                samples: list[float] = []
+                workers = [
+                    threading.Thread(target=_client, args=(port, method, path, body, requests_per_client, samples))
+                    for _ in range(clients)
+                ]
+                t0 = time.perf_counter()
+                for w in workers:
+                    w.start()
+                for w in workers:
+                    w.join()
+                wall = time.perf_counter() - t0
+                stats = summarize(samples)
+                stats["requests_per_sec"] = round(len(samples) / wall, 2)
+                stats["clients"] = clients
+                results[name] = stats
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
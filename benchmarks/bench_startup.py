@@ -0,0 +1,76 @@
+"""Import-time and cold-start benchmarks.
+
+Each sample runs in a fresh interpreter so module caches, the SQLite file
+and provider state are genuinely cold — this is what a serverless classify
+worker pays on every start.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 15]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Scenario name -> code executed in a fresh interpreter.
+SCENARIOS = {
+    "import_package": "import draft_protocol",
+    "import_engine": "import draft_protocol.engine",
+    "cold_classify": "import draft_protocol; draft_protocol.classify_tier('check the deploy status')",
+    "cold_create_session": "import draft_protocol; draft_protocol.create_session('TASK', 'build a CSV parser')",
+}
+
+_TIMER = """
+import time
+_t0 = time.perf_counter()
+{code}
+print(time.perf_counter() - _t0)
+"""
+
+
+def _run_once(code: str, db_dir: str) -> float:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(SRC), env.get("PYTHONPATH", "")) if p)
+    # Fresh, not-yet-existing DB per run: measures first-use initialization too
+    env["DRAFT_DB_PATH"] = os.path.join(tempfile.mkdtemp(dir=db_dir), "sub", "draft.db")
+    env.setdefault("DRAFT_DEV_MODE", "1")
+    out = subprocess.run(
+        [sys.executable, "-c", _TIMER.format(code=code)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def run(runs: int = 15) -> dict:
+    """Run all startup scenarios. Returns {scenario: {median_ms, p95_ms, runs}}."""
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as db_dir:
+        for name, code in SCENARIOS.items():
+            samples = sorted(_run_once(code, db_dir) * 1000 for _ in range(runs))
+            results[name] = {
+                "median_ms": round(statistics.median(samples), 3),
+                "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+                "runs": runs,
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15, help="Fresh interpreters per scenario (default: 15)")
+    args = parser.parse_args()
+    print(json.dumps({"startup": run(args.runs)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
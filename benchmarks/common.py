@@ -0,0 +1,43 @@
+"""Shared timing helpers for the benchmark suite."""
+
+import statistics
+import time
+from collections.abc import Callable
+
+
+def measure(
+    fn: Callable[..., object],
+    iterations: int,
+    warmup: int = 3,
+    setup: Callable[[], object] | None = None,
+) -> dict:
+    """Time fn() `iterations` times after `warmup` untimed calls.
+
+    If setup is given, it runs untimed before each call and its return
+    value is passed to fn (e.g. a fresh session ID).
+    Returns ops_per_sec plus mean/p50/p95/max latency in milliseconds.
+    """
+    samples = []
+    for i in range(warmup + iterations):
+        args = (setup(),) if setup is not None else ()
+        t0 = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - t0
+        if i >= warmup:
+            samples.append(elapsed)
+    return summarize(samples)
+
+
+def summarize(samples: list[float]) -> dict:
+    """Summarize per-operation wall times (seconds) into a stats dict."""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    n = len(ordered)
+    return {
+        "ops_per_sec": round(n / total, 2) if total else 0.0,
+        "mean_ms": round(total / n * 1000, 4),
+        "p50_ms": round(statistics.median(ordered) * 1000, 4),
+        "p95_ms": round(ordered[min(n - 1, int(n * 0.95))] * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+        "iterations": n,
+    }
@@ -0,0 +1,42 @@
+"""Provider modes for benchmarks, backed by the bundled mock provider server.
+
+LLM and embedding modes talk HTTP to draft_protocol.mock_provider, so the
+real provider code (request building, JSON parsing, urllib) is measured.
+"""
+
+import contextlib
+from collections.abc import Iterator
+
+from draft_protocol import engine, providers
+from draft_protocol.mock_provider import MockProviderServer
+
+_server: MockProviderServer | None = None
+
+
+def mock_server() -> MockProviderServer:
+    """Shared zero-latency mock server, started on first use."""
+    global _server
+    if _server is None:
+        _server = MockProviderServer().start()
+    return _server
+
+
+@contextlib.contextmanager
+def provider_mode(mode: str) -> Iterator[None]:
+    """Temporarily configure providers for "keyword", "embedding" or "llm" mode."""
+    saved = (providers.LLM_PROVIDER, providers.LLM_MODEL, providers.EMBED_MODEL, providers.API_BASE)
+    if mode == "keyword":
+        providers.LLM_PROVIDER, providers.LLM_MODEL, providers.EMBED_MODEL = "none", "", ""
+    else:
+        providers.LLM_PROVIDER = "ollama"
+        providers.LLM_MODEL = "mock-llm" if mode == "llm" else ""
+        providers.EMBED_MODEL = "mock-embed"
+        providers.API_BASE = mock_server().url
+    engine._field_question_embeddings.clear()
+    engine._chunk_embeddings.clear()
+    try:
+        yield
+    finally:
+        providers.LLM_PROVIDER, providers.LLM_MODEL, providers.EMBED_MODEL, providers.API_BASE = saved
+        engine._field_question_embeddings.clear()
+        engine._chunk_embeddings.clear()
@@ -0,0 +1,157 @@
+"""DRAFT Protocol benchmark runner.
+
+Runs offline — no LLM service needed (LLM/embedding modes use the bundled
+mock provider server). Emits one JSON document and optionally compares it
+against a stored baseline, exiting non-zero when a metric regresses past --threshold.
+
+Usage (from the repository root):
+    python -m benchmarks.run                                  # full suite, JSON to stdout
+    python -m benchmarks.run --quick --only classify,map
+    python -m benchmarks.run --baseline benchmarks/baseline.json --output bench.json
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+
+Compared metrics: *_per_sec (higher is better), p50_ms / median_ms (lower is better).
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SUITES = ("classify", "map", "cycle", "rest", "startup")
+
+# Iteration counts per suite: (full, quick)
+_ITERATIONS = {
+    "classify": (200, 20),
+    "map": (30, 5),
+    "cycle": (30, 5),
+    "rest": (100, 10),
+    "startup": (10, 3),
+}
+
+
+def _prepare_environment(db_dir: str) -> None:
+    """Point storage at a scratch DB before draft_protocol is imported."""
+    os.environ["DRAFT_DB_PATH"] = os.path.join(db_dir, "bench.db")
+    os.environ.setdefault("DRAFT_DEV_MODE", "1")
+    for var in ("DRAFT_LLM_PROVIDER", "DRAFT_LLM_MODEL", "DRAFT_EMBED_MODEL", "DRAFT_API_BASE"):
+        os.environ.pop(var, None)
+    src = str(ROOT / "src")
+    if src not in sys.path:
+        sys.path.insert(0, src)
+
+
+def run_suites(suites: list[str], quick: bool) -> dict:
+    from benchmarks import bench_engine, bench_rest, bench_startup
+
+    runners = {
+        "classify": bench_engine.bench_classify,
+        "map": bench_engine.bench_map,
+        "cycle": bench_engine.bench_cycle,
+        "rest": bench_rest.bench_rest,
+        "startup": bench_startup.run,
+    }
+    results = {}
+    for suite in suites:
+        iterations = _ITERATIONS[suite][1 if quick else 0]
+        results[suite] = runners[suite](iterations)
+    return results
+
+
+def _flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    flat: dict[str, float] = {}
+    for key, value in results.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path))
+        elif isinstance(value, (int, float)):
+            flat[path] = float(value)
+    return flat
+
+
+def _direction(metric: str) -> int:
+    """+1 if higher is better, -1 if lower is better, 0 if not compared."""
+    name = metric.rsplit(".", 1)[-1]
+    if name.endswith("_per_sec"):
+        return 1
+    if name in ("p50_ms", "median_ms"):
+        return -1
+    return 0
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> dict:
+    """Compare results against a baseline. Changes within ±threshold are noise."""
+    current = _flatten(results)
+    previous = _flatten(baseline.get("results", baseline))
+    regressions, improvements = [], []
+    for metric, value in sorted(current.items()):
+        direction = _direction(metric)
+        base = previous.get(metric)
+        if not direction or not base:
+            continue
+        change = (value - base) / base
+        entry = {"metric": metric, "baseline": base, "current": value, "change": round(change, 4)}
+        if change * direction < -threshold:
+            regressions.append(entry)
+        elif change * direction > threshold:
+            improvements.append(entry)
+    return {"threshold": threshold, "regressions": regressions, "improvements": improvements}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks.run", description="DRAFT Protocol benchmark suite")
+    parser.add_argument("--only", default=",".join(SUITES), help=f"Comma-separated suites ({', '.join(SUITES)})")
+    parser.add_argument("--quick", action="store_true", help="Few iterations — smoke test, not for baselines")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Regression threshold (default: 0.25 = 25%%)")
+    parser.add_argument("--save-baseline", help="Write results to this path as the new baseline")
+    args = parser.parse_args(argv)
+
+    suites = [s.strip() for s in args.only.split(",") if s.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        _prepare_environment(db_dir)
+        started = time.time()
+        results = run_suites(suites, args.quick)
+
+    report: dict = {
+        "meta": {
+            "timestamp": int(started),
+            "duration_s": round(time.time() - started, 2),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "suites": suites,
+        },
+        "results": results,
+    }
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(results, json.load(f), args.threshold)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(text + "\n")
+
+    regressions = report.get("comparison", {}).get("regressions", [])
+    for r in regressions:
+        print(f"REGRESSION {r['metric']}: {r['baseline']} -> {r['current']} ({r['change']:+.1%})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,50 +15,140 @@ Usage:
 
 __version__ = "1.4.0"
 
-# Public API — importable from `draft_protocol` directly
-from draft_protocol.engine import (
-    add_assumption,
-    check_gate,
-    classify_tier,
-    confirm_batch,
-    confirm_field,
-    deescalate_tier,
-    elicitation_review,
-    escalate_tier,
-    generate_assumptions,
-    generate_elicitation,
-    get_ceremony_depth,
-    get_legacy_tier,
-    map_dimensions,
-    open_elicitation,
-    override_gate,
-    quick_confirm_satisfied,
-    resolve_tier_override,
-    score_assumptions,
-    unscreen_dimension,
-    verify_assumption,
-    verify_batch,
-)
-from draft_protocol.extension_points import (
-    clear_all_hooks,
-    register_classify_hook,
-    register_post_gate_hook,
-    register_storage_path_hook,
-)
-from draft_protocol.providers import (
-    embed_available,
-    llm_available,
-)
-from draft_protocol.storage import (
-    close_session,
-    create_session,
-    get_active_session,
-    get_session,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Public API — importable from `draft_protocol` directly.
+# Resolved lazily (PEP 562) so `import draft_protocol` does not pull in the
+# engine, providers or storage until a name is actually used.
+_LAZY_ATTRS = {
+    # Engine
+    "acheck_gate": "draft_protocol.engine",
+    "aclassify_tier": "draft_protocol.engine",
+    "add_assumption": "draft_protocol.engine",
+    "agenerate_assumptions": "draft_protocol.engine",
+    "agenerate_elicitation": "draft_protocol.engine",
+    "aiter_elicitation": "draft_protocol.engine",
+    "amap_dimensions": "draft_protocol.engine",
+    "check_gate": "draft_protocol.engine",
+    "classify_tier": "draft_protocol.engine",
+    "confirm_batch": "draft_protocol.engine",
+    "confirm_field": "draft_protocol.engine",
+    "deescalate_tier": "draft_protocol.engine",
+    "elicitation_review": "draft_protocol.engine",
+    "escalate_tier": "draft_protocol.engine",
+    "generate_assumptions": "draft_protocol.engine",
+    "generate_elicitation": "draft_protocol.engine",
+    "get_ceremony_depth": "draft_protocol.engine",
+    "get_legacy_tier": "draft_protocol.engine",
+    "iter_elicitation": "draft_protocol.engine",
+    "map_dimensions": "draft_protocol.engine",
+    "open_elicitation": "draft_protocol.engine",
+    "override_gate": "draft_protocol.engine",
+    "quick_confirm_satisfied": "draft_protocol.engine",
+    "refresh_tier_exemplars": "draft_protocol.engine",
+    "resolve_tier_override": "draft_protocol.engine",
+    "run_pipeline": "draft_protocol.engine",
+    "score_assumptions": "draft_protocol.engine",
+    "unscreen_dimension": "draft_protocol.engine",
+    "verify_assumption": "draft_protocol.engine",
+    "verify_batch": "draft_protocol.engine",
+    # Extension Points
+    "add_classify_hook": "draft_protocol.extension_points",
+    "clear_all_hooks": "draft_protocol.extension_points",
+    "register_classify_hook": "draft_protocol.extension_points",
+    "register_post_gate_hook": "draft_protocol.extension_points",
+    "register_storage_path_hook": "draft_protocol.extension_points",
+    "unless_confident": "draft_protocol.extension_points",
+    # Providers
+    "embed_available": "draft_protocol.providers",
+    "llm_available": "draft_protocol.providers",
+    # Storage
+    "ConcurrentModificationError": "draft_protocol.storage",
+    "close_session": "draft_protocol.storage",
+    "create_session": "draft_protocol.storage",
+    "get_active_session": "draft_protocol.storage",
+    "get_session": "draft_protocol.storage",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # Cache: later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRS])
+
+
+if TYPE_CHECKING:
+    from draft_protocol.engine import (
+        acheck_gate,
+        aclassify_tier,
+        add_assumption,
+        agenerate_assumptions,
+        agenerate_elicitation,
+        aiter_elicitation,
+        amap_dimensions,
+        check_gate,
+        classify_tier,
+        confirm_batch,
+        confirm_field,
+        deescalate_tier,
+        elicitation_review,
+        escalate_tier,
+        generate_assumptions,
+        generate_elicitation,
+        get_ceremony_depth,
+        get_legacy_tier,
+        iter_elicitation,
+        map_dimensions,
+        open_elicitation,
+        override_gate,
+        quick_confirm_satisfied,
+        refresh_tier_exemplars,
+        resolve_tier_override,
+        run_pipeline,
+        score_assumptions,
+        unscreen_dimension,
+        verify_assumption,
+        verify_batch,
+    )
+    from draft_protocol.extension_points import (
+        add_classify_hook,
+        clear_all_hooks,
+        register_classify_hook,
+        register_post_gate_hook,
+        register_storage_path_hook,
+        unless_confident,
+    )
+    from draft_protocol.providers import (
+        embed_available,
+        llm_available,
+    )
+    from draft_protocol.storage import (
+        ConcurrentModificationError,
+        close_session,
+        create_session,
+        get_active_session,
+        get_session,
+    )
 
 __all__ = [
+    "ConcurrentModificationError",
     "__version__",
+    "acheck_gate",
+    "aclassify_tier",
     "add_assumption",
+    "add_classify_hook",
+    "agenerate_assumptions",
+    "agenerate_elicitation",
+    "aiter_elicitation",
+    "amap_dimensions",
     "check_gate",
     # Engine
     "classify_tier",
@@ -78,18 +168,22 @@ __all__ = [
     "get_ceremony_depth",
     "get_legacy_tier",
     "get_session",
+    "iter_elicitation",
     # Providers
     "llm_available",
     "map_dimensions",
     "open_elicitation",
     "override_gate",
     "quick_confirm_satisfied",
+    "refresh_tier_exemplars",
     # Extension Points
     "register_classify_hook",
     "register_post_gate_hook",
     "register_storage_path_hook",
     "resolve_tier_override",
+    "run_pipeline",
     "score_assumptions",
+    "unless_confident",
     "unscreen_dimension",
     "verify_assumption",
     "verify_batch",
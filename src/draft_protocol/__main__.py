@@ -10,17 +10,52 @@ Usage:
   python -m draft_protocol --transport sse          # SSE on port 8420
   python -m draft_protocol --transport streamable-http --port 8420
   python -m draft_protocol --transport rest         # REST API on port 8420
+  python -m draft_protocol --transport rest --workers 4   # REST, 4 pre-forked processes
+  python -m draft_protocol audit export --session ID -o audit.ndjson   # NDJSON audit export
+  python -m draft_protocol shards rebalance --dry-run   # Plan moves after changing DRAFT_DB_SHARDS
 
 Environment variables (override CLI defaults):
   DRAFT_TRANSPORT  — stdio | sse | streamable-http
   DRAFT_HOST       — Bind address (default: 127.0.0.1)
   DRAFT_PORT       — Port for SSE/HTTP (default: 8420)
+  DRAFT_WORKERS    — REST worker processes (default: 1)
+
+SIGHUP reloads HMAC keys (GATE_HMAC_SECRET / GATE_HMAC_KEYS). Servers sweep
+expired sessions and apply audit retention in the background (see maintenance).
 """
 
 import argparse
+import contextlib
 import os
+import sys
+
+
+def _audit_export(args: argparse.Namespace) -> None:
+    from draft_protocol.maintenance import iter_audit_ndjson
+
+    filters = {
+        "session_id": args.session,
+        "tool_name": args.tool,
+        "action": args.action,
+        "since": args.since,
+        "until": args.until,
+        "after_id": args.after,
+    }
+    with open(args.output, "wb") if args.output else contextlib.nullcontext(sys.stdout.buffer) as out:
+        for chunk in iter_audit_ndjson(include_archive=args.archive, **filters):
+            out.write(chunk)
+        out.flush()
 
-from draft_protocol.server import mcp
+
+def _shards(args: argparse.Namespace) -> None:
+    import json
+
+    from draft_protocol import maintenance, storage
+
+    if args.shards_command == "status":
+        print(json.dumps(storage.shard_stats(), indent=2))
+    else:
+        print(json.dumps(maintenance.rebalance_shards(dry_run=args.dry_run), indent=2))
 
 
 def main():
@@ -47,18 +82,68 @@ def main():
         default=int(os.environ.get("DRAFT_PORT", "8420")),
         help="Port for SSE/HTTP (default: 8420)",
     )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=int(os.environ.get("DRAFT_WORKERS", "1")),
+        help="REST worker processes; >1 pre-forks and shares the port (default: 1)",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="{audit,shards}")
+    audit = commands.add_parser("audit", help="Audit log tools")
+    audit_commands = audit.add_subparsers(dest="audit_command", required=True)
+    export = audit_commands.add_parser("export", help="Stream the audit log as NDJSON")
+    export.add_argument("--session", help="Only this session id")
+    export.add_argument("--tool", help="Only this tool name")
+    export.add_argument("--action", help="Only this action")
+    export.add_argument("--since", help="ISO timestamp, inclusive")
+    export.add_argument("--until", help="ISO timestamp, exclusive")
+    export.add_argument("--after", type=int, default=0, help="Resume after this audit id")
+    export.add_argument("--archive", action="store_true", help="Include archived segments")
+    export.add_argument("--output", "-o", help="Write to a file instead of stdout")
+    shards = commands.add_parser("shards", help="Database shard tools (DRAFT_DB_SHARDS)")
+    shards_commands = shards.add_subparsers(dest="shards_command", required=True)
+    shards_commands.add_parser("status", help="Rows and size per shard file")
+    rebalance = shards_commands.add_parser("rebalance", help="Move sessions to their shard; stop servers first")
+    rebalance.add_argument("--dry-run", action="store_true", help="Only report what would move")
     args = parser.parse_args()
+    if args.command == "audit":
+        _audit_export(args)
+        return
+    if args.command == "shards":
+        _shards(args)
+        return
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
+
+    # Transports import their server lazily: REST never loads fastmcp.
+    if args.transport == "rest":
+        if args.workers > 1:  # SIGHUP rolls the workers, which reloads keys
+            from draft_protocol.workers import serve_prefork
+
+            serve_prefork(host=args.host, port=args.port, workers=args.workers)
+        else:
+            from draft_protocol.hmac_utils import install_reload_signal
+            from draft_protocol.maintenance import start_maintenance
+            from draft_protocol.rest import run_rest_server
 
+            install_reload_signal()
+            start_maintenance()
+            run_rest_server(host=args.host, port=args.port)
+        return
+
+    from draft_protocol.hmac_utils import install_reload_signal
+    from draft_protocol.maintenance import start_maintenance
+    from draft_protocol.server import mcp
+
+    install_reload_signal()
+    start_maintenance()
     if args.transport == "stdio":
         mcp.run(transport="stdio")
     elif args.transport == "sse":
         mcp.run(transport="sse", host=args.host, port=args.port)
     elif args.transport == "streamable-http":
         mcp.run(transport="streamable-http", host=args.host, port=args.port)
-    elif args.transport == "rest":
-        from draft_protocol.rest import run_rest_server
-
-        run_rest_server(host=args.host, port=args.port)
 
 
 if __name__ == "__main__":
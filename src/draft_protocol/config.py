@@ -4,8 +4,59 @@ import os
 from pathlib import Path
 
 # ── Storage ───────────────────────────────────────────────
+# The parent directory is created lazily by storage on first connection, so
+# importing this module has no filesystem side effects.
 DB_PATH = Path(os.environ.get("DRAFT_DB_PATH", "~/.draft_protocol/draft.db")).expanduser()
-DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+# How long a connection waits on a locked database before failing. Matters
+# once several REST workers write the same WAL database concurrently.
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("DRAFT_DB_BUSY_TIMEOUT_MS", "5000"))
+# Spread sessions over this many database files (draft.db, draft-1.db, ...),
+# one write lock each. Change it, then run `python -m draft_protocol shards rebalance`.
+DB_SHARDS = max(1, int(os.environ.get("DRAFT_DB_SHARDS", "1")))
+# Idle connections kept open per database file
+DB_POOL_SIZE = int(os.environ.get("DRAFT_DB_POOL_SIZE", "8"))
+
+# ── Session Expiry ────────────────────────────────────────
+# Open sessions can be closed once idle (no update) or older than an absolute
+# TTL for their tier. Seconds; 0 disables, and both are off unless set. Give
+# a single number for every tier or per tier values, e.g.
+# DRAFT_SESSION_IDLE_TTL="TASK=86400,MULTI=86400" (unlisted tiers stay 0).
+_TTL_TIERS = ("TRIVIAL", "LOOKUP", "TASK", "MULTI", "CONSEQUENTIAL")
+_DEFAULT_IDLE_TTL = dict.fromkeys(_TTL_TIERS, 0)
+_DEFAULT_MAX_TTL = dict.fromkeys(_TTL_TIERS, 0)
+
+
+def _tier_seconds(var: str, defaults: dict[str, int]) -> dict[str, int]:
+    raw = os.environ.get(var, "").strip()
+    if not raw:
+        return dict(defaults)
+    if "=" not in raw:
+        return dict.fromkeys(defaults, int(raw))
+    out = dict(defaults)
+    for part in filter(None, (p.strip() for p in raw.split(","))):
+        tier, _, seconds = part.partition("=")
+        tier = tier.strip().upper()
+        if tier not in out:
+            raise ValueError(f"{var}: unknown tier {tier!r}")
+        out[tier] = int(seconds)
+    return out
+
+
+SESSION_IDLE_TTL = _tier_seconds("DRAFT_SESSION_IDLE_TTL", _DEFAULT_IDLE_TTL)
+SESSION_MAX_TTL = _tier_seconds("DRAFT_SESSION_MAX_TTL", _DEFAULT_MAX_TTL)
+# Background sweep interval in seconds for long-running servers; 0 disables
+# (sessions are then expired lazily, when next looked up).
+SESSION_SWEEP_INTERVAL = float(os.environ.get("DRAFT_SESSION_SWEEP_INTERVAL", "60"))
+
+# ── Audit Retention ───────────────────────────────────────
+# Audit rows older than AUDIT_RETENTION_DAYS, or beyond the newest
+# AUDIT_MAX_ROWS, are moved to monthly gzip NDJSON segments in
+# AUDIT_ARCHIVE_DIR. Both 0 (default) keeps everything in SQLite.
+AUDIT_RETENTION_DAYS = float(os.environ.get("DRAFT_AUDIT_RETENTION_DAYS", "0"))
+AUDIT_MAX_ROWS = int(os.environ.get("DRAFT_AUDIT_MAX_ROWS", "0"))
+AUDIT_ARCHIVE_DIR = Path(os.environ.get("DRAFT_AUDIT_ARCHIVE_DIR", str(DB_PATH.parent / "audit_archive"))).expanduser()
+# Seconds between retention runs in long-running servers
+AUDIT_RETENTION_INTERVAL = float(os.environ.get("DRAFT_AUDIT_RETENTION_INTERVAL", "3600"))
 
 # ── LLM Provider (optional — enhances classification accuracy) ──
 # Supported: "none" (default), "ollama", "openai", "anthropic"
@@ -29,6 +80,45 @@ if LLM_PROVIDER == "none" and LLM_MODEL:
     elif LLM_MODEL:
         LLM_PROVIDER = "ollama"  # Default to Ollama for unknown models
 
+# Field assessment by embeddings reads the whole context as overlapping
+# chunks (characters), embedded EMBED_BATCH_SIZE per provider request.
+EMBED_CHUNK_CHARS = int(os.environ.get("DRAFT_EMBED_CHUNK_CHARS", "1000"))
+EMBED_CHUNK_OVERLAP = int(os.environ.get("DRAFT_EMBED_CHUNK_OVERLAP", "200"))
+EMBED_MAX_CHUNKS = int(os.environ.get("DRAFT_EMBED_MAX_CHUNKS", "128"))
+EMBED_BATCH_SIZE = int(os.environ.get("DRAFT_EMBED_BATCH_SIZE", "32"))
+
+# The async API (engine.a*, async MCP tools) awaits provider calls on the
+# event loop and runs SQLite work on a pool of this many threads.
+ASYNC_THREADS = int(os.environ.get("DRAFT_ASYNC_THREADS", "32"))
+
+# engine.iter_elicitation (streaming draft_elicit, /elicit/stream) requests
+# this many LLM suggestions at a time.
+ELICIT_CONCURRENCY = int(os.environ.get("DRAFT_ELICIT_CONCURRENCY", "8"))
+
+# Exemplar classification: messages no keyword matched are embedded and
+# labeled by a similarity-weighted vote of the EXEMPLAR_K nearest
+# TIER_EXEMPLARS (0 disables). Votes whose winning share leads the runner-up
+# by less than EXEMPLAR_MIN_MARGIN go on to the LLM.
+EXEMPLAR_K = int(os.environ.get("DRAFT_EXEMPLAR_K", "5"))
+EXEMPLAR_MIN_MARGIN = float(os.environ.get("DRAFT_EXEMPLAR_MIN_MARGIN", "0.3"))
+
+# ── Instrumentation ───────────────────────────────────────
+# DRAFT_METRICS: where latency spans go — "none", "histogram", "log".
+#   Unset means "none", except the REST server which defaults to "histogram" for /metrics.
+# DRAFT_TIMINGS=1: attach a per-call `timings` block to MCP/REST responses
+METRICS_BACKEND = os.environ.get("DRAFT_METRICS", "").strip().lower()
+TIMINGS = os.environ.get("DRAFT_TIMINGS", "") == "1"
+
+# ── Extension Hooks ───────────────────────────────────────
+# How post-gate hooks run (see hooks.py): "inline" (in the caller, errors
+# ignored, no timeout — the default), "sync" (in the caller, with timeout and
+# retries) or "async" (queued to background workers, the gate does not wait).
+HOOK_MODE = os.environ.get("DRAFT_HOOK_MODE", "inline").strip().lower()
+HOOK_TIMEOUT = float(os.environ.get("DRAFT_HOOK_TIMEOUT", "5"))
+HOOK_RETRIES = int(os.environ.get("DRAFT_HOOK_RETRIES", "2"))
+HOOK_WORKERS = int(os.environ.get("DRAFT_HOOK_WORKERS", "2"))
+HOOK_QUEUE_SIZE = int(os.environ.get("DRAFT_HOOK_QUEUE_SIZE", "1000"))
+
 # ── 5-Tier Classification (GDE v1 port) ───────────────────
 # Priority: T4 > T3 > T2 > T1 > T0 (highest risk wins)
 
@@ -220,6 +310,50 @@ TRIVIAL_PATTERNS = {
     "n",
 }
 
+# Labeled example messages for exemplar classification (engine.refresh_tier_exemplars
+# adds confirmed tiers from past sessions).
+TIER_EXEMPLARS = {
+    "TRIVIAL": [
+        "thanks, that looks good to me",
+        "ok sounds good, carry on",
+        "great, thank you very much",
+        "perfect, that is all for now",
+        "cool, nothing else from me",
+    ],
+    "LOOKUP": [
+        "what does this function return when the input is empty",
+        "how many open sessions do we have right now",
+        "can you tell me where the config file lives",
+        "why are the nightly jobs failing on the main branch",
+        "summarize what the last commit changed",
+        "which version of python does the project support",
+    ],
+    "TASK": [
+        "add a retry option to the upload command",
+        "write unit tests for the date parser",
+        "give the helper function a clearer name and fix its callers",
+        "fix the off-by-one error in the pagination code",
+        "add a csv export to the report page",
+        "make the login handler use the new client",
+    ],
+    "MULTI": [
+        "move every service from the old logging library to the new one",
+        "update the api client and all the services that call it",
+        "change the database schema and backfill the existing rows",
+        "split the monolith into separate packages for each team",
+        "upgrade the dependencies across the whole repository",
+        "set up continuous delivery for all three environments",
+    ],
+    "CONSEQUENTIAL": [
+        "change who is allowed to approve releases to production",
+        "rotate the signing keys used for customer data",
+        "delete the old customer records from the live database",
+        "rewrite the license terms in the public repository",
+        "turn off authentication for the admin endpoints",
+        "overhaul the permission model for the whole platform",
+    ],
+}
+
 # ── Dimensions ────────────────────────────────────────────
 # D and T are mandatory; R, A, F can be screened out when inapplicable.
 
@@ -2,7 +2,7 @@
 
 Features:
   1. Tier classification — keyword fast-path + optional LLM semantic classification
-  2. Field assessment — optional embedding-based cosine similarity or keyword heuristics
+  2. Field assessment — optional chunked embedding similarity or keyword heuristics
   3. Context-aware suggestions — optional LLM scaffolds or static templates
   4. Classification confidence scoring — 0.0-1.0 on all assessments
   5. Graceful degradation — works without any LLM, better with one
@@ -15,16 +15,33 @@ Supports any LLM provider via DRAFT_LLM_PROVIDER env var:
 """
 
 import contextlib
+import contextvars
+import functools
+import hashlib
+import heapq
 import math
-from typing import Any
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Generator, Iterator
+from typing import Any, TypeVar
 
 from draft_protocol import providers, storage
 from draft_protocol.config import (
     ALL_TIERS,
+    ASYNC_THREADS,
     CONSEQUENTIAL_TRIGGERS,
     DIMENSION_NAMES,
     DIMENSION_SCREEN_QUESTIONS,
     DRAFT_FIELDS,
+    ELICIT_CONCURRENCY,
+    EMBED_CHUNK_CHARS,
+    EMBED_CHUNK_OVERLAP,
+    EMBED_MAX_CHUNKS,
+    EXEMPLAR_K,
+    EXEMPLAR_MIN_MARGIN,
     LEGACY_MAP,
     LOOKUP_TRIGGERS,
     MANDATORY_DIMENSIONS,
@@ -32,11 +49,13 @@ from draft_protocol.config import (
     STANDARD_TRIGGERS,
     TIER_ASSUMPTIONS,
     TIER_CEREMONY,
+    TIER_EXEMPLARS,
     TIER_TO_LEGACY,
     TRIVIAL_PATTERNS,
 )
 from draft_protocol.extension_points import get_classify_hook, get_post_gate_hook
 from draft_protocol.hmac_utils import sign_assertion, sign_gate_pass
+from draft_protocol.instrumentation import count, span
 
 # ── M1.3: Closed Session Guard ───────────────────────────
 
@@ -50,6 +69,45 @@ def _check_open(session_id: str) -> dict | None:
     return None
 
 
+# ── Optimistic Concurrency ────────────────────────────────
+# Session writes are compare-and-swap on the session version. An operation
+# that loses a race re-runs from a fresh read, so parallel confirm_field /
+# confirm_batch calls on one session both land instead of one overwriting
+# the other.
+
+_CAS_ATTEMPTS = 8
+
+F = TypeVar("F", bound=Callable[..., Any])
+T = TypeVar("T")
+
+
+def _retry_conflicts(fn: F) -> F:
+    """Re-run fn (read, modify, CAS write) when another writer got there first.
+
+    A re-run replays the provider replies of the attempt before it (see
+    _ReplyLog), so a conflict costs another SQLite round trip, not another
+    LLM call.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with _prefetching():
+            log = _replies.get()
+            start = log.position() if log is not None else {}
+            for attempt in range(1, _CAS_ATTEMPTS + 1):
+                if log is not None:
+                    log.rewind(start)
+                try:
+                    return fn(*args, **kwargs)
+                except storage.ConcurrentModificationError:
+                    count("draft_session_conflicts_total", op=fn.__name__)
+                    if attempt == _CAS_ATTEMPTS:
+                        raise
+                    time.sleep(random.uniform(0, 0.002 * 2**attempt))  # Jitter so racers spread out
+
+    return wrapper  # type: ignore[return-value]
+
+
 # ── T16: Sycophancy Screening ──────────────────────────────
 # First publicly available anti-sycophancy intake filter.
 # Evidence: T11 forensics (29/30 inflation terms assistant-introduced),
@@ -71,24 +129,26 @@ _SYCOPHANCY_THRESHOLD = 3  # Flag if 3+ evaluative words found
 def _sycophancy_screen(session_id: str, context: str) -> dict:
     """Screen intake context for evaluative/sycophantic language.
     If 3+ evaluative words found, adds an assumption flagging potential sycophancy."""
-    context_lower = context.lower()
-    found = [w for w in _EVALUATIVE_WORDS if w in context_lower]
-    count = len(found)
-    flagged = count >= _SYCOPHANCY_THRESHOLD
-
-    if flagged:
-        add_assumption(
-            session_id,
-            claim=(
-                f"This input contains {count} evaluative words ({', '.join(found[:5])}). "
-                "These claims may be sycophantic — verify they are evidence-based, "
-                "not narrative framing."
-            ),
-            source="sycophancy_screen",
-            falsifier="If all evaluative claims are backed by specific evidence with citations, this flag is a false positive.",
-        )
-
-    return {"flagged": flagged, "count": count, "words": found}
+    found, assumption = _sycophancy_flag(context)
+    if assumption:
+        add_assumption(session_id, **assumption)
+    return {"flagged": assumption is not None, "count": len(found), "words": found}
+
+
+def _sycophancy_flag(context: str) -> tuple[list[str], dict | None]:
+    """Evaluative words in context, and the assumption to add if there are enough of them."""
+    found = _keywords().hits(_keyword_hits(context), "sycophancy")
+    if len(found) < _SYCOPHANCY_THRESHOLD:
+        return found, None
+    return found, {
+        "claim": (
+            f"This input contains {len(found)} evaluative words ({', '.join(found[:5])}). "
+            "These claims may be sycophantic — verify they are evidence-based, "
+            "not narrative framing."
+        ),
+        "source": "sycophancy_screen",
+        "falsifier": "If all evaluative claims are backed by specific evidence with citations, this flag is a false positive.",
+    }
 
 
 # ── LLM Schemas ───────────────────────────────────────────
@@ -161,8 +221,12 @@ def _embed_available() -> bool:
 # ── Embedding Helpers ─────────────────────────────────────
 
 
-def _embed(text: str) -> list:
-    return providers.embed(text)
+def _embed(text: str, site: str = "") -> list:
+    return providers.embed(text, site=site)
+
+
+def _embed_many(texts: list[str], site: str = "") -> list[list]:
+    return providers.embed_many(texts, site=site)
 
 
 def _cosine_sim(a: list, b: list) -> float:
@@ -177,9 +241,219 @@ def _cosine_sim(a: list, b: list) -> float:
     return result
 
 
-def _llm_call(prompt: str, schema: dict, timeout: int = 30) -> dict | None:
-    """Structured LLM call via configured provider. Returns parsed dict or None."""
-    return providers.chat(prompt, schema, timeout)
+@functools.lru_cache(maxsize=1)
+def _numpy() -> Any:
+    """numpy if installed (vectorized similarity), else None."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _unit(vector: list, dim: int) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vector)) if len(vector) == dim else 0.0
+    return [x / norm for x in vector] if norm else [0.0] * dim
+
+
+def _similarity_matrix(rows: list[list], cols: list[list]) -> list[list[float]]:
+    """Cosine similarity of every row vector against every column vector.
+
+    One matrix product with numpy, a loop over normalized vectors without
+    it. Vectors that are empty or of another length than rows[0] score 0.0.
+    """
+    if not rows or not cols:
+        return [[] for _ in rows]
+    dim = len(rows[0])
+    a = [_unit(v, dim) for v in rows]
+    b = [_unit(v, dim) for v in cols]
+    np = _numpy()
+    if np is not None:
+        result: list[list[float]] = (np.asarray(a, dtype=float) @ np.asarray(b, dtype=float).T).tolist()
+        return result
+    return [[sum(x * y for x, y in zip(r, c, strict=True)) for c in b] for r in a]
+
+
+class _ReplyLog:
+    """Provider replies by prompt in call order, replayed by position.
+
+    The n-th call with a prompt in a pass gets the n-th reply for it, so a
+    prompt sent several times (one per assumption, say) gets each of its
+    replies once, and a pass rewound to its start gets them all again.
+    """
+
+    def __init__(self) -> None:
+        self._replies: dict[str, list[dict | None]] = {}
+        self._taken: dict[str, int] = {}
+        self._lock = threading.Lock()  # Elicitation suggestions call from a thread pool
+
+    def add(self, prompt: str, reply: dict | None) -> None:
+        """Keep a reply fetched ahead, for the next call with `prompt`."""
+        with self._lock:
+            self._replies.setdefault(prompt, []).append(reply)
+
+    def record(self, prompt: str, reply: dict | None) -> None:
+        """Keep the reply of a call just made, as taken."""
+        with self._lock:
+            self._replies.setdefault(prompt, []).append(reply)
+            self._taken[prompt] = len(self._replies[prompt])
+
+    def take(self, prompt: str) -> tuple[bool, dict | None]:
+        """(True, the next reply for `prompt`) or (False, None) when none is left."""
+        with self._lock:
+            queue = self._replies.get(prompt, [])
+            n = self._taken.get(prompt, 0)
+            if n >= len(queue):
+                return False, None
+            self._taken[prompt] = n + 1
+            reply = queue[n]
+        return True, dict(reply) if reply is not None else None
+
+    def position(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._taken)
+
+    def rewind(self, position: dict[str, int]) -> None:
+        """Go back to `position`, so the replies taken since are taken again."""
+        with self._lock:
+            self._taken = dict(position)
+
+
+# Replies the async API fetched ahead (and those of earlier calls in the same
+# scope), and the dry-run log of calls it uses to find out which to fetch
+# (see Async API below).
+_replies: contextvars.ContextVar[_ReplyLog | None] = contextvars.ContextVar("draft_replies", default=None)
+_planned: contextvars.ContextVar[list | None] = contextvars.ContextVar("draft_planned", default=None)
+
+
+def _llm_call(prompt: str, schema: dict, timeout: int = 30, site: str = "") -> dict | None:
+    """Structured LLM call via configured provider. Returns parsed dict or None.
+
+    `site` tags the provider span with the calling function. In a
+    _prefetching scope, a reply already fetched for this call (see
+    _ReplyLog) is used first, and a new one is kept there.
+    """
+    log = _replies.get()
+    if log is not None:
+        found, reply = log.take(prompt)
+        if found:
+            return reply
+    planned = _planned.get()
+    if planned is not None:  # Dry run: record the call, answer as if it failed
+        planned.append((prompt, schema, timeout, site))
+        return None
+    result = providers.chat(prompt, schema, timeout, site=site)
+    if log is not None:
+        log.record(prompt, dict(result) if result is not None else None)
+    return result
+
+
+# ── Keyword Index ─────────────────────────────────────────
+# Every heuristic keyword list (field assessment, dimension screening,
+# sycophancy, assumption scoring) is compiled into one trie-shaped regex.
+# A text is scanned once and each check is a set lookup afterwards, so
+# keyword mapping stays linear in context length.
+
+_FIELD_KEYWORDS = {
+    "D1": ["building", "creating", "system", "tool", "service", "product"],
+    "D2": ["domain", "area", "scope", "field"],
+    "D3": ["without", "fail", "break", "depend", "block", "need"],
+    "D4": ["alternative", "replace", "existing", "instead", "workaround"],
+    "D5": ["not about", "non-goal", "exclude", "out of scope", "won't"],
+    "R1": ["authority", "owner", "decision maker", "approve", "responsible"],
+    "R2": ["allowed", "permitted", "can do", "authorized"],
+    "R3": ["forbidden", "prohibited", "cannot", "must not", "never"],
+    "R4": ["stop", "halt", "abort", "limit", "condition"],
+    "R5": ["interface", "api", "connect", "integrate", "interact"],
+    "A1": ["input", "accept", "receive", "data", "file"],
+    "A2": ["reject", "block", "invalid", "forbidden input"],
+    "A3": ["output", "produce", "generate", "return", "response"],
+    "A4": ["forbidden output", "must not produce", "never output"],
+    "A5": ["example", "correct", "expected"],
+    "A6": ["incorrect", "wrong", "bad example"],
+    "F1": ["change authority", "modify", "who can change"],
+    "F2": ["permitted change", "allowed update", "can modify"],
+    "F3": ["frozen", "immutable", "locked", "cannot change"],
+    "F4": ["review trigger", "audit", "threshold", "when to review"],
+    "T1": ["success", "pass", "works", "complete", "verified"],
+    "T2": ["failure", "fail", "error", "broken", "incorrect"],
+    "T3": ["review question", "check", "verify", "audit question"],
+    "T4": ["evidence", "proof", "test result", "demonstration"],
+}
+
+_SCREEN_KEYWORDS = {
+    "R": ["authority", "decision", "permission", "limit", "allowed", "forbidden"],
+    "A": ["file", "output", "input", "document", "data", "artifact", "create"],
+    "F": ["change", "update", "evolve", "lifecycle", "adapt", "version"],
+}
+
+_ASSUMPTION_KEYWORDS = {
+    "testable": ["if ", "when ", "unless ", "would ", "could ", "fails", "breaks", "wrong"],
+    "strong": ["not ", "never ", "always "],
+    "critical": ["architecture", "governance", "security", "scope", "authority", "production", "data"],
+    "restatement": ["for d", "for r", "for a", "for f", "for t", "context_extraction"],
+}
+
+
+def _trie_regex(terms: list[str]) -> str:
+    """Regex matching any of `terms`, shaped as a trie so each position is tried once."""
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # End of a term
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body  # Greedy: longest term wins
+
+    return build(trie)
+
+
+class _KeywordIndex:
+    """Named keyword groups matched by substring, like `keyword in text.lower()`."""
+
+    def __init__(self, groups: dict[str, list[str]]):
+        self.groups = groups
+        terms = sorted({term for group in groups.values() for term in group})
+        # Zero-width lookahead, so matches may overlap; the longest term found at a
+        # position implies every shorter term that is a prefix of it.
+        self._pattern = re.compile(f"(?=({_trie_regex(terms)}))")
+        self._implied = {term: [t for t in terms if term.startswith(t)] for term in terms}
+
+    def scan(self, text: str) -> frozenset[str]:
+        """Every keyword that occurs in `text` (case-insensitive), in one pass."""
+        found: set[str] = set()
+        for match in self._pattern.finditer(text.lower()):
+            found.update(self._implied[match.group(1)])
+        return frozenset(found)
+
+    def hits(self, found: frozenset[str], group: str) -> list[str]:
+        """The group's keywords in `found`, in group order."""
+        return [term for term in self.groups[group] if term in found]
+
+
+@functools.cache
+def _keywords() -> _KeywordIndex:
+    """The shared keyword index, compiled on first use rather than at import."""
+    return _KeywordIndex(
+        {
+            **_FIELD_KEYWORDS,
+            **{f"screen:{dim}": words for dim, words in _SCREEN_KEYWORDS.items()},
+            **{f"assumption:{kind}": words for kind, words in _ASSUMPTION_KEYWORDS.items()},
+            "sycophancy": _EVALUATIVE_WORDS,
+        }
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _keyword_hits(text: str) -> frozenset[str]:
+    """_keywords().scan(text), cached: map_dimensions checks the same context ~30 times."""
+    return _keywords().scan(text)
 
 
 # ── Tier Classification ───────────────────────────────────
@@ -194,19 +468,60 @@ def classify_tier(message: str) -> tuple[str, str, float]:
     """
     message = str(message).strip() if message is not None else ""
     if not message:
-        return "REJECTED", "Empty or whitespace-only message — cannot classify", 0.0
+        return _counted("REJECTED", "Empty or whitespace-only message — cannot classify", 0.0, path="rejected")
 
     # Extension point: custom classifier (e.g., GDE) gets first shot
     hook = get_classify_hook()
     if hook is not None:
-        hook_result = hook(message)
+        with span("classify.hook"):
+            hook_result = hook(message)
         if hook_result is not None:
-            return hook_result
+            tier, reasoning, confidence = hook_result
+            return _counted(tier, reasoning, confidence, path="hook")
 
     lower = message.lower()
-    words = message.split()
-    word_count = len(words)
+    word_count = len(message.split())
+
+    with span("classify.keywords"):
+        result = _classify_keywords(message, lower)
+    if result is not None:
+        return _counted(*result, path="regex" if result[1] == _MULTI_PATTERN_REASON else "keyword")
+
+    # Nearest labeled examples; only close votes go on to the LLM
+    if EXEMPLAR_K > 0 and _embed_available() and word_count > 3:
+        with span("classify.exemplar"):
+            result = _classify_exemplars(message)
+        if result is not None:
+            return _counted(*result, path="exemplar")
 
+    # LLM semantic classification for ambiguous messages
+    if _llm_available() and word_count > 3:
+        with span("classify.llm"):
+            result = _classify_llm(message)
+        if result is not None:
+            return _counted(*result, path="llm")
+
+    with span("classify.fallback"):
+        result = _classify_fallback(lower, word_count)
+    return _counted(*result, path="fallback")
+
+
+def _counted(tier: str, reasoning: str, confidence: float, path: str) -> tuple[str, str, float]:
+    """Count a classification outcome by tier and decision path, then pass it through."""
+    count("draft_classify_total", tier=tier, path=path)
+    return tier, reasoning, confidence
+
+
+_MULTI_PATTERN = re.compile(
+    r"(?:\d+\s*(?:files?|changes?|modifications?))"
+    r"|(?:(?:across|multiple|several)\s+(?:files?|services?|systems?|collections?))",
+    re.IGNORECASE,
+)
+_MULTI_PATTERN_REASON = "Multi-file or cross-service operation detected"
+
+
+def _classify_keywords(message: str, lower: str) -> tuple[str, str, float] | None:
+    """High-risk keyword fast path: T4, T3 (keywords + multi-file pattern), T2."""
     # ── T4: CONSEQUENTIAL (governance, canonical, IP, security) ──
     matched = [t for t in CONSEQUENTIAL_TRIGGERS if t in lower]
     if matched:
@@ -218,24 +533,18 @@ def classify_tier(message: str) -> tuple[str, str, float]:
         return "MULTI", f"T3 keyword: {matched[0]}", 0.85
 
     # Multi-file/multi-system pattern detection
-    import re
-
-    multi_pattern = re.compile(
-        r"(?:\d+\s*(?:files?|changes?|modifications?))"
-        r"|(?:(?:across|multiple|several)\s+(?:files?|services?|systems?|collections?))",
-        re.IGNORECASE,
-    )
-    if multi_pattern.search(message):
-        return "MULTI", "Multi-file or cross-service operation detected", 0.80
+    if _MULTI_PATTERN.search(message):
+        return "MULTI", _MULTI_PATTERN_REASON, 0.80
 
     # ── T2: TASK (single write/edit/create, standard work) ──
     matched = [t for t in STANDARD_TRIGGERS if t in lower]
     if matched:
         return "TASK", f"T2 keyword: {matched[0]}", 0.85
+    return None
 
-    # LLM semantic classification for ambiguous messages
-    if _llm_available() and word_count > 3:
-        prompt = f"""Classify this user message for an AI governance system.
+
+def _classify_llm(message: str) -> tuple[str, str, float] | None:
+    prompt = f"""Classify this user message for an AI governance system.
 
 TRIVIAL = greetings, thanks, "continue", acknowledgments (1-3 words, no action)
 LOOKUP = questions, status checks, reads, verifications
@@ -245,14 +554,18 @@ CONSEQUENTIAL = governance changes, architecture, production, security, IP-sensi
 
 Message: {message[:500]}"""
 
-        result = _llm_call(prompt, TIER_SCHEMA, timeout=20)
-        if result and result.get("tier") in ALL_TIERS:
-            return result["tier"], result.get("reasoning", "LLM classification"), result.get("confidence", 0.7)
-        # Also accept legacy tier names from LLM
-        if result and result.get("tier") in LEGACY_MAP:
-            mapped = LEGACY_MAP[result["tier"]]
-            return mapped, result.get("reasoning", "LLM classification (legacy mapped)"), result.get("confidence", 0.7)
+    result = _llm_call(prompt, TIER_SCHEMA, timeout=20, site="classify_tier")
+    if result and result.get("tier") in ALL_TIERS:
+        return result["tier"], result.get("reasoning", "LLM classification"), result.get("confidence", 0.7)
+    # Also accept legacy tier names from LLM
+    if result and result.get("tier") in LEGACY_MAP:
+        mapped = LEGACY_MAP[result["tier"]]
+        return mapped, result.get("reasoning", "LLM classification (legacy mapped)"), result.get("confidence", 0.7)
+    return None
+
 
+def _classify_fallback(lower: str, word_count: int) -> tuple[str, str, float]:
+    """Low-risk tiers and length heuristics once nothing stronger matched."""
     # ── T1: LOOKUP (questions, status checks) ──
     matched = [t for t in LOOKUP_TRIGGERS if t in lower]
     if matched:
@@ -272,6 +585,133 @@ Message: {message[:500]}"""
     return "LOOKUP", f"No strong signal ({word_count} words), defaulting to LOOKUP", 0.40
 
 
+def _classify_heuristic(message: str) -> tuple[str, str, float]:
+    """classify_tier() without hooks or the LLM (hooks.unless_confident filters on it)."""
+    lower = message.lower()
+    return _classify_keywords(message, lower) or _classify_fallback(lower, len(message.split()))
+
+
+# ── Exemplar Classifier ───────────────────────────────────
+# Labeled example messages per tier (config.TIER_EXEMPLARS, plus confirmed
+# tiers from past sessions) are embedded once and kept as unit vectors. A
+# message is one embedding call and one matrix-vector product instead of a
+# generative LLM call; close votes still escalate to the LLM.
+
+
+class _ExemplarIndex:
+    """Unit-normalized exemplar embeddings with their tiers, for top-k cosine votes."""
+
+    def __init__(self, seed: dict[str, list[str]] | None = None):
+        self._seed = TIER_EXEMPLARS if seed is None else seed
+        self._seeded = False
+        self._texts: set[str] = set()
+        self._labels: list[str] = []
+        self._rows: list[list[float]] = []
+        self._array: Any = None  # numpy copy of _rows, rebuilt after add()
+        self._votes: OrderedDict[str, tuple | None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, examples: list[tuple[str, str]]) -> int:
+        """Embed and add (text, tier) examples not in the index yet, in one batched call."""
+        with self._lock:
+            todo = [
+                (t, tier) for t, tier in dict.fromkeys(examples) if t and tier in ALL_TIERS and t not in self._texts
+            ]
+        if not todo:
+            return 0
+        vectors = _embed_many([text for text, _ in todo], site="_ExemplarIndex.add")
+        with self._lock:
+            dim = len(self._rows[0]) if self._rows else next((len(v) for v in vectors if v), 0)
+            added = 0
+            for (text, tier), vector in zip(todo, vectors, strict=False):
+                if vector and len(vector) == dim and text not in self._texts:
+                    self._texts.add(text)
+                    self._labels.append(tier)
+                    self._rows.append(_unit(vector, dim))
+                    added += 1
+            if added:
+                self._array = None
+                self._votes.clear()
+        return added
+
+    def vote(self, message: str, k: int = EXEMPLAR_K) -> tuple[str, float, float, int] | None:
+        """(tier, vote share, margin over the runner-up, exemplars voting for it), or None.
+
+        Votes are weighted by cosine similarity. Results are memoized per
+        message until the index changes; a failed embedding is not.
+        """
+        if not self._seeded:
+            self._seeded = self.add([(text, tier) for tier, texts in self._seed.items() for text in texts]) > 0
+        with self._lock:
+            if message in self._votes:
+                self._votes.move_to_end(message)
+                return self._votes[message]
+        vector = _embed(message, site="_classify_exemplars")
+        if not vector:
+            return None
+        with self._lock:
+            result = self._vote(vector, k)
+            self._votes[message] = result
+            if len(self._votes) > 1024:
+                self._votes.popitem(last=False)
+        return result
+
+    def _vote(self, vector: list, k: int) -> tuple[str, float, float, int] | None:
+        if not self._rows or len(vector) != len(self._rows[0]):
+            return None
+        query = _unit(vector, len(vector))
+        np = _numpy()
+        if np is not None:
+            if self._array is None:
+                self._array = np.asarray(self._rows, dtype=float)
+            scores: list[float] = (self._array @ np.asarray(query, dtype=float)).tolist()
+        else:
+            scores = [sum(x * y for x, y in zip(row, query, strict=True)) for row in self._rows]
+        nearest = heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)
+        weights: dict[str, float] = {}
+        voters: dict[str, int] = {}
+        for i in nearest:
+            weights[self._labels[i]] = weights.get(self._labels[i], 0.0) + max(scores[i], 0.0)
+            voters[self._labels[i]] = voters.get(self._labels[i], 0) + 1
+        total = sum(weights.values())
+        if total <= 0:
+            return None
+        ranked = sorted(weights.items(), key=lambda item: item[1], reverse=True)
+        share = ranked[0][1] / total
+        runner_up = ranked[1][1] / total if len(ranked) > 1 else 0.0
+        return ranked[0][0], share, share - runner_up, voters[ranked[0][0]]
+
+
+_exemplars = _ExemplarIndex()
+
+
+def _classify_exemplars(message: str) -> tuple[str, str, float] | None:
+    """Top-k exemplar vote, or None when it is unavailable or too close to call."""
+    result = _exemplars.vote(message)
+    if result is None:
+        return None
+    tier, share, margin, voters = result
+    if margin < EXEMPLAR_MIN_MARGIN:
+        return None
+    reason = f"Exemplar vote: {voters} of {min(EXEMPLAR_K, len(_exemplars))} nearest examples (margin {margin:.2f})"
+    return tier, reason, round(min(share, 0.9), 2)
+
+
+def refresh_tier_exemplars(limit: int = 1000, tenant: str = "") -> dict:
+    """Add the intents of `tenant`'s sessions whose gate passed, labeled with their tier, to the exemplars.
+
+    The exemplars are shared by every caller of classify_tier, so only
+    import a tenant whose intents all callers may see.
+    """
+    confirmed = storage.confirmed_tiers(limit, tenant)
+    examples = [(intent.strip(), LEGACY_MAP.get(tier, tier)) for intent, tier in confirmed]
+    added = _exemplars.add(examples)
+    return {"added": added, "total": len(_exemplars)}
+
+
 def resolve_tier_override(override: str) -> str:
     """Resolve a tier override to a valid 5-tier name. Accepts legacy names."""
     upper = override.upper().strip()
@@ -323,20 +763,37 @@ def should_escalate(session: dict) -> tuple[str, str] | None:
 # ── Field Assessment ──────────────────────────────────────
 
 _field_question_embeddings: dict[str, list] = {}
+_FIELD_QUESTIONS = {fk: q for fields in DRAFT_FIELDS.values() for fk, q in fields.items()}
 
 
 def _get_field_embedding(field_key: str) -> list:
     """Embed field question + answer-form keywords for better matching."""
-    if field_key not in _field_question_embeddings:
+    if field_key in _field_question_embeddings:
+        count("draft_cache_requests_total", cache="field_embedding", result="hit")
+    else:
+        count("draft_cache_requests_total", cache="field_embedding", result="miss")
         for _dim_key, fields in DRAFT_FIELDS.items():
             if field_key in fields:
                 question = fields[field_key]
                 enrichment = _field_enrichment(field_key)
-                _field_question_embeddings[field_key] = _embed(f"{question} {enrichment}")
+                _field_question_embeddings[field_key] = _embed(f"{question} {enrichment}", site="_get_field_embedding")
                 break
     return _field_question_embeddings.get(field_key, [])
 
 
+def _field_embeddings(field_keys: list[str]) -> dict[str, list]:
+    """Field embeddings for several fields, missing ones embedded in one batch."""
+    missing = [fk for fk in field_keys if fk not in _field_question_embeddings]
+    count("draft_cache_requests_total", len(field_keys) - len(missing), cache="field_embedding", result="hit")
+    if missing:
+        count("draft_cache_requests_total", len(missing), cache="field_embedding", result="miss")
+        texts = [f"{_FIELD_QUESTIONS[fk]} {_field_enrichment(fk)}" for fk in missing]
+        for fk, vector in zip(missing, _embed_many(texts, site="_field_embeddings"), strict=True):
+            if vector:
+                _field_question_embeddings[fk] = vector
+    return {fk: _field_question_embeddings.get(fk, []) for fk in field_keys}
+
+
 def _field_enrichment(field_key: str) -> str:
     """Answer-form templates for better question-to-context cosine similarity."""
     return {
@@ -367,8 +824,149 @@ def _field_enrichment(field_key: str) -> str:
     }.get(field_key, "")
 
 
+# ── Chunked Embedding ─────────────────────────────────────
+# Long contexts are embedded as overlapping chunks and each field is scored
+# by its best-matching chunk, so a field answered late in a long brief is
+# still found. Chunk embeddings are cached, so re-mapping an extended
+# context only embeds the chunks that changed.
+
+_CHUNK_CACHE_SIZE = 4096
+_chunk_embeddings: OrderedDict[str, list] = OrderedDict()
+_chunk_lock = threading.Lock()
+_SNIPPET_CHARS = 200
+_SNIPPET_STOPWORDS = frozenset({
+    "the", "and", "are", "for", "that", "this", "what", "with", "which", "who", "when", "how",
+    "does", "from", "following", "will", "would", "should", "must", "can", "into", "its", "our",
+    "their", "there", "these", "those", "being", "been", "have", "has",
+})
+
+
+def _chunk_context(context: str) -> list[str]:
+    """Split context into windows of EMBED_CHUNK_CHARS overlapping by EMBED_CHUNK_OVERLAP.
+
+    Windows start at fixed offsets and end at the last space before the size
+    limit, so appending to a context leaves its earlier chunks unchanged.
+    At most EMBED_MAX_CHUNKS chunks are returned.
+    """
+    size = max(EMBED_CHUNK_CHARS, 1)
+    step = max(size - EMBED_CHUNK_OVERLAP, 1)
+    chunks: list[str] = []
+    start = 0
+    while start < len(context) and len(chunks) < EMBED_MAX_CHUNKS:
+        end = start + size
+        if end < len(context):
+            cut = context.rfind(" ", start + step, end)
+            end = cut if cut > 0 else end
+        chunk = context[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(context):
+            break
+        start += step
+    return chunks
+
+
+def _embed_chunks(chunks: list[str]) -> list[list]:
+    """Embeddings for chunks, from the LRU cache or one batched provider call."""
+    keys = [_chunk_key(chunk) for chunk in chunks]
+    with _chunk_lock:
+        vectors = [_chunk_embeddings.get(key) for key in keys]
+        for key, vector in zip(keys, vectors, strict=True):
+            if vector is not None:
+                _chunk_embeddings.move_to_end(key)
+    todo = [i for i, vector in enumerate(vectors) if vector is None]
+    count("draft_cache_requests_total", len(chunks) - len(todo), cache="chunk_embedding", result="hit")
+    if todo:
+        count("draft_cache_requests_total", len(todo), cache="chunk_embedding", result="miss")
+        fresh = _embed_many([chunks[i] for i in todo], site="_embed_chunks")
+        for i, vector in zip(todo, fresh, strict=True):
+            vectors[i] = vector
+        _cache_chunks([keys[i] for i in todo], fresh)
+    return [vector or [] for vector in vectors]
+
+
+def _chunk_key(chunk: str) -> str:
+    return _hash(f"{providers.EMBED_MODEL}\0{chunk}")
+
+
+def _cache_chunks(keys: list[str], vectors: list[list]) -> None:
+    with _chunk_lock:
+        for key, vector in zip(keys, vectors, strict=True):
+            if vector:  # Failed batches are retried next time
+                _chunk_embeddings[key] = vector
+        while len(_chunk_embeddings) > _CHUNK_CACHE_SIZE:
+            _chunk_embeddings.popitem(last=False)
+
+
+def _chunk_matches(context: str) -> dict[str, tuple[float, str]]:
+    """{field_key: (similarity, chunk)} for each field's best-matching chunk.
+
+    The whole field x chunk similarity matrix is computed at once. Empty when
+    no embeddings are available, so callers fall back to keywords.
+    """
+    if not _embed_available():
+        return {}
+    chunks = _chunk_context(context)
+    chunk_vectors = _embed_chunks(chunks)
+    usable = [i for i, vector in enumerate(chunk_vectors) if vector]
+    fields = {fk: v for fk, v in _field_embeddings(list(_FIELD_QUESTIONS)).items() if v}
+    if not usable or not fields:
+        return {}
+    matrix = _similarity_matrix(list(fields.values()), [chunk_vectors[i] for i in usable])
+    matches = {}
+    for field_key, row in zip(fields, matrix, strict=True):
+        best = max(range(len(row)), key=row.__getitem__)
+        matches[field_key] = (row[best], chunks[usable[best]])
+    return matches
+
+
+def _words(text: str) -> set[str]:
+    return set(re.findall(r"[a-z]{3,}", text.lower())) - _SNIPPET_STOPWORDS
+
+
+def _best_snippet(field_key: str, chunk: str) -> str:
+    """The sentence of `chunk` sharing the most words with the field's question and answer form."""
+    terms = _words(f"{_FIELD_QUESTIONS.get(field_key, '')} {_field_enrichment(field_key)}")
+    sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+|\n+", chunk) if s.strip()]
+    best = max(sentences, key=lambda s: len(terms & _words(s)), default=chunk)
+    return best[:_SNIPPET_CHARS]
+
+
+# ── Incremental Mapping ───────────────────────────────────
+# draft_map is usually called again with the context extended by elicitation
+# answers. Each assessment records a fingerprint of the context window its
+# assessor reads (the LLM path only sees a prefix). While that window is
+# unchanged the result is reused, and open (MISSING/AMBIGUOUS) fields are
+# assessed against the newly added paragraphs alone.
+
+_LLM_FIELD_WINDOW = 1200
+_LLM_SCREEN_WINDOW = 800
+_FIELD_WINDOW = {"llm": _LLM_FIELD_WINDOW, "embed": None, "keyword": None}
+_SCREEN_WINDOW = {"llm": _LLM_SCREEN_WINDOW, "embed": None, "keyword": None}
+_STATUS_RANK = {"MISSING": 0, "AMBIGUOUS": 1, "SATISFIED": 2}
+
+
+def _hash(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+
+def _context_segments(context: str) -> list[tuple[str, str]]:
+    """(hash, paragraph) for each blank-line separated paragraph of the context."""
+    return [(_hash(p), p) for p in (part.strip() for part in re.split(r"\n\s*\n", context)) if p]
+
+
+def _fingerprint(mode: str, context: str, window: int | None) -> str:
+    return _hash(f"{mode}\0{context[:window] if window else context}")
+
+
+@_retry_conflicts
 def map_dimensions(session_id: str, context: str) -> dict:
-    """Map DRAFT dimensions against user context using LLM or heuristics."""
+    """Map DRAFT dimensions against user context using LLM or heuristics.
+
+    Re-mapping is incremental: CONFIRMED fields are kept, assessments whose
+    context window is unchanged are reused, and only new paragraphs are
+    checked for fields that are still open.
+    """
     # M1.3: Closed session guard
     closed = _check_open(session_id)
     if closed:
@@ -382,90 +980,204 @@ def map_dimensions(session_id: str, context: str) -> dict:
         storage.log_audit(session_id, "draft_map", "REJECTED", "Empty or whitespace-only context")
         return {"error": "Cannot map dimensions with empty context. Provide task description."}
 
-    use_llm = _llm_available()
-    dimensions = session.get("dimensions", {})
-    context_embedding = _embed(context[:2000]) if not use_llm else []
+    tier = session["tier"]
+    audit = _map_session(session, context)
+    # One CAS write for the mapping and any auto-escalation
+    changes = {k: session[k] for k in ("dimensions", "context_segments", "context_fps")}
+    if session["tier"] != tier:
+        changes["tier"] = session["tier"]
+    storage.update_session(session_id, expected_version=session["version"], **changes)
+    storage.log_audit_many([(session_id, *entry) for entry in audit])
 
-    for dim_key, fields in DRAFT_FIELDS.items():
-        if dim_key not in dimensions:
-            dimensions[dim_key] = {}
+    # T16: Sycophancy screening on mapped context
+    syc_result = _sycophancy_screen(session_id, context)
+    if syc_result.get("flagged"):
+        storage.log_audit(session_id, "draft_map", "sycophancy_screen", _sycophancy_detail(syc_result["words"]))
 
-        if dim_key not in MANDATORY_DIMENSIONS:
-            if use_llm:
-                applicable = _screen_dimension_llm(dim_key, context)
-            else:
-                applicable = _context_suggests_applicable(dim_key, context)
-            if not applicable:
-                dimensions[dim_key] = {
-                    "_screened": True,
-                    "_reason": f"{DIMENSION_NAMES[dim_key]} not applicable",
-                }
-                continue
+    return session["dimensions"]
 
-        for field_key, question in fields.items():
-            if field_key in dimensions[dim_key] and dimensions[dim_key][field_key].get("status") == "CONFIRMED":
-                continue
 
-            if use_llm:
-                status = _assess_field_llm(field_key, question, context)
+def _sycophancy_detail(words: list[str]) -> str:
+    return f"Evaluative words: {len(words)}. Words: {words[:200]}"
+
+
+def _map_session(session: dict, context: str) -> list[tuple[str, str, str]]:
+    """Map `context` into session's dimensions in memory (see map_dimensions).
+
+    Updates dimensions, context_segments, context_fps and, on auto-escalation, tier.
+    Returns the (tool_name, action, detail) audit entries to write.
+    """
+    plan = _MapPlan(session, context)
+    matches: dict[str, dict[str, tuple[float, str]]] = {}
+
+    def screen(dim_key: str, text: str) -> bool:
+        if plan.use_llm:
+            return _screen_dimension_llm(dim_key, text)
+        return _context_suggests_applicable(dim_key, text)
+
+    def assess(field_key: str, question: str, text: str) -> dict:
+        if plan.use_llm:
+            return _assess_field_llm(field_key, question, text)
+        if text not in matches:  # One chunk scoring per distinct text, only if a field needs it
+            matches[text] = _chunk_matches(text)
+        return _assess_field_embedding(field_key, question, text, matches[text])
+
+    fields = plan.fields([screen(dim_key, text) for dim_key, text in plan.screens])
+    return plan.finish([assess(*item) for item in fields])
+
+
+class _MapPlan:
+    """One mapping pass, split around its two rounds of assessor calls.
+
+    `screens` lists the (dim_key, text) screenings to run; fields() takes
+    their verdicts and lists the (field_key, question, text) assessments;
+    finish() takes those results and applies everything to the session.
+    The calls within a round are independent, so the async API can issue
+    each round's provider requests concurrently.
+    """
+
+    def __init__(self, session: dict, context: str):
+        self.session = session
+        self.context = context
+        self.use_llm = _llm_available()
+        self.mode = "llm" if self.use_llm else ("embed" if _embed_available() else "keyword")
+        self.dimensions = session.get("dimensions", {})
+        self.segments = _context_segments(context)
+        seen = set(session.get("context_segments") or [])
+        self.added = "\n\n".join(text for h, text in self.segments if h not in seen) if seen else ""
+        self.field_fp = _fingerprint(self.mode, context, _FIELD_WINDOW[self.mode])
+        self.screen_fp = _fingerprint(self.mode, context, _SCREEN_WINDOW[self.mode])
+        # Fingerprint of the context each dimension was screened / field assessed on
+        self.fps: dict[str, str] = dict(session.get("context_fps") or {})
+        self.screens: list[tuple[str, str]] = []
+        self._applicable: dict[str, bool] = {}
+        self._pending: list[tuple[dict, str, str, dict | None]] = []
+        self.reused = 0
+        for dim_key in DRAFT_FIELDS:
+            if dim_key in MANDATORY_DIMENSIONS:
+                continue
+            current = self.dimensions.get(dim_key, {})
+            if self.fps.get(dim_key) != self.screen_fp:
+                self.screens.append((dim_key, context))
+            elif current.get("_screened") and self.added:
+                self.screens.append((dim_key, self.added))  # Only new paragraphs can change it
             else:
-                status = _assess_field_embedding(field_key, question, context, context_embedding)
+                self._applicable[dim_key] = not current.get("_screened")
+
+    def fields(self, verdicts: list[bool]) -> list[tuple[str, str, str]]:
+        """Apply screening verdicts (in `screens` order); return the assessments to run."""
+        applicable = dict(self._applicable)
+        applicable.update((dim_key, ok) for (dim_key, _), ok in zip(self.screens, verdicts, strict=True))
+        todo = []
+        for dim_key, fields in DRAFT_FIELDS.items():
+            current = self.dimensions.setdefault(dim_key, {})
+
+            if dim_key not in MANDATORY_DIMENSIONS:
+                if not applicable[dim_key]:
+                    self.dimensions[dim_key] = {
+                        "_screened": True,
+                        "_reason": f"{DIMENSION_NAMES[dim_key]} not applicable",
+                    }
+                    self.fps[dim_key] = self.screen_fp
+                    continue
+                if current.get("_screened"):
+                    current = self.dimensions[dim_key] = {}
+                self.fps[dim_key] = self.screen_fp
 
-            dimensions[dim_key][field_key] = {
+            for field_key, question in fields.items():
+                previous = current.get(field_key) or {}
+                if previous.get("status") == "CONFIRMED":
+                    continue
+
+                if previous and self.fps.get(field_key) == self.field_fp:
+                    # The assessor's view of the context is unchanged: only paragraphs
+                    # added since the last mapping can resolve an open field.
+                    if not self.added or previous.get("status") == "SATISFIED":
+                        self.reused += 1
+                        continue
+                    self._pending.append((current, field_key, question, previous))
+                    todo.append((field_key, question, self.added))
+                else:
+                    self._pending.append((current, field_key, question, None))
+                    todo.append((field_key, question, self.context))
+        return todo
+
+    def finish(self, results: list[dict]) -> list[tuple[str, str, str]]:
+        """Apply assessment results (in fields() order); return the audit entries."""
+        for (current, field_key, question, previous), status in zip(self._pending, results, strict=True):
+            if previous is not None and _STATUS_RANK.get(status["status"], 0) <= _STATUS_RANK.get(
+                previous.get("status", ""), 0
+            ):
+                continue  # New paragraphs only ever upgrade an open field
+            current[field_key] = {
                 "question": question,
                 "status": status["status"],
                 "confidence": status.get("confidence", 0.5),
                 "extracted": status.get("extracted"),
             }
+            self.fps[field_key] = self.field_fp
+        assessed = len(results)
+        count("draft_map_fields_total", assessed, result="assessed")
+        count("draft_map_fields_total", self.reused, result="reused")
+
+        session = self.session
+        session["dimensions"] = self.dimensions
+        session["context_segments"] = [h for h, _ in self.segments]
+        session["context_fps"] = self.fps
+        audit = [
+            (
+                "draft_map",
+                "dimensions_mapped",
+                f"Mapped {len(DRAFT_FIELDS)} dims ({'llm' if self.use_llm else 'heuristic'}; "
+                f"{assessed} fields assessed, {self.reused} reused)",
+            )
+        ]
+        esc = should_escalate(session)
+        if esc:
+            session["tier"] = esc[0]
+            audit.append(("draft_map", "auto_escalation", esc[1]))
+        return audit
 
-    storage.update_session(session_id, dimensions=dimensions)
-    storage.log_audit(
-        session_id,
-        "draft_map",
-        "dimensions_mapped",
-        f"Mapped {len(DRAFT_FIELDS)} dims ({'llm' if use_llm else 'heuristic'})",
-    )
-
-    session["dimensions"] = dimensions
-    esc = should_escalate(session)
-    if esc:
-        storage.update_session(session_id, tier=esc[0])
-        storage.log_audit(session_id, "draft_map", "auto_escalation", esc[1])
-
-    # T16: Sycophancy screening on mapped context
-    syc_result = _sycophancy_screen(session_id, context)
-    if syc_result.get("flagged"):
-        storage.log_audit(
-            session_id, "draft_map", "sycophancy_screen",
-            f"Evaluative words: {syc_result['count']}. Words: {syc_result['words'][:200]}"
-        )
 
-    return dimensions
+def _screen_dimension_llm(dim_key: str, context: str) -> bool:
+    call = _screen_call(dim_key, context)
+    if call is None:
+        return True
+    result = _llm_call(*call)
+    if result is not None:
+        return result.get("applicable", True)
+    return True
 
 
-def _screen_dimension_llm(dim_key: str, context: str) -> bool:
-    dim_name = DIMENSION_NAMES.get(dim_key, dim_key)
+def _screen_call(dim_key: str, context: str) -> tuple[str, dict, int, str] | None:
+    """_llm_call arguments screening a dimension, None if it has no screening question."""
     screen_q = DIMENSION_SCREEN_QUESTIONS.get(dim_key, "")
     if not screen_q:
-        return True
-
-    prompt = f"""Given this task context, is the dimension "{dim_name}" applicable?
+        return None
+    prompt = f"""Given this task context, is the dimension "{DIMENSION_NAMES.get(dim_key, dim_key)}" applicable?
 Screening question: {screen_q}
 
-Context: {context[:800]}"""
-
-    result = _llm_call(prompt, SCREEN_SCHEMA, timeout=15)
-    if result is not None:
-        return result.get("applicable", True)
-    return True
+Context: {context[:_LLM_SCREEN_WINDOW]}"""
+    return prompt, SCREEN_SCHEMA, 15, "_screen_dimension_llm"
 
 
 def _assess_field_llm(field_key: str, question: str, context: str) -> dict:
+    result = _llm_call(*_field_call(field_key, question, context))
+    if result and result.get("status") in ("SATISFIED", "AMBIGUOUS", "MISSING"):
+        # Hard enforcement: strip fabricated extractions from non-SATISFIED fields
+        if result["status"] in ("AMBIGUOUS", "MISSING"):
+            result["extracted"] = ""
+        return result
+    return _assess_field_embedding(field_key, question, context)
+
+
+def _field_call(field_key: str, question: str, context: str) -> tuple[str, dict, int, str]:
+    """_llm_call arguments assessing one field."""
     prompt = f"""Assess whether this DRAFT field is addressed by the context.
 
 Field {field_key}: {question}
 
-Context: {context[:1200]}
+Context: {context[:_LLM_FIELD_WINDOW]}
 
 Rules:
 - SATISFIED: Context clearly addresses this field.
@@ -473,65 +1185,34 @@ Rules:
 - MISSING: Context does not address this field.
 - Extract relevant info if SATISFIED or AMBIGUOUS.
 - Rate confidence 0.0 to 1.0."""
-
-    result = _llm_call(prompt, FIELD_SCHEMA, timeout=20)
-    if result and result.get("status") in ("SATISFIED", "AMBIGUOUS", "MISSING"):
-        # Hard enforcement: strip fabricated extractions from non-SATISFIED fields
-        if result["status"] in ("AMBIGUOUS", "MISSING"):
-            result["extracted"] = ""
-        return result
-    return _assess_field_embedding(field_key, question, context, [])
+    return prompt, FIELD_SCHEMA, 20, "_assess_field_llm"
 
 
-def _assess_field_embedding(field_key: str, question: str, context: str, context_emb: list) -> dict:
-    if not context_emb:
-        context_emb = _embed(context[:1000])
-    field_emb = _get_field_embedding(field_key)
+def _assess_field_embedding(
+    field_key: str, question: str, context: str, matches: dict[str, tuple[float, str]] | None = None
+) -> dict:
+    """Score a field by its best-matching context chunk (see _chunk_matches).
 
-    if not context_emb or not field_emb:
+    `matches` lets callers score the context once for all fields.
+    """
+    if matches is None:
+        matches = _chunk_matches(context)
+    if field_key not in matches:
         # No embedding available — keyword fallback
         return _assess_field_keyword(field_key, context)
 
-    sim = _cosine_sim(context_emb, field_emb)
+    sim, chunk = matches[field_key]
 
     if sim >= 0.55:
-        return {"status": "SATISFIED", "confidence": round(sim, 3), "extracted": f"Semantic match ({sim:.3f})"}
+        return {"status": "SATISFIED", "confidence": round(sim, 3), "extracted": _best_snippet(field_key, chunk)}
     elif sim >= 0.40:
-        return {"status": "AMBIGUOUS", "confidence": round(sim, 3), "extracted": f"Partial match ({sim:.3f})"}
+        return {"status": "AMBIGUOUS", "confidence": round(sim, 3), "extracted": _best_snippet(field_key, chunk)}
     return {"status": "MISSING", "confidence": round(max(0.1, 1.0 - sim), 3)}
 
 
 def _assess_field_keyword(field_key: str, context: str) -> dict:
     """Pure keyword fallback when no LLM or embedding is available."""
-    lower = context.lower()
-    keywords = {
-        "D1": ["building", "creating", "system", "tool", "service", "product"],
-        "D2": ["domain", "area", "scope", "field"],
-        "D3": ["without", "fail", "break", "depend", "block", "need"],
-        "D4": ["alternative", "replace", "existing", "instead", "workaround"],
-        "D5": ["not about", "non-goal", "exclude", "out of scope", "won't"],
-        "R1": ["authority", "owner", "decision maker", "approve", "responsible"],
-        "R2": ["allowed", "permitted", "can do", "authorized"],
-        "R3": ["forbidden", "prohibited", "cannot", "must not", "never"],
-        "R4": ["stop", "halt", "abort", "limit", "condition"],
-        "R5": ["interface", "api", "connect", "integrate", "interact"],
-        "A1": ["input", "accept", "receive", "data", "file"],
-        "A2": ["reject", "block", "invalid", "forbidden input"],
-        "A3": ["output", "produce", "generate", "return", "response"],
-        "A4": ["forbidden output", "must not produce", "never output"],
-        "A5": ["example", "correct", "expected"],
-        "A6": ["incorrect", "wrong", "bad example"],
-        "F1": ["change authority", "modify", "who can change"],
-        "F2": ["permitted change", "allowed update", "can modify"],
-        "F3": ["frozen", "immutable", "locked", "cannot change"],
-        "F4": ["review trigger", "audit", "threshold", "when to review"],
-        "T1": ["success", "pass", "works", "complete", "verified"],
-        "T2": ["failure", "fail", "error", "broken", "incorrect"],
-        "T3": ["review question", "check", "verify", "audit question"],
-        "T4": ["evidence", "proof", "test result", "demonstration"],
-    }
-    field_kws = keywords.get(field_key, [])
-    matches = sum(1 for kw in field_kws if kw in lower)
+    matches = len(_keywords().hits(_keyword_hits(context), field_key)) if field_key in _FIELD_KEYWORDS else 0
     if matches >= 2:
         return {"status": "SATISFIED", "confidence": 0.6, "extracted": f"Keyword match ({matches} hits)"}
     elif matches == 1:
@@ -540,14 +1221,9 @@ def _assess_field_keyword(field_key: str, context: str) -> dict:
 
 
 def _context_suggests_applicable(dim_key: str, context: str) -> bool:
-    lower = context.lower()
-    if dim_key == "R":
-        return any(w in lower for w in ["authority", "decision", "permission", "limit", "allowed", "forbidden"])
-    if dim_key == "A":
-        return any(w in lower for w in ["file", "output", "input", "document", "data", "artifact", "create"])
-    if dim_key == "F":
-        return any(w in lower for w in ["change", "update", "evolve", "lifecycle", "adapt", "version"])
-    return True
+    if dim_key not in _SCREEN_KEYWORDS:
+        return True
+    return bool(_keywords().hits(_keyword_hits(context), f"screen:{dim_key}"))
 
 
 # ── Elicitation ───────────────────────────────────────────
@@ -564,10 +1240,74 @@ def generate_elicitation(session_id: str) -> list[dict]:
     if not session:
         return [{"error": f"Session {session_id} not found"}]
 
+    questions = _elicitation_questions(session)
+    storage.log_audit(session_id, "draft_elicit", "questions_generated", f"Generated {len(questions)} questions")
+    return questions
+
+
+def iter_elicitation(session_id: str) -> Generator[dict, None, None]:
+    """generate_elicitation() as a stream of events, so the first question arrives at once.
+
+    Events, in order:
+      {"event": "question", "index", "question", "pending"}: every question
+          right away, with the static suggestion scaffold. `pending` is True
+          when an LLM suggestion will follow.
+      {"event": "suggestion", "index", "field", "suggestion"}: each LLM
+          suggestion as it completes (DRAFT_ELICIT_CONCURRENCY at a time).
+      {"event": "done", "question_count"}
+    A closed or unknown session yields a single {"event": "error", "error"}.
+    """
+    closed = _check_open(session_id)
+    if closed:
+        yield {"event": "error", **closed}
+        return
+    session = storage.get_session(session_id)
+    if not session:
+        yield {"event": "error", "error": f"Session {session_id} not found"}
+        return
+
+    questions = _elicitation_scaffold(session)
+    storage.log_audit(session_id, "draft_elicit", "questions_generated", f"Generated {len(questions)} questions")
+    intent = session.get("intent", "")
+    pending = bool(questions and intent) and _llm_available()
+    for index, item in enumerate(questions):
+        yield {"event": "question", "index": index, "question": item, "pending": pending}
+
+    if pending:
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        pool = ThreadPoolExecutor(min(len(questions), max(ELICIT_CONCURRENCY, 1)), thread_name_prefix="draft-elicit")
+        try:
+            futures = {
+                pool.submit(
+                    contextvars.copy_context().run, _smart_suggestion, item["field"], item["question"], intent
+                ): index
+                for index, item in enumerate(questions)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                field = questions[index]["field"]
+                yield {"event": "suggestion", "index": index, "field": field, "suggestion": future.result()}
+        finally:  # A client that stops reading must not wait for the remaining calls
+            pool.shutdown(wait=False, cancel_futures=True)
+    yield {"event": "done", "question_count": len(questions)}
+
+
+def _elicitation_questions(session: dict) -> list[dict]:
+    """Questions for the session's MISSING/AMBIGUOUS fields, with collaborative framing."""
+    questions = _elicitation_scaffold(session)
+    if _llm_available():
+        intent = session.get("intent", "")
+        for item in questions:
+            item["suggestion"] = _smart_suggestion(item["field"], item["question"], intent)
+    return questions
+
+
+def _elicitation_scaffold(session: dict) -> list[dict]:
+    """_elicitation_questions() with the static suggestion scaffolds (no LLM)."""
     questions: list[dict[str, Any]] = []
     dims = session.get("dimensions", {})
     intent = session.get("intent", "")
-    use_llm = _llm_available()
 
     for dim_key, fields in dims.items():
         if isinstance(fields, dict) and fields.get("_screened"):
@@ -578,7 +1318,6 @@ def generate_elicitation(session_id: str) -> list[dict]:
             status = info.get("status", "MISSING")
             if status in ("MISSING", "AMBIGUOUS"):
                 q = DRAFT_FIELDS.get(dim_key, {}).get(field_key, "")
-                suggestion = _smart_suggestion(field_key, q, intent) if use_llm else _suggest_answer(field_key, intent)
                 questions.append(
                     {
                         "dimension": f"{dim_key} — {DIMENSION_NAMES.get(dim_key, dim_key)}",
@@ -586,13 +1325,11 @@ def generate_elicitation(session_id: str) -> list[dict]:
                         "question": q,
                         "current_status": status,
                         "confidence": info.get("confidence", 0.0),
-                        "suggestion": suggestion,
+                        "suggestion": _suggest_answer(field_key, intent),
                         "extracted": info.get("extracted"),
                     }
                 )
 
-    storage.log_audit(session_id, "draft_elicit", "questions_generated", f"Generated {len(questions)} questions")
-
     # Collaborative framing (PEACE + MI) — added to each question
     for item in questions:
         item["framing"] = _collaborative_frame(item["field"], item.get("current_status", "MISSING"))
@@ -619,7 +1356,7 @@ Task intent: {intent[:300]}
 
 Provide a concrete, actionable suggestion with an example if possible."""
 
-    result = _llm_call(prompt, SUGGESTION_SCHEMA, timeout=15)
+    result = _llm_call(prompt, SUGGESTION_SCHEMA, timeout=15, site="_smart_suggestion")
     if result and result.get("suggestion"):
         s = result["suggestion"]
         if result.get("example"):
@@ -662,17 +1399,22 @@ def open_elicitation(session_id: str) -> dict:
     if not session:
         return {"error": f"Session {session_id} not found"}
 
+    result, entry = _open_question(session)
+    storage.log_audit(session_id, *entry)
+    return {"session_id": session_id, **result}
+
+
+def _open_question(session: dict) -> tuple[dict, tuple[str, str, str]]:
+    """The open elicitation result (without session_id) and its audit entry."""
     tier = session.get("tier", "TASK")
     ceremony = TIER_CEREMONY.get(tier, "visible")
 
     # TRIVIAL/LOOKUP skip open elicitation
     if ceremony in ("invisible", "tag"):
-        storage.log_audit(session_id, "open_elicit", "skipped", f"Ceremony={ceremony}, tier={tier}")
         return {
-            "session_id": session_id,
             "skipped": True,
             "reason": f"Tier {tier} uses {ceremony} ceremony — open elicitation not needed.",
-        }
+        }, ("open_elicit", "skipped", f"Ceremony={ceremony}, tier={tier}")
 
     intent = session.get("intent", "")
 
@@ -701,6 +1443,7 @@ Rules:
                 "required": ["question"],
             },
             timeout=15,
+            site="open_elicitation",
         )
 
         if result and result.get("question"):
@@ -708,26 +1451,22 @@ Rules:
             framing = result.get(
                 "framing", "Your description helps me map this accurately before I start interpreting."
             )
-            storage.log_audit(session_id, "open_elicit", "generated", q[:200])
             return {
-                "session_id": session_id,
                 "question": q,
                 "framing": framing,
                 "instruction": "Present this question to the human. Their response becomes context for draft_map.",
-            }
+            }, ("open_elicit", "generated", q[:200])
 
     # Fallback: static open question
     fallback_q = (
         "Before I map this out — can you describe in your own words "
         "what you're trying to accomplish and what success looks like?"
     )
-    storage.log_audit(session_id, "open_elicit", "fallback", f"Tier={tier}")
     return {
-        "session_id": session_id,
         "question": fallback_q,
         "framing": "Your description shapes how I understand this — nothing is assumed yet.",
         "instruction": "Present this question to the human. Their response becomes context for draft_map.",
-    }
+    }, ("open_elicit", "fallback", f"Tier={tier}")
 
 
 # ── Assumption Quality Scoring ────────────────────────────
@@ -745,6 +1484,7 @@ _QUALITY_SCHEMA = {
 }
 
 
+@_retry_conflicts
 def score_assumptions(session_id: str) -> dict:
     """Score each assumption by falsifiability, impact, and novelty.
 
@@ -796,7 +1536,7 @@ def score_assumptions(session_id: str) -> dict:
         assumptions[i]["quality_score"] = quality
         assumptions[i]["low_quality"] = low_quality
 
-    storage.update_session(session_id, assumptions=assumptions)
+    storage.update_session(session_id, expected_version=session["version"], assumptions=assumptions)
     storage.log_audit(
         session_id,
         "score_assumptions",
@@ -824,7 +1564,7 @@ Falsifiability: How testable is this? Can you clearly prove it wrong? (1.0 = hig
 Impact: If this assumption is wrong, how much rework? (1.0 = total rework, 0.0 = trivial)
 Novelty: Is this a genuine risk or just restating the obvious? (1.0 = novel insight, 0.0 = obvious restatement)"""
 
-    result = _llm_call(prompt, _QUALITY_SCHEMA, timeout=15)
+    result = _llm_call(prompt, _QUALITY_SCHEMA, timeout=15, site="_score_assumption_llm")
     if result:
         return {
             "falsifiability": result.get("falsifiability", 0.5),
@@ -836,26 +1576,23 @@ Novelty: Is this a genuine risk or just restating the obvious? (1.0 = novel insi
 
 def _score_assumption_heuristic(claim: str, source: str) -> dict:
     """Heuristic assumption quality scoring without LLM."""
-    lower = claim.lower()
+    found = _keywords().scan(claim)
 
     # Falsifiability: does it have testable conditions?
     falsifiability = 0.5
-    test_words = ["if ", "when ", "unless ", "would ", "could ", "fails", "breaks", "wrong"]
-    if any(w in lower for w in test_words):
+    if _keywords().hits(found, "assumption:testable"):
         falsifiability = 0.7
-    if "not " in lower or "never " in lower or "always " in lower:
+    if _keywords().hits(found, "assumption:strong"):
         falsifiability = 0.8  # Strong claims are more falsifiable
 
     # Impact: does it reference scope, architecture, or critical systems?
     impact = 0.5
-    critical_words = ["architecture", "governance", "security", "scope", "authority", "production", "data"]
-    if any(w in lower for w in critical_words):
+    if _keywords().hits(found, "assumption:critical"):
         impact = 0.7
 
     # Novelty: is it just echoing a confirmed field?
     novelty = 0.5
-    restatement_patterns = ["for d", "for r", "for a", "for f", "for t", "context_extraction"]
-    if source == "context_extraction" or any(p in lower for p in restatement_patterns):
+    if source == "context_extraction" or _keywords().hits(found, "assumption:restatement"):
         novelty = 0.2  # Likely restating confirmed fields
     if source in ("llm_adversarial", "manual", "devils_advocate"):
         novelty = 0.7
@@ -876,6 +1613,7 @@ _ASSUMPTION_SCHEMA = {
 }
 
 
+@_retry_conflicts
 def generate_assumptions(session_id: str) -> list[dict]:
     """Surface key assumptions as falsifiable claims.
 
@@ -895,6 +1633,14 @@ def generate_assumptions(session_id: str) -> list[dict]:
     if not session:
         return [{"error": f"Session {session_id} not found"}]
 
+    assumptions, entry = _session_assumptions(session)
+    storage.update_session(session_id, expected_version=session["version"], assumptions=assumptions)
+    storage.log_audit(session_id, *entry)
+    return assumptions
+
+
+def _session_assumptions(session: dict) -> tuple[list[dict], tuple[str, str, str]]:
+    """Assumptions for the session's current mapping and the audit entry recording them."""
     dims = session.get("dimensions", {})
     tier = session.get("tier", "STANDARD")
     use_llm = _llm_available()
@@ -907,14 +1653,11 @@ def generate_assumptions(session_id: str) -> list[dict]:
     else:
         assumptions = _generate_heuristic_assumptions(dims, max_assumptions)
 
-    storage.update_session(session_id, assumptions=assumptions)
-    storage.log_audit(
-        session_id,
+    return assumptions, (
         "draft_assumptions",
         "generated",
         f"{len(assumptions)} assumptions (tier={tier}, {'llm' if use_llm else 'heuristic'})",
     )
-    return assumptions
 
 
 def _generate_llm_assumptions(dims: dict, intent: str, tier: str, max_count: int) -> list[dict]:
@@ -957,7 +1700,7 @@ Rules:
 
     assumptions = []
     for _i in range(max_count):
-        result = _llm_call(prompt, _ASSUMPTION_SCHEMA, timeout=20)
+        result = _llm_call(prompt, _ASSUMPTION_SCHEMA, timeout=20, site="_generate_llm_assumptions")
         if result and result.get("claim"):
             assumptions.append(
                 {
@@ -1049,6 +1792,7 @@ def _detect_perfunctory(dims: dict) -> list[str]:
     return warnings
 
 
+@_retry_conflicts
 def check_gate(session_id: str) -> dict:
     """Check whether all applicable fields are confirmed."""
     # M1.3: Closed session guard
@@ -1062,6 +1806,7 @@ def check_gate(session_id: str) -> dict:
 
     dims = session.get("dimensions", {})
     blockers = []
+    audit = []  # Written after the CAS write, so a re-run does not repeat them
     confirmed = 0
     total = 0
 
@@ -1080,11 +1825,13 @@ def check_gate(session_id: str) -> dict:
                 extracted = info.get("extracted", "")
                 if not extracted or not str(extracted).strip() or len(str(extracted).strip()) < 3:
                     blockers.append(f"{field_key}: CONFIRMED but empty/insufficient content (possible bypass)")
-                    storage.log_audit(
-                        session_id,
-                        "draft_gate",
-                        "empty_confirm_detected",
-                        f"{field_key} confirmed with empty/short content",
+                    audit.append(
+                        (
+                            session_id,
+                            "draft_gate",
+                            "empty_confirm_detected",
+                            f"{field_key} confirmed with empty/short content",
+                        )
                     )
                 else:
                     confirmed += 1
@@ -1102,9 +1849,10 @@ def check_gate(session_id: str) -> dict:
     passed = len(blockers) == 0
     if passed:
         gate_sig = sign_gate_pass(session_id)
-        storage.update_session(session_id, gate_passed=1, gate_hmac=gate_sig)
+        storage.update_session(session_id, expected_version=session["version"], gate_passed=1, gate_hmac=gate_sig)
 
-    storage.log_audit(session_id, "draft_gate", "gate_check", f"{'PASS' if passed else 'FAIL'}: {confirmed}/{total}")
+    audit.append((session_id, "draft_gate", "gate_check", f"{'PASS' if passed else 'FAIL'}: {confirmed}/{total}"))
+    storage.log_audit_many(audit)
 
     result = {
         "passed": passed,
@@ -1132,9 +1880,10 @@ def check_gate(session_id: str) -> dict:
     # Extension point: post-gate hook (e.g., cross-gate wiring)
     if passed:
         hook = get_post_gate_hook()
-        if hook is not None:
-            with contextlib.suppress(Exception):
-                hook(session_id, result)  # Post-gate hooks are advisory, not blocking
+        if hook is not None:  # Advisory: failures never change the gate result (see hooks.py)
+            from draft_protocol import hooks
+
+            hooks.get_dispatcher().dispatch("post_gate", hook, session_id, result)
 
     # M1.5: Context enrichment — compliant agents get rich context for free
     if passed:
@@ -1163,6 +1912,7 @@ def check_gate(session_id: str) -> dict:
 # ── Field Operations ──────────────────────────────────────
 
 
+@_retry_conflicts
 def confirm_field(session_id: str, field_key: str, value: str) -> dict:
     """Confirm a DRAFT field with a human-provided answer."""
     # M1.3: Closed session guard
@@ -1206,11 +1956,12 @@ def confirm_field(session_id: str, field_key: str, value: str) -> dict:
         "confidence": 1.0,
         "confirmed_by": "human",
     }
-    storage.update_session(session_id, dimensions=dims)
+    storage.update_session(session_id, expected_version=session["version"], dimensions=dims)
     storage.log_audit(session_id, "confirm_field", f"{field_key} confirmed", stripped[:200])
     return {"field": field_key, "status": "CONFIRMED", "value": stripped}
 
 
+@_retry_conflicts
 def unscreen_dimension(session_id: str, dimension_key: str) -> dict:
     """Reverse screening on a dimension incorrectly marked N/A."""
     # M1.3: Closed session guard
@@ -1236,12 +1987,15 @@ def unscreen_dimension(session_id: str, dimension_key: str) -> dict:
     dims[dim_key] = {
         fk: {"question": q, "status": "MISSING", "confidence": 0.0, "extracted": None} for fk, q in fields.items()
     }
+    # The next mapping re-screens the dimension and assesses its fields afresh
+    fps = {k: fp for k, fp in session["context_fps"].items() if k[0] != dim_key}
 
-    storage.update_session(session_id, dimensions=dims)
+    storage.update_session(session_id, expected_version=session["version"], dimensions=dims, context_fps=fps)
     storage.log_audit(session_id, "unscreen", f"{dim_key} unscreened", f"{len(fields)} fields MISSING")
     return {"unscreened": dim_key, "fields_added": list(fields.keys())}
 
 
+@_retry_conflicts
 def add_assumption(session_id: str, claim: str, source: str = "manual", falsifier: str = "") -> dict:
     """Add a manually authored assumption."""
     # M1.3: Closed session guard
@@ -1262,7 +2016,7 @@ def add_assumption(session_id: str, claim: str, source: str = "manual", falsifie
         "falsifier": falsifier.strip() if falsifier else f"If '{claim.strip()[:80]}' is wrong, re-elicit.",
     }
     assumptions.append(new)
-    storage.update_session(session_id, assumptions=assumptions)
+    storage.update_session(session_id, expected_version=session["version"], assumptions=assumptions)
     idx = len(assumptions) - 1
     storage.log_audit(session_id, "add_assumption", f"[{idx}] added", claim[:200])
     return {"index": idx, "assumption": new}
@@ -1275,38 +2029,45 @@ def override_gate(session_id: str, reason: str) -> dict:
     if closed:
         return closed
 
-    session = storage.get_session(session_id)
-    if not session:
+    if not storage.get_session(session_id):
         return {"error": "Session not found"}
     if not reason or not reason.strip():
         return {"error": "Reason mandatory."}
 
+    # check_gate retries its own write; only the override write below is retried
     gate = check_gate(session_id)
     if gate.get("passed"):
         return {"note": "Already passed.", "gate": gate}
+    return _override_blocked_gate(session_id, reason.strip(), gate.get("blockers", []))
+
+
+@_retry_conflicts
+def _override_blocked_gate(session_id: str, reason: str, blockers: list[str]) -> dict:
+    session = storage.get_session(session_id)
+    if not session:
+        return {"error": "Session not found"}
 
     gate_sig = sign_gate_pass(session_id)
-    storage.update_session(session_id, gate_passed=1, gate_hmac=gate_sig)
-    storage.log_audit(
-        session_id, "override_gate", "OVERRIDDEN", f"AUTHORIZED: {reason.strip()}. Blockers: {gate.get('blockers', [])}"
-    )
+    storage.update_session(session_id, expected_version=session["version"], gate_passed=1, gate_hmac=gate_sig)
+    storage.log_audit(session_id, "override_gate", "OVERRIDDEN", f"AUTHORIZED: {reason}. Blockers: {blockers}")
     override_assertion = sign_assertion(
         "draft_gate_passed",
         {
             "session_id": session_id,
             "tier": session.get("tier", "STANDARD"),
             "override": True,
-            "reason": reason.strip(),
+            "reason": reason,
         },
     )
     return {
         "status": "OVERRIDDEN",
-        "reason": reason.strip(),
-        "blockers": gate.get("blockers", []),
+        "reason": reason,
+        "blockers": blockers,
         "assertion": override_assertion,
     }
 
 
+@_retry_conflicts
 def verify_assumption(session_id: str, index: int, verified: bool, note: str = "") -> dict:
     """Verify or reject an assumption."""
     # M1.3: Closed session guard
@@ -1324,7 +2085,7 @@ def verify_assumption(session_id: str, index: int, verified: bool, note: str = "
 
     assumptions[index]["verified"] = verified
     assumptions[index]["note"] = note
-    storage.update_session(session_id, assumptions=assumptions)
+    storage.update_session(session_id, expected_version=session["version"], assumptions=assumptions)
     action = "verified" if verified else "REJECTED"
     storage.log_audit(session_id, "verify_assumption", f"[{index}] {action}", note)
 
@@ -1336,6 +2097,7 @@ def verify_assumption(session_id: str, index: int, verified: bool, note: str = "
 # ── Batch Operations ──────────────────────────────────────
 
 
+@_retry_conflicts
 def confirm_batch(session_id: str, fields: dict) -> dict:
     """Confirm multiple DRAFT fields in a single call.
 
@@ -1359,6 +2121,7 @@ def confirm_batch(session_id: str, fields: dict) -> dict:
     confirmed = 0
     rejected = 0
     errors = 0
+    audit = []  # Written after the CAS update, so a retried attempt logs nothing twice
 
     dims = session.get("dimensions", {})
 
@@ -1368,14 +2131,14 @@ def confirm_batch(session_id: str, fields: dict) -> dict:
         # Validate value
         if not value or not str(value).strip():
             results[fk] = {"status": "REJECTED", "reason": "Empty value"}
-            storage.log_audit(session_id, "confirm_batch", f"{fk} REJECTED", "Empty value")
+            audit.append((session_id, "confirm_batch", f"{fk} REJECTED", "Empty value"))
             rejected += 1
             continue
 
         stripped = str(value).strip()
         if len(stripped) < 3:
             results[fk] = {"status": "REJECTED", "reason": f"Too short ({len(stripped)} chars)"}
-            storage.log_audit(session_id, "confirm_batch", f"{fk} REJECTED", f"Too short: '{stripped}'")
+            audit.append((session_id, "confirm_batch", f"{fk} REJECTED", f"Too short: '{stripped}'"))
             rejected += 1
             continue
 
@@ -1402,13 +2165,16 @@ def confirm_batch(session_id: str, fields: dict) -> dict:
         confirmed += 1
 
     # Single DB write for all changes
-    storage.update_session(session_id, dimensions=dims)
-    storage.log_audit(
-        session_id,
-        "confirm_batch",
-        f"{confirmed} confirmed, {rejected} rejected, {errors} errors",
-        f"Fields: {list(fields.keys())}",
+    storage.update_session(session_id, expected_version=session["version"], dimensions=dims)
+    audit.append(
+        (
+            session_id,
+            "confirm_batch",
+            f"{confirmed} confirmed, {rejected} rejected, {errors} errors",
+            f"Fields: {list(fields.keys())}",
+        )
     )
+    storage.log_audit_many(audit)
 
     return {
         "session_id": session_id,
@@ -1420,6 +2186,7 @@ def confirm_batch(session_id: str, fields: dict) -> dict:
     }
 
 
+@_retry_conflicts
 def quick_confirm_satisfied(session_id: str) -> dict:
     """Confirm all SATISFIED (pre-extracted) fields in one call.
 
@@ -1448,7 +2215,7 @@ def quick_confirm_satisfied(session_id: str) -> dict:
                 promoted.append(fk)
 
     if promoted:
-        storage.update_session(session_id, dimensions=dims)
+        storage.update_session(session_id, expected_version=session["version"], dimensions=dims)
         storage.log_audit(session_id, "quick_confirm", f"{len(promoted)} fields promoted", f"Fields: {promoted}")
 
     return {
@@ -1463,6 +2230,7 @@ def quick_confirm_satisfied(session_id: str) -> dict:
     }
 
 
+@_retry_conflicts
 def verify_batch(session_id: str, verifications: dict) -> dict:
     """Verify multiple assumptions in a single call.
 
@@ -1501,7 +2269,7 @@ def verify_batch(session_id: str, verifications: dict) -> dict:
             results[str(idx)] = {"status": "REJECTED", "claim": assumptions[idx].get("claim", "")[:100]}
             rejected_count += 1
 
-    storage.update_session(session_id, assumptions=assumptions)
+    storage.update_session(session_id, expected_version=session["version"], assumptions=assumptions)
     storage.log_audit(
         session_id,
         "verify_batch",
@@ -1619,6 +2387,7 @@ def _session_analytics(session: dict) -> dict:
 _TIER_ORDER = ["TRIVIAL", "LOOKUP", "TASK", "MULTI", "CONSEQUENTIAL"]
 
 
+@_retry_conflicts
 def escalate_tier(session_id: str, reason: str) -> dict:
     """Manually escalate session tier. Casual → Standard → Consequential."""
     closed = _check_open(session_id)
@@ -1639,11 +2408,12 @@ def escalate_tier(session_id: str, reason: str) -> dict:
         return {"tier": "CONSEQUENTIAL", "note": "Already at maximum tier."}
 
     new_tier = _TIER_ORDER[current_idx + 1]
-    storage.update_session(session_id, tier=new_tier)
+    storage.update_session(session_id, expected_version=session["version"], tier=new_tier)
     storage.log_audit(session_id, "escalate", f"{session['tier']} -> {new_tier}", reason)
     return {"previous_tier": session["tier"], "new_tier": new_tier, "reason": reason}
 
 
+@_retry_conflicts
 def deescalate_tier(session_id: str, reason: str) -> dict:
     """Manually de-escalate session tier (authorized override). Logged but honored."""
     closed = _check_open(session_id)
@@ -1664,7 +2434,7 @@ def deescalate_tier(session_id: str, reason: str) -> dict:
         return {"tier": "TRIVIAL", "note": "Already at minimum tier."}
 
     new_tier = _TIER_ORDER[current_idx - 1]
-    storage.update_session(session_id, tier=new_tier)
+    storage.update_session(session_id, expected_version=session["version"], tier=new_tier)
     storage.log_audit(session_id, "deescalate", f"{session['tier']} -> {new_tier}", f"AUTHORIZED: {reason}")
     return {
         "previous_tier": session["tier"],
@@ -1672,3 +2442,298 @@ def deescalate_tier(session_id: str, reason: str) -> dict:
         "reason": reason,
         "note": "De-escalation honored and logged. DRAFT mapping still occurs internally.",
     }
+
+
+# ── Pipeline ──────────────────────────────────────────────
+# One call for draft_intake → draft_open_elicit → draft_map → draft_elicit →
+# draft_assumptions. The stages share one in-memory session and nothing is
+# written until the end, when the session and its whole audit trail are
+# saved in a single transaction.
+
+PIPELINE_STAGES = ("intake", "open_elicit", "map", "elicit", "assumptions")
+
+
+def run_pipeline(
+    message: str, context: str = "", until: str = "elicit", tier_override: str = "", tenant: str = ""
+) -> dict:
+    """Run the intake stages up to and including `until` on a new session.
+
+    Same results and audit entries as calling the stage tools one after
+    another, including closing the tenant's active session like draft_intake.
+    `context` is what draft_map receives (default: the message). Returns the
+    intake fields plus "open_elicitation", "dimensions", "questions" and
+    "assumptions" for the stages that ran.
+    """
+    if until not in PIPELINE_STAGES:
+        return {"error": f"Invalid stage '{until}'. Must be one of: {', '.join(PIPELINE_STAGES)}"}
+    stages = PIPELINE_STAGES[: PIPELINE_STAGES.index(until) + 1]
+
+    with span("pipeline.intake"):
+        tier = resolve_tier_override(tier_override) if tier_override else ""
+        if tier:
+            reasoning, confidence = f"Tier manually set to {tier}", 1.0
+        else:
+            tier, reasoning, confidence = classify_tier(message)
+    if tier == "REJECTED":
+        return {"error": "Cannot create session — message is empty or invalid.", "detail": reasoning}
+
+    session: dict[str, Any] = {"tier": tier, "intent": message, "dimensions": {}, "assumptions": []}
+    audit = [("draft_intake", "session_created", f"Tier: {tier} (conf: {confidence:.2f}). {reasoning}")]
+    result: dict[str, Any] = {}
+
+    if "open_elicit" in stages:
+        with span("pipeline.open_elicit"):
+            result["open_elicitation"], entry = _open_question(session)
+        audit.append(entry)
+    if "map" in stages:
+        context = context if context and context.strip() else message
+        with span("pipeline.map"):
+            audit += _map_session(session, context)
+        words, flag = _sycophancy_flag(context)
+        if flag:
+            session["assumptions"].append(flag)
+            audit.append(("add_assumption", f"[{len(session['assumptions']) - 1}] added", flag["claim"][:200]))
+            audit.append(("draft_map", "sycophancy_screen", _sycophancy_detail(words)))
+        result["dimensions"] = session["dimensions"]
+    if "elicit" in stages:
+        with span("pipeline.elicit"):
+            result["questions"] = _elicitation_questions(session)
+        audit.append(("draft_elicit", "questions_generated", f"Generated {len(result['questions'])} questions"))
+    if "assumptions" in stages:
+        with span("pipeline.assumptions"):
+            session["assumptions"], entry = _session_assumptions(session)
+        audit.append(entry)
+        result["assumptions"] = [{"index": i, **a} for i, a in enumerate(session["assumptions"])]
+
+    active = storage.get_active_session(tenant)
+    fields = {k: session[k] for k in ("dimensions", "assumptions", "context_segments", "context_fps") if k in session}
+    session_id = storage.create_session(
+        session["tier"], message, tenant, audit=audit, replaces=active["id"] if active else None, **fields
+    )
+    count("draft_pipeline_total", until=until)
+    return {
+        "session_id": session_id,
+        "tier": session["tier"],
+        "legacy_tier": get_legacy_tier(session["tier"]),
+        "ceremony": get_ceremony_depth(session["tier"]),
+        "classification_reasoning": reasoning,
+        "classification_confidence": confidence,
+        "stages": list(stages),
+        **result,
+    }
+
+
+# ── Async API ─────────────────────────────────────────────
+# For asyncio servers. Each a* function awaits the provider round trips its
+# sync counterpart would make, all at once on the event loop, then runs the
+# sync function on a bounded thread pool where those calls are answered from
+# the fetched replies, so a worker thread only ever waits on SQLite. Working
+# out which calls to make (reads, keyword scans, dry runs) also runs on the
+# pool; the event loop only awaits provider round trips. Calls that were not
+# foreseen (e.g. after a concurrent edit) still go out synchronously from the
+# worker.
+
+_executor: Any = None
+_executor_lock = threading.Lock()
+
+
+def _pool() -> Any:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            _executor = ThreadPoolExecutor(max(ASYNC_THREADS, 1), thread_name_prefix="draft-async")
+    return _executor
+
+
+async def offload(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking engine or storage call on the async thread pool.
+
+    The call sees the caller's context variables (timings capture, fetched replies).
+    """
+    import asyncio
+
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_pool(), call)
+
+
+@contextlib.contextmanager
+def _prefetching() -> Iterator[None]:
+    """Scope for replies fetched by _aprefetch or _llm_call, replayed by _llm_call.
+
+    A nested scope shares the enclosing one.
+    """
+    if _replies.get() is not None:
+        yield
+        return
+    token = _replies.set(_ReplyLog())
+    try:
+        yield
+    finally:
+        _replies.reset(token)
+
+
+@contextlib.contextmanager
+def _rewinding() -> Iterator[None]:
+    """Scope whose _llm_call replies are left for the calls after it (planning runs)."""
+    log = _replies.get()
+    start = log.position() if log is not None else {}
+    try:
+        yield
+    finally:
+        if log is not None:
+            log.rewind(start)
+
+
+def _planned_calls(fn: Callable[..., Any], *args: Any) -> list[tuple[str, dict, int, str]]:
+    """The _llm_call arguments fn(*args) uses, from a dry run where every call fails.
+
+    Only for functions whose prompts do not depend on earlier replies.
+    """
+    calls: list[tuple[str, dict, int, str]] = []
+    token = _planned.set(calls)
+    try:
+        with _rewinding():
+            fn(*args)
+    finally:
+        _planned.reset(token)
+    return calls
+
+
+async def _aprefetch(calls: list[tuple[str, dict, int, str]]) -> None:
+    """Send (prompt, schema, timeout, site) calls concurrently and keep the replies."""
+    import asyncio
+
+    results = await asyncio.gather(
+        *(providers.achat(prompt, schema, timeout, site=site) for prompt, schema, timeout, site in calls)
+    )
+    log = _replies.get()
+    if log is not None:
+        for (prompt, *_), result in zip(calls, results, strict=True):
+            log.add(prompt, result)
+
+
+def _embedding_misses(texts: list[str]) -> tuple[list[str], list[str], list[str]]:
+    """Field keys, their question texts and the chunks of `texts` that have no cached embedding."""
+    fields = [fk for fk in _FIELD_QUESTIONS if fk not in _field_question_embeddings]
+    chunks = list(dict.fromkeys(chunk for text in texts for chunk in _chunk_context(text)))
+    with _chunk_lock:
+        chunks = [chunk for chunk in chunks if _chunk_key(chunk) not in _chunk_embeddings]
+    return fields, [f"{_FIELD_QUESTIONS[fk]} {_field_enrichment(fk)}" for fk in fields], chunks
+
+
+async def _awarm_embeddings(texts: list[str]) -> None:
+    """Embed the field questions and chunks of `texts` not cached yet, in one batched round."""
+    fields, questions, chunks = await offload(_embedding_misses, texts)
+    if not fields and not chunks:
+        return
+    vectors = await providers.aembed_many(questions + chunks, site="_awarm_embeddings")
+    for fk, vector in zip(fields, vectors, strict=False):
+        if vector:
+            _field_question_embeddings[fk] = vector
+    _cache_chunks([_chunk_key(chunk) for chunk in chunks], vectors[len(fields) :])
+
+
+def _open_session(session_id: str) -> dict | None:
+    return None if _check_open(session_id) else storage.get_session(session_id)
+
+
+def _classify_needs_llm(text: str) -> bool:
+    """Whether classify_tier(text) gets past the hook and keyword stages to the LLM."""
+    return (
+        _llm_available()
+        and len(text.split()) > 3
+        and get_classify_hook() is None
+        and _classify_keywords(text, text.lower()) is None
+    )
+
+
+def _map_plan(session_id: str, context: str) -> _MapPlan | None:
+    session = _open_session(session_id)
+    if session is None or not context or not context.strip():
+        return None
+    return _MapPlan(session, context)
+
+
+def _map_screen_calls(plan: _MapPlan) -> list[tuple[str, dict, int, str]]:
+    return [call for item in plan.screens if (call := _screen_call(*item))]
+
+
+def _map_field_calls(plan: _MapPlan) -> list[tuple[str, dict, int, str]]:
+    """The LLM field assessments, once the screenings' replies have been fetched."""
+    with _rewinding():
+        screened = [_screen_dimension_llm(*item) for item in plan.screens]
+    return [_field_call(*item) for item in plan.fields(screened)]
+
+
+def _map_embed_texts(plan: _MapPlan) -> list[str]:
+    fields = plan.fields([_context_suggests_applicable(*item) for item in plan.screens])
+    return list(dict.fromkeys(text for _, _, text in fields))
+
+
+def _planned_session_calls(session_id: str, fn: Callable[[dict], Any]) -> list[tuple[str, dict, int, str]]:
+    """The LLM calls fn(session) would make for an open session (none without an LLM)."""
+    session = _open_session(session_id)
+    if session is None or not _llm_available():
+        return []
+    return _planned_calls(fn, session)
+
+
+async def aclassify_tier(message: str) -> tuple[str, str, float]:
+    """classify_tier() for asyncio callers."""
+    text = str(message).strip() if message is not None else ""
+    with _prefetching():
+        if await offload(_classify_needs_llm, text):
+            # The vote is memoized, so classify_tier below reuses it
+            decided = EXEMPLAR_K > 0 and _embed_available() and (await offload(_classify_exemplars, text)) is not None
+            if not decided:
+                await _aprefetch(await offload(_planned_calls, _classify_llm, text))
+        return await offload(classify_tier, message)
+
+
+async def amap_dimensions(session_id: str, context: str) -> dict:
+    """map_dimensions() for asyncio callers.
+
+    With an LLM, the dimension screenings and then the field assessments
+    are sent concurrently; with embeddings, the field questions and context
+    chunks are embedded in one batched round.
+    """
+    with _prefetching():
+        plan = await offload(_map_plan, session_id, context)
+        if plan is not None and plan.use_llm:
+            await _aprefetch(await offload(_map_screen_calls, plan))
+            await _aprefetch(await offload(_map_field_calls, plan))
+        elif plan is not None and plan.mode == "embed":
+            await _awarm_embeddings(await offload(_map_embed_texts, plan))
+        return await offload(map_dimensions, session_id, context)
+
+
+async def agenerate_elicitation(session_id: str) -> list[dict]:
+    """generate_elicitation() for asyncio callers; the LLM suggestions are fetched concurrently."""
+    with _prefetching():
+        await _aprefetch(await offload(_planned_session_calls, session_id, _elicitation_questions))
+        return await offload(generate_elicitation, session_id)
+
+
+async def aiter_elicitation(session_id: str) -> AsyncIterator[dict]:
+    """iter_elicitation() for asyncio callers; each event is awaited off the event loop."""
+    events = iter_elicitation(session_id)
+    try:
+        while (event := await offload(next, events, None)) is not None:
+            yield event
+    finally:
+        with contextlib.suppress(ValueError):  # Still running on the pool after a cancellation
+            events.close()
+
+
+async def agenerate_assumptions(session_id: str) -> list[dict]:
+    """generate_assumptions() for asyncio callers; the LLM assumptions are fetched concurrently."""
+    with _prefetching():
+        await _aprefetch(await offload(_planned_session_calls, session_id, _session_assumptions))
+        return await offload(generate_assumptions, session_id)
+
+
+async def acheck_gate(session_id: str) -> dict:
+    """check_gate() for asyncio callers."""
+    return await offload(check_gate, session_id)
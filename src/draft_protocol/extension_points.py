@@ -5,7 +5,8 @@ VectorLab draft_mcp wrapper) are permitted to override. Everything else in
 draft_protocol is internal and may change between versions.
 
 Extension Points (versioned contract):
-  - classify_tier_hook: Override tier classification (e.g., GDE delegation)
+  - classify_tier_hook: Override tier classification (e.g., GDE delegation);
+    an ordered chain with pre-filters, timeouts and memoization (hooks.py)
   - post_gate_hook: Run after gate pass (e.g., cross-gate wiring)
   - storage_path_hook: Override DB location
 
@@ -16,24 +17,82 @@ Version: 1.0 — Breaking changes require major version bump.
 """
 
 from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # hooks (threads, queues) is imported when a classify hook is registered
+    from draft_protocol.hooks import ClassifyHookChain
 
 # ── Hook Registry ─────────────────────────────────────────
 # Each hook is None by default (use built-in behavior).
 # Set a hook to override the corresponding function.
 
-_classify_tier_hook: Callable | None = None
+_classify_tier_hook: "ClassifyHookChain | None" = None
 _post_gate_hook: Callable | None = None
 _storage_path_hook: Callable | None = None
 
 
-def register_classify_hook(fn: Callable) -> None:
-    """Register a custom tier classifier (e.g., GDE).
+def register_classify_hook(
+    fn: Callable,
+    *,
+    name: str | None = None,
+    when: Callable[[str], bool] | None = None,
+    timeout: float | None = None,
+    cache_size: int = 0,
+) -> None:
+    """Register a custom tier classifier (e.g., GDE), replacing any classify hooks.
 
     fn signature: (message: str) -> tuple[str, str, float] | None
     Return (tier, reasoning, confidence) to override, or None to fall through.
+    A hook that raises, or runs longer than `timeout` seconds, also falls
+    through. when(message) -> bool skips the hook (e.g. unless_confident());
+    cache_size > 0 memoizes results per message.
+    """
+    from draft_protocol.hooks import ClassifyHook, ClassifyHookChain
+
+    global _classify_tier_hook
+    _classify_tier_hook = ClassifyHookChain((ClassifyHook(fn, name, when, timeout, cache_size),))
+
+
+def add_classify_hook(
+    fn: Callable,
+    *,
+    name: str | None = None,
+    when: Callable[[str], bool] | None = None,
+    timeout: float | None = None,
+    cache_size: int = 0,
+) -> None:
+    """Append a classifier to the classify hook chain (see register_classify_hook).
+
+    Hooks run in order until one returns a result. Adding a name that is
+    already in the chain replaces that hook in place.
     """
+    from draft_protocol.hooks import ClassifyHook, ClassifyHookChain
+
     global _classify_tier_hook
-    _classify_tier_hook = fn
+    hook = ClassifyHook(fn, name, when, timeout, cache_size)
+    chain = list(_classify_tier_hook.hooks) if _classify_tier_hook is not None else []
+    names = [h.name for h in chain]
+    if hook.name in names:
+        chain[names.index(hook.name)] = hook
+    else:
+        chain.append(hook)
+    _classify_tier_hook = ClassifyHookChain(tuple(chain))
+
+
+def unless_confident(min_confidence: float = 0.85) -> Callable[[str], bool]:
+    """Classify hook filter: run the hook only when the built-in heuristics are below `min_confidence`.
+
+    The heuristics are the keyword fast path and the acknowledgment/length
+    rules (no LLM call), so "ok" and "thanks" (TRIVIAL, 0.95) skip the hook
+    while ambiguous messages still reach it.
+    """
+
+    def when(message: str) -> bool:
+        from draft_protocol.engine import _classify_heuristic
+
+        return _classify_heuristic(message)[2] < min_confidence
+
+    return when
 
 
 def register_post_gate_hook(fn: Callable) -> None:
@@ -48,13 +107,16 @@ def register_post_gate_hook(fn: Callable) -> None:
 def register_storage_path_hook(fn: Callable) -> None:
     """Register a custom storage path resolver.
 
-    fn signature: () -> Path
+    fn signature: () -> Path             — location of the home database
+              or: (session_id: str) -> Path — explicit shard mapping; must
+                  return one of storage.shard_paths()
     """
     global _storage_path_hook
     _storage_path_hook = fn
 
 
-def get_classify_hook() -> Callable | None:
+def get_classify_hook() -> "ClassifyHookChain | None":
+    """The classify hook chain (callable like a single hook; .stats() per hook), or None."""
     return _classify_tier_hook
 
 
@@ -4,55 +4,253 @@ Provides integrity guarantees for all cross-gate communication.
 Each assertion is signed with HMAC-SHA256, includes a timestamp
 and a monotonic nonce for replay protection.
 
-Secret comes from GATE_HMAC_SECRET environment variable.
+Nonces come from a NonceAllocator: strictly increasing within a process,
+disjoint across processes and never reused after a restart. The default
+allocator reserves blocks from a high-water mark persisted in the DRAFT
+database, so the signing hot path only takes an in-process lock; one
+SQLite write is amortized over NONCE_BLOCK_SIZE signatures. Pre-forked
+workers call configure_worker() after fork to drop the parent's block.
+
+Keys come from GATE_HMAC_SECRET / GATE_HMAC_KEYS (see "Key material"),
+are loaded once into a KeyRing and reloaded when their source changes.
 """
 
 import hashlib
+import heapq
 import hmac
 import json
+import logging
 import os
+import threading
 import time
+from collections.abc import Callable
 from typing import Any
 
-# Monotonic nonce counter (per-process, resets on restart)
-_nonce_counter: int = 0
+logger = logging.getLogger("draft_protocol.hmac")
+
+NONCE_BLOCK_SIZE = 1024
+
+
+# ── Key material ──────────────────────────────────────────
+#
+# GATE_HMAC_SECRET            single secret (legacy; assertions carry no kid)
+# GATE_HMAC_KEYS              "kid:secret,kid:secret" — multiple keys for rotation
+# GATE_HMAC_ACTIVE_KID        kid used for signing (default: first in GATE_HMAC_KEYS)
+#
+# Each may also come from $VECTORLAB_ROOT/.env when unset in the environment.
+# Rotation: add the new key to GATE_HMAC_KEYS and make it active; keep the
+# old key listed until assertions signed with it have aged out.
+
+_KEY_VARS = ("GATE_HMAC_SECRET", "GATE_HMAC_KEYS", "GATE_HMAC_ACTIVE_KID")
+_DEV_SECRET = "vector-gate-dev-secret-DO-NOT-USE-IN-PRODUCTION"
+_ENV_FILE_CHECK_INTERVAL = 1.0  # seconds between .env mtime checks
+
 
+class KeyRing:
+    """Loaded HMAC keys with precomputed SHA-256 HMAC objects, copied per use."""
 
-def _get_secret() -> bytes:
-    """Get HMAC secret from environment or .env file.
+    def __init__(self, keys: dict[str | None, bytes], active_kid: str | None):
+        if active_kid not in keys:
+            raise RuntimeError(f"Active HMAC key id {active_kid!r} is not among the configured keys")
+        self.active_kid = active_kid
+        self._macs = {kid: hmac.new(secret, digestmod=hashlib.sha256) for kid, secret in keys.items()}
+
+    @property
+    def kids(self) -> list[str | None]:
+        return list(self._macs)
+
+    def mac(self, kid: str | None = None) -> hmac.HMAC:
+        """A fresh HMAC for kid (default: the active key). KeyError if unknown."""
+        return self._macs[self.active_kid if kid is None else kid].copy()
+
+    def sign(self, message: bytes) -> str:
+        m = self.mac()
+        m.update(message)
+        return m.hexdigest()
+
+    def candidates(self, kid: str | None) -> list[hmac.HMAC]:
+        """Keys to try for a signature: the named key, or every key (active first) if unnamed."""
+        if kid is not None:
+            return [self._macs[kid]] if kid in self._macs else []
+        return [self._macs[self.active_kid]] + [m for k, m in self._macs.items() if k != self.active_kid]
+
+    def verify(self, message: bytes, sig: str, kid: str | None = None) -> bool:
+        for base in self.candidates(kid):
+            m = base.copy()
+            m.update(message)
+            if hmac.compare_digest(sig, m.hexdigest()):
+                return True
+        return False
+
+
+def _env_file() -> str | None:
+    lab_root = os.environ.get("VECTORLAB_ROOT", "")
+    if not lab_root:
+        return None
+    path = os.path.join(lab_root, ".env")
+    return path if os.path.isfile(path) else None
+
+
+def _read_env_file(path: str) -> dict[str, str]:
+    values: dict[str, str] = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("#") or "=" not in line:
+                    continue
+                name, value = line.split("=", 1)
+                if name.strip() in _KEY_VARS:
+                    values[name.strip()] = value.strip().strip("\"'")
+    except OSError:
+        pass
+    return values
+
+
+def _load_keyring() -> KeyRing:
+    """Build a KeyRing from the environment, $VECTORLAB_ROOT/.env, or dev mode.
 
     Raises RuntimeError if no secret is found and DRAFT_DEV_MODE is not set.
     """
-    secret = os.environ.get("GATE_HMAC_SECRET", "")
-    if not secret:
-        lab_root = os.environ.get("VECTORLAB_ROOT", "")
-        if lab_root:
-            env_path = os.path.join(lab_root, ".env")
-            if os.path.isfile(env_path):
-                try:
-                    with open(env_path) as f2:
-                        for line in f2:
-                            line = line.strip()
-                            if line.startswith("GATE_HMAC_SECRET=") and not line.startswith("#"):
-                                secret = line.split("=", 1)[1].strip().strip("\"'")
-                                break
-                except OSError:
-                    pass
-    if not secret:
+    config = {name: os.environ.get(name, "") for name in _KEY_VARS}
+    if not (config["GATE_HMAC_SECRET"] or config["GATE_HMAC_KEYS"]):
+        path = _env_file()
+        if path:
+            config.update({k: v for k, v in _read_env_file(path).items() if not config[k]})
+
+    keys: dict[str | None, bytes] = {}
+    for entry in filter(None, (e.strip() for e in config["GATE_HMAC_KEYS"].split(","))):
+        kid, sep, secret = entry.partition(":")
+        if not sep or not kid.strip() or not secret.strip():
+            raise RuntimeError("GATE_HMAC_KEYS entries must look like kid:secret")
+        keys[kid.strip()] = secret.strip().encode()
+    if config["GATE_HMAC_SECRET"]:
+        keys[None] = config["GATE_HMAC_SECRET"].encode()  # Legacy key: verify-only once kids exist
+
+    if not keys:
         if os.environ.get("DRAFT_DEV_MODE", "") == "1":
-            secret = "vector-gate-dev-secret-DO-NOT-USE-IN-PRODUCTION"
+            keys[None] = _DEV_SECRET.encode()
         else:
             raise RuntimeError(
                 "GATE_HMAC_SECRET not set. Set the environment variable or set DRAFT_DEV_MODE=1 for local development."
             )
-    return secret.encode()
+
+    active = config["GATE_HMAC_ACTIVE_KID"] or next(iter(keys))
+    return KeyRing(keys, active)
+
+
+_keyring: KeyRing | None = None
+_keyring_fingerprint: tuple = ()
+_keyring_lock = threading.Lock()
+_env_file_state: tuple = (0.0, None)  # (checked_at, mtime_ns)
+
+
+def _fingerprint() -> tuple:
+    """Cheap identity of the key configuration: env values + .env mtime (stat at most once a second)."""
+    global _env_file_state
+    env = tuple(os.environ.get(name, "") for name in (*_KEY_VARS, "VECTORLAB_ROOT", "DRAFT_DEV_MODE"))
+    checked_at, mtime = _env_file_state
+    now = time.monotonic()
+    if now - checked_at >= _ENV_FILE_CHECK_INTERVAL:
+        path = _env_file()
+        try:
+            mtime = os.stat(path).st_mtime_ns if path else None
+        except OSError:
+            mtime = None
+        _env_file_state = (now, mtime)
+    return (*env, mtime)
+
+
+def get_keyring() -> KeyRing:
+    """The current KeyRing, reloaded when the environment or .env file changes."""
+    global _keyring, _keyring_fingerprint
+    fingerprint = _fingerprint()
+    ring = _keyring
+    if ring is not None and fingerprint == _keyring_fingerprint:
+        return ring
+    with _keyring_lock:
+        if _keyring is None or fingerprint != _keyring_fingerprint:
+            _keyring = _load_keyring()
+            _keyring_fingerprint = fingerprint
+        return _keyring
+
+
+def reload_keys() -> None:
+    """Drop cached keys; the next sign/verify reloads them (e.g. from a SIGHUP handler)."""
+    global _keyring, _env_file_state
+    with _keyring_lock:
+        _keyring = None
+        _env_file_state = (0.0, None)
+
+
+def install_reload_signal() -> None:
+    """Reload keys on SIGHUP (POSIX). Call from a long-running server's main thread."""
+    import signal
+
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: reload_keys())
+
+
+# ── Nonces ────────────────────────────────────────────────
+
+
+class NonceAllocator:
+    """Hands out increasing nonces from blocks obtained via reserve(count) -> first."""
+
+    def __init__(self, reserve: Callable[[int], int], block_size: int = NONCE_BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError(f"block_size must be >= 1, got {block_size}")
+        self._reserve = reserve
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 1
+        self._end = 0  # Empty block: first call reserves
+
+    def next(self) -> int:
+        with self._lock:
+            if self._next > self._end:
+                start = self._reserve(self.block_size)
+                self._next, self._end = start, start + self.block_size - 1
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    def reset(self) -> None:
+        """Forget the current block (after fork, the parent still owns it)."""
+        self._lock = threading.Lock()  # The parent's lock may have been held at fork time
+        self._next, self._end = 1, 0
+
+
+def _reserve_from_storage(count: int) -> int:
+    from draft_protocol import storage
+
+    return storage.reserve_nonces(count)
+
+
+_nonce_allocator = NonceAllocator(_reserve_from_storage)
+
+
+def set_nonce_allocator(allocator: NonceAllocator) -> None:
+    """Replace the nonce source (e.g. a reserve() backed by a shared service)."""
+    global _nonce_allocator
+    _nonce_allocator = allocator
+
+
+def configure_worker(worker_id: int) -> None:
+    """Prepare nonce allocation in a freshly forked worker.
+
+    The worker reserves its own block on first use, so its nonces never
+    overlap the parent's or a sibling's. worker_id is for logging only.
+    """
+    if worker_id < 0:
+        raise ValueError(f"worker_id must be >= 0, got {worker_id}")
+    _nonce_allocator.reset()
+    logger.debug("Worker %d: nonce block reset", worker_id)
 
 
 def _next_nonce() -> int:
     """Return next monotonic nonce."""
-    global _nonce_counter
-    _nonce_counter += 1
-    return _nonce_counter
+    return _nonce_allocator.next()
 
 
 def sign_assertion(assertion_type: str, payload: dict[str, Any]) -> dict:
@@ -64,58 +262,186 @@ def sign_assertion(assertion_type: str, payload: dict[str, Any]) -> dict:
         "payload": {...},
         "timestamp": "1773474000",
         "nonce": 1,
-        "hmac": "hex..."
+        "hmac": "hex...",
+        "kid": "2026-10"      # only when keys are configured with ids
     }
     """
+    ring = get_keyring()
     ts = str(int(time.time()))
     nonce = _next_nonce()
-    # Canonical form: type|timestamp|nonce|sorted-json-payload
+    # Canonical form: type|timestamp|nonce|sorted-json-payload (kid is not signed:
+    # naming the wrong key can only make verification fail)
     canonical = f"{assertion_type}|{ts}|{nonce}|{json.dumps(payload, sort_keys=True)}"
-    sig = hmac.new(_get_secret(), canonical.encode(), hashlib.sha256).hexdigest()
-    return {
+    signed = {
         "type": assertion_type,
         "payload": payload,
         "timestamp": ts,
         "nonce": nonce,
-        "hmac": sig,
+        "hmac": ring.sign(canonical.encode()),
     }
+    if ring.active_kid is not None:
+        signed["kid"] = ring.active_kid
+    return signed
+
+
+# ── Replay protection ─────────────────────────────────────
+
+
+class ReplayCache:
+    """In-process memory of verified assertions, expiring with their freshness window.
+
+    Keys live in time buckets of `bucket_seconds` by expiry time, with a
+    key -> bucket index for O(1) lookup. Expired buckets are dropped whole
+    on access, so memory is bounded by the assertions seen in one window.
+    `max_entries` is a hard cap: once full, seen() fails closed (reports a
+    replay) rather than evicting live keys and reopening a replay window.
+    """
+
+    def __init__(self, bucket_seconds: int = 10, max_entries: int = 1_000_000):
+        if bucket_seconds < 1:
+            raise ValueError(f"bucket_seconds must be >= 1, got {bucket_seconds}")
+        self.bucket_seconds = bucket_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._buckets: dict[int, set] = {}  # bucket -> keys expiring in it
+        self._order: list[int] = []  # min-heap of bucket ids
+        self._index: dict[tuple, int] = {}  # key -> bucket
+
+    def seen(self, key: tuple, expires_at: int) -> bool:
+        """Record key until expires_at. True if it was already recorded (a replay)."""
+        now = int(time.time())
+        with self._lock:
+            self._expire(now)
+            if key in self._index:
+                return True
+            if len(self._index) >= self.max_entries:
+                logger.warning("Replay cache full (%d entries); rejecting", self.max_entries)
+                return True
+            bucket = expires_at // self.bucket_seconds
+            if bucket not in self._buckets:
+                self._buckets[bucket] = set()
+                heapq.heappush(self._order, bucket)
+            self._buckets[bucket].add(key)
+            self._index[key] = bucket
+            return False
+
+    def _expire(self, now: int) -> None:
+        current = now // self.bucket_seconds
+        while self._order and self._order[0] < current:
+            for key in self._buckets.pop(heapq.heappop(self._order)):
+                del self._index[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
 
+class SharedReplayCache:
+    """Replay cache in the DRAFT SQLite database, shared by every worker process."""
 
-def verify_assertion(assertion: dict, max_age_seconds: int = 300) -> dict:
+    def __init__(self, purge_every: int = 1000):
+        self.purge_every = purge_every
+        self._inserts = 0
+        self._lock = threading.Lock()
+
+    def seen(self, key: tuple, expires_at: int) -> bool:
+        from draft_protocol import storage
+
+        with self._lock:
+            self._inserts += 1
+            purge = self._inserts % self.purge_every == 0
+        if purge:
+            storage.purge_replay_keys(int(time.time()))
+        return not storage.claim_replay_key("|".join(map(str, key)), expires_at)
+
+
+def verify_assertion(assertion: dict, max_age_seconds: int = 300, replay_cache: Any = None) -> dict:
     """Verify a signed assertion.
 
-    Checks HMAC integrity, timestamp freshness, and nonce monotonicity.
+    Checks HMAC integrity and timestamp freshness. With a replay_cache
+    (ReplayCache, SharedReplayCache, or anything with seen(key, expires_at)),
+    also rejects an assertion whose (type, nonce, hmac) was already accepted
+    within the max_age_seconds window.
 
     Returns:
         {"valid": True, "type": "...", "payload": {...}}
         {"valid": False, "reason": "..."}
     """
-    required = {"type", "payload", "timestamp", "nonce", "hmac"}
+    return _verify_one(assertion, get_keyring(), int(time.time()), max_age_seconds, replay_cache)
+
+
+def verify_assertions(
+    assertions: list,
+    max_age_seconds: int = 300,
+    replay_cache: Any = None,
+    max_workers: int = 0,
+) -> dict:
+    """Verify a batch of assertions, e.g. when replaying a queue.
+
+    Keys and the clock are resolved once for the whole batch and each HMAC
+    is a copy of a precomputed key object. With max_workers > 1 the batch
+    is split across a thread pool (hashlib releases the GIL on large
+    payloads). Results keep input order.
+
+    Returns:
+        {"results": [<verify_assertion result>, ...], "total": n, "valid": n, "invalid": n}
+    """
+    ring = get_keyring()
+    now = int(time.time())
+
+    def run(chunk: list) -> list[dict]:
+        return [_verify_one(a, ring, now, max_age_seconds, replay_cache) for a in chunk]
+
+    if max_workers > 1 and len(assertions) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        size = -(-len(assertions) // max_workers)
+        chunks = [assertions[i : i + size] for i in range(0, len(assertions), size)]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = [r for part in pool.map(run, chunks) for r in part]
+    else:
+        results = run(assertions)
+
+    valid = sum(1 for r in results if r["valid"])
+    return {"results": results, "total": len(results), "valid": valid, "invalid": len(results) - valid}
+
+
+_REQUIRED_FIELDS = frozenset({"type", "payload", "timestamp", "nonce", "hmac"})
+
+
+def _verify_one(assertion: Any, ring: KeyRing, now: int, max_age_seconds: int, replay_cache: Any) -> dict:
     if not isinstance(assertion, dict):
         return {"valid": False, "reason": f"Expected dict, got {type(assertion).__name__}"}
-    if not required.issubset(assertion.keys()):
-        return {"valid": False, "reason": f"Missing fields: {required - set(assertion.keys())}"}
+    if not _REQUIRED_FIELDS.issubset(assertion.keys()):
+        return {"valid": False, "reason": f"Missing fields: {set(_REQUIRED_FIELDS - set(assertion.keys()))}"}
 
     a_type = assertion["type"]
     payload = assertion["payload"]
     ts = assertion["timestamp"]
     nonce = assertion["nonce"]
     sig = assertion["hmac"]
+    kid = assertion.get("kid")
+
+    if kid is not None and kid not in ring.kids:
+        return {"valid": False, "reason": f"Unknown key id {kid!r}"}
 
     # Reconstruct canonical form and verify HMAC
     canonical = f"{a_type}|{ts}|{nonce}|{json.dumps(payload, sort_keys=True)}"
-    expected = hmac.new(_get_secret(), canonical.encode(), hashlib.sha256).hexdigest()
-    if not hmac.compare_digest(sig, expected):
+    if not isinstance(sig, str) or not ring.verify(canonical.encode(), sig, kid):
         return {"valid": False, "reason": "HMAC mismatch — possible tampering"}
 
     # Timestamp freshness
     try:
-        age = abs(int(time.time()) - int(ts))
+        age = abs(now - int(ts))
         if age > max_age_seconds:
             return {"valid": False, "reason": f"Assertion stale ({age}s > {max_age_seconds}s)"}
     except (ValueError, TypeError):
         return {"valid": False, "reason": "Invalid timestamp"}
 
+    # Only authentic, fresh assertions reach the cache, so forgeries cannot fill it
+    if replay_cache is not None and replay_cache.seen((a_type, str(nonce), sig), int(ts) + max_age_seconds):
+        return {"valid": False, "reason": f"Replay detected — nonce {nonce} already used"}
+
     return {"valid": True, "type": a_type, "payload": payload}
 
 
@@ -130,8 +456,7 @@ def sign_gate_pass(session_id: str) -> str:
     """
     ts = str(int(time.time()))
     payload = f"{session_id}|1|{ts}".encode()
-    sig = hmac.new(_get_secret(), payload, hashlib.sha256).hexdigest()
-    return f"{ts}:{sig}"
+    return f"{ts}:{get_keyring().sign(payload)}"
 
 
 def verify_gate_pass(session_id: str, gate_hmac: str | None) -> bool:
@@ -143,8 +468,7 @@ def verify_gate_pass(session_id: str, gate_hmac: str | None) -> bool:
         return False
     ts, sig = parts
     payload = f"{session_id}|1|{ts}".encode()
-    expected = hmac.new(_get_secret(), payload, hashlib.sha256).hexdigest()
-    return hmac.compare_digest(sig, expected)
+    return get_keyring().verify(payload, sig)  # No kid in this format: any configured key
 
 
 def verify_or_warn(session_id: str, gate_hmac: str | None) -> dict:
@@ -0,0 +1,341 @@
+"""Hook Dispatch — run extension hooks with timeouts, retries and metrics.
+
+Post-gate hooks (extension_points.register_post_gate_hook) are advisory:
+a slow or hung hook, such as a network call to another gate, should not
+hold up draft_gate. HookDispatcher delivers hook events in one of three
+modes (DRAFT_HOOK_MODE):
+
+  - inline: Default. Called in the caller's thread, errors ignored, no timeout.
+  - sync:   Called in the caller's thread with a timeout and retries, so
+            events are delivered in order before the caller continues.
+  - async:  Queued for a pool of background workers; the caller returns at
+            once. Arguments are deep-copied when queued. With more than one
+            worker, events may be delivered out of order.
+
+Outside inline mode each attempt runs on its own daemon thread, so a timeout
+(DRAFT_HOOK_TIMEOUT) abandons a hung hook instead of tying up the caller or a
+worker. Failed and timed-out attempts are retried DRAFT_HOOK_RETRIES times
+with exponential backoff. A full queue (DRAFT_HOOK_QUEUE_SIZE) drops events.
+
+Every attempt is a "hook.<name>" span (draft_hook_duration_seconds) and is
+counted in draft_hook_calls_total{hook, result=ok|error|timeout|dropped};
+the queue depth is the draft_hook_queue_depth gauge.
+
+Classify hooks run on classify_tier's hot path as a ClassifyHookChain: an
+ordered list of ClassifyHooks, each with an optional pre-filter (`when`,
+e.g. extension_points.unless_confident()), timeout and per-message LRU cache. A hook that is
+filtered out, times out, raises or returns None falls through to the next
+one, and then to the built-in classifier. Calls are "hook.classify:<name>"
+spans; cache lookups are counted in draft_cache_requests_total.
+"""
+
+import atexit
+import contextlib
+import contextvars
+import copy
+import logging
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from draft_protocol.config import HOOK_MODE, HOOK_QUEUE_SIZE, HOOK_RETRIES, HOOK_TIMEOUT, HOOK_WORKERS
+from draft_protocol.instrumentation import count, span
+
+logger = logging.getLogger("draft_protocol.hooks")
+
+HOOK_MODES = ("inline", "sync", "async")
+
+
+class HookDispatcher:
+    """Delivers hook calls inline, synchronously with timeouts, or via a worker queue."""
+
+    def __init__(
+        self,
+        mode: str = HOOK_MODE,
+        workers: int = HOOK_WORKERS,
+        queue_size: int = HOOK_QUEUE_SIZE,
+        timeout: float = HOOK_TIMEOUT,
+        retries: int = HOOK_RETRIES,
+        backoff: float = 0.5,
+    ):
+        if mode not in HOOK_MODES:
+            raise ValueError(f"Invalid hook mode '{mode}'. Must be one of: {', '.join(HOOK_MODES)}")
+        self.mode = mode
+        self.workers = max(workers, 1)
+        self.timeout = timeout
+        self.retries = max(retries, 0)
+        self.backoff = backoff
+        self._queue: queue.Queue = queue.Queue(maxsize=max(queue_size, 0))
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def dispatch(self, name: str, fn: Callable[..., Any], *args: Any) -> bool:
+        """Deliver fn(*args) according to the mode. False if it failed (sync) or was dropped (async)."""
+        if self.mode == "inline":
+            with span(f"hook.{name}"):
+                try:
+                    fn(*args)
+                except Exception:
+                    count("draft_hook_calls_total", hook=name, result="error")
+                    return False
+            count("draft_hook_calls_total", hook=name, result="ok")
+            return True
+        if self.mode == "sync":
+            # A hook abandoned after its timeout keeps running: give it a copy, not the caller's objects
+            return self._deliver(name, fn, copy.deepcopy(args))
+        self.start()
+        try:
+            self._queue.put_nowait((name, fn, copy.deepcopy(args)))
+        except queue.Full:
+            count("draft_hook_calls_total", hook=name, result="dropped")
+            logger.warning("Hook queue full (%d); dropped %s event", self._queue.maxsize, name)
+            return False
+        return True
+
+    def depth(self) -> int:
+        """Events queued and not yet picked up by a worker."""
+        return self._queue.qsize()
+
+    def _deliver(self, name: str, fn: Callable[..., Any], args: tuple) -> bool:
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.0))
+            result = self._attempt(name, fn, args)
+            count("draft_hook_calls_total", hook=name, result=result)
+            if result == "ok":
+                return True
+        logger.warning("Hook %s failed after %d attempt(s)", name, self.retries + 1)
+        return False
+
+    def _attempt(self, name: str, fn: Callable[..., Any], args: tuple) -> str:
+        """One call on its own daemon thread: "ok", "error" or "timeout"."""
+        with span(f"hook.{name}"):
+            return _call(name, fn, args, self.timeout)[0]
+
+    # ── Workers ──
+
+    def start(self) -> "HookDispatcher":
+        """Start the worker threads (async mode starts them on first dispatch)."""
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._run, name="draft-hook-worker", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._deliver(*item)
+            except Exception:  # Keep the worker alive whatever a hook does
+                logger.exception("Hook dispatch failed")
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued event was delivered (or given up). False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Deliver what is queued, then stop the workers (waiting at most `timeout` each)."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+
+def _call(name: str, fn: Callable[..., Any], args: tuple, timeout: float | None) -> tuple[str, Any]:
+    """fn(*args) on a daemon thread, abandoned after `timeout` seconds: (outcome, return value)."""
+    outcome: list[tuple[str, Any]] = []
+    context = contextvars.copy_context()
+
+    def call() -> None:
+        try:
+            outcome.append(("ok", context.run(fn, *args)))
+        except Exception:
+            logger.debug("Hook %s raised", name, exc_info=True)
+            outcome.append(("error", None))
+
+    thread = threading.Thread(target=call, name=f"draft-hook-{name}", daemon=True)
+    thread.start()
+    thread.join(timeout if timeout and timeout > 0 else None)
+    return outcome[0] if outcome else ("timeout", None)
+
+
+# ── Process-wide dispatcher ───────────────────────────────
+
+_dispatcher: HookDispatcher | None = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> HookDispatcher:
+    """The process-wide dispatcher, configured from DRAFT_HOOK_* on first use."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = HookDispatcher()
+            atexit.register(_stop_at_exit)
+        return _dispatcher
+
+
+def set_dispatcher(dispatcher: HookDispatcher | None) -> None:
+    """Install a dispatcher (None: rebuild from config on next use). The old one is stopped."""
+    global _dispatcher
+    with _dispatcher_lock:
+        old, _dispatcher = _dispatcher, dispatcher
+    if old is not None and old is not dispatcher:
+        old.stop(old.timeout)
+
+
+def queue_depth() -> int:
+    """Queued hook events in the process-wide dispatcher (0 before first use)."""
+    return _dispatcher.depth() if _dispatcher is not None else 0
+
+
+def _stop_at_exit() -> None:
+    with contextlib.suppress(Exception):  # Interpreter shutdown: best effort
+        if _dispatcher is not None:
+            _dispatcher.stop(_dispatcher.timeout)
+
+
+# ── Classify hook chain ───────────────────────────────────
+
+_MISS = object()
+_CLASSIFY_STATS = ("skipped", "cache_hits", "calls", "decided", "errors", "timeouts")
+
+
+class ClassifyHook:
+    """One classifier in the classify hook chain.
+
+    fn(message) -> (tier, reasoning, confidence) | None. `when(message)` gates
+    the call (None: always run). With a timeout, the call runs on a daemon
+    thread and is abandoned once it takes longer. With cache_size > 0 the last
+    cache_size results (None included) are memoized per message; errors and
+    timeouts are not cached.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[str], Any],
+        name: str | None = None,
+        when: Callable[[str], bool] | None = None,
+        timeout: float | None = None,
+        cache_size: int = 0,
+    ):
+        self.fn = fn
+        self.name: str = name or str(getattr(fn, "__name__", "hook"))
+        self.when = when
+        self.timeout = timeout
+        self.cache_size = max(cache_size, 0)
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._stats = dict.fromkeys(_CLASSIFY_STATS, 0)
+        self._seconds = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, message: str) -> Any:
+        label = f"classify:{self.name}"
+        try:
+            wanted = self.when is None or self.when(message)
+        except Exception:
+            logger.debug("Classify hook %s filter raised", self.name, exc_info=True)
+            wanted = False
+        if not wanted:
+            self._record("skipped")
+            count("draft_hook_calls_total", hook=label, result="skipped")
+            return None
+        if self.cache_size:
+            with self._lock:
+                result = self._cache.get(message, _MISS)
+                if result is not _MISS:
+                    self._cache.move_to_end(message)
+            count("draft_cache_requests_total", cache=label, result="miss" if result is _MISS else "hit")
+            if result is not _MISS:
+                self._record("cache_hits", decided=result is not None)
+                return result
+
+        started = time.perf_counter()
+        with span(f"hook.{label}"):
+            if self.timeout:
+                outcome, result = _call(label, self.fn, (message,), self.timeout)
+            else:
+                try:
+                    outcome, result = "ok", self.fn(message)
+                except Exception:
+                    logger.debug("Hook %s raised", label, exc_info=True)
+                    outcome, result = "error", None
+        count("draft_hook_calls_total", hook=label, result=outcome)
+        if outcome != "ok":
+            logger.warning(
+                "Classify hook %s %s; falling through", self.name, "timed out" if outcome == "timeout" else "failed"
+            )
+        self._record(
+            {"ok": "calls", "error": "errors", "timeout": "timeouts"}[outcome],
+            decided=result is not None,
+            seconds=time.perf_counter() - started,
+        )
+        if outcome == "ok" and self.cache_size:
+            with self._lock:
+                self._cache[message] = result
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def _record(self, key: str, decided: bool = False, seconds: float = 0.0) -> None:
+        with self._lock:
+            self._stats[key] += 1
+            self._stats["decided"] += decided
+            self._seconds += seconds
+
+    def stats(self) -> dict:
+        """Counts, cache and decision rates, and mean call latency (cache hits excluded)."""
+        with self._lock:
+            stats: dict[str, Any] = dict(self._stats)
+            seconds = self._seconds
+        invoked = stats["calls"] + stats["errors"] + stats["timeouts"]
+        lookups = invoked + stats["cache_hits"]
+        stats["cache_hit_rate"] = round(stats["cache_hits"] / lookups, 4) if lookups else 0.0
+        stats["decided_rate"] = round(stats["decided"] / lookups, 4) if lookups else 0.0
+        stats["mean_ms"] = round(seconds * 1000 / invoked, 3) if invoked else 0.0
+        return stats
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+class ClassifyHookChain:
+    """Ordered classify hooks: the first non-None result wins."""
+
+    def __init__(self, hooks: tuple[ClassifyHook, ...] = ()):
+        self.hooks = tuple(hooks)
+
+    def __call__(self, message: str) -> Any:
+        for hook in self.hooks:
+            result = hook(message)
+            if result is not None:
+                return result
+        return None
+
+    def __len__(self) -> int:
+        return len(self.hooks)
+
+    def stats(self) -> dict[str, dict]:
+        """ClassifyHook.stats() per hook name, in chain order."""
+        return {hook.name: hook.stats() for hook in self.hooks}
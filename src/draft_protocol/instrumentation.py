@@ -0,0 +1,319 @@
+"""Latency Instrumentation — lightweight spans across engine, providers and storage.
+
+Spans are named timers with optional string tags:
+
+    with span("provider.chat", site="_assess_field_llm", provider="ollama"):
+        ...
+
+Counters are named event tallies with the same kind of tags:
+
+    count("draft_classify_total", tier="TASK", path="keyword")
+
+Where span results go is pluggable:
+  - NoopCollector:      Default. Spans cost one attribute check.
+  - HistogramCollector: In-process latency histograms and counters per (name, tags).
+  - LogCollector:       One log line per span on the "draft_protocol.timings" logger.
+
+Select with DRAFT_METRICS=none|histogram|log, or call set_collector().
+The REST transport defaults to histogram so /metrics has data (see metrics.py).
+
+Independently of the collector, capture_timings() records every span in
+the current context so a tool or REST response can carry a `timings` block
+(enabled with DRAFT_TIMINGS=1, or per REST request via X-Draft-Timings: 1).
+"""
+
+import bisect
+import contextlib
+import contextvars
+import functools
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from typing import Any, TypeVar
+
+from draft_protocol.config import METRICS_BACKEND, TIMINGS
+
+logger = logging.getLogger("draft_protocol.timings")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Upper bounds in milliseconds. Spans range from sub-ms SQLite reads to 30s LLM calls.
+DEFAULT_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+# ── Collectors ────────────────────────────────────────────
+
+
+class NoopCollector:
+    """Discards everything. The default."""
+
+    enabled = False
+
+    def record(self, name: str, seconds: float, tags: dict[str, str]) -> None:
+        pass
+
+    def incr(self, name: str, value: float, tags: dict[str, str]) -> None:
+        pass
+
+
+class HistogramCollector:
+    """Thread-safe in-process latency histograms keyed by (name, tags)."""
+
+    enabled = True
+
+    def __init__(self, buckets_ms: tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self._lock = threading.Lock()
+        # key -> [count, sum_ms, bucket counts (len(buckets)+1, last = +Inf)]
+        self._series: dict[tuple[str, tuple[tuple[str, str], ...]], list] = {}
+        self._counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+
+    def record(self, name: str, seconds: float, tags: dict[str, str]) -> None:
+        ms = seconds * 1000
+        key = (name, tuple(sorted(tags.items())))
+        idx = bisect.bisect_left(self.buckets_ms, ms)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0, 0.0, [0] * (len(self.buckets_ms) + 1)]
+            series[0] += 1
+            series[1] += ms
+            series[2][idx] += 1
+
+    def incr(self, name: str, value: float, tags: dict[str, str]) -> None:
+        key = (name, tuple(sorted(tags.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def counters(self) -> list[dict]:
+        """Counter values: name, tags and value."""
+        with self._lock:
+            items = sorted(self._counters.items())
+        return [{"name": name, "tags": dict(tags), "value": value} for (name, tags), value in items]
+
+    def series(self) -> list[dict]:
+        """Raw series: name, tags, count, sum_ms and non-cumulative bucket counts."""
+        with self._lock:
+            items = [(k, [v[0], v[1], list(v[2])]) for k, v in self._series.items()]
+        return [
+            {"name": name, "tags": dict(tags), "count": count, "sum_ms": total, "buckets": buckets}
+            for (name, tags), (count, total, buckets) in sorted(items)
+        ]
+
+    def snapshot(self) -> dict[str, dict]:
+        """Summary per series: count, mean and bucket-estimated p50/p95/p99 (ms)."""
+        out = {}
+        for s in self.series():
+            label = _label(s["name"], s["tags"])
+            out[label] = {
+                "count": s["count"],
+                "mean_ms": round(s["sum_ms"] / s["count"], 3) if s["count"] else 0.0,
+                "p50_ms": self._quantile(s["buckets"], s["count"], 0.50),
+                "p95_ms": self._quantile(s["buckets"], s["count"], 0.95),
+                "p99_ms": self._quantile(s["buckets"], s["count"], 0.99),
+            }
+        return out
+
+    def _quantile(self, buckets: list[int], count: int, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf past the last bound)."""
+        target = q * count
+        running = 0
+        for i, n in enumerate(buckets):
+            running += n
+            if running >= target and n:
+                return self.buckets_ms[i] if i < len(self.buckets_ms) else float("inf")
+        return 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self._counters.clear()
+
+
+class LogCollector:
+    """Logs every span: `span <name> <ms>ms key=value ...` at the given level."""
+
+    enabled = True
+
+    def __init__(self, level: int = logging.INFO):
+        self.level = level
+
+    def record(self, name: str, seconds: float, tags: dict[str, str]) -> None:
+        if logger.isEnabledFor(self.level):
+            extra = " ".join(f"{k}={v}" for k, v in sorted(tags.items()))
+            logger.log(self.level, "span %s %.3fms %s", name, seconds * 1000, extra)
+
+    def incr(self, name: str, value: float, tags: dict[str, str]) -> None:
+        pass
+
+
+def _from_config(backend: str) -> Any:
+    if backend == "histogram":
+        return HistogramCollector()
+    if backend == "log":
+        return LogCollector()
+    return NoopCollector()
+
+
+_collector: Any = _from_config(METRICS_BACKEND)
+
+
+def set_collector(collector: Any) -> None:
+    """Install a collector (any object with record(name, seconds, tags) and
+    incr(name, value, tags))."""
+    global _collector
+    _collector = collector if collector is not None else NoopCollector()
+
+
+def get_collector() -> Any:
+    return _collector
+
+
+# ── Per-request capture ───────────────────────────────────
+
+_capture: contextvars.ContextVar[list | None] = contextvars.ContextVar("draft_timings", default=None)
+
+
+@contextlib.contextmanager
+def capture_timings() -> Iterator[list]:
+    """Collect every span finished in this context into the yielded list."""
+    records: list = []
+    token = _capture.set(records)
+    try:
+        yield records
+    finally:
+        _capture.reset(token)
+
+
+def summarize_timings(records: list, total_seconds: float | None = None) -> dict:
+    """Aggregate captured spans into a response `timings` block.
+
+    {"total_ms": 812.4, "spans": {"provider.chat:_assess_field_llm": {"count": 24, "total_ms": 790.1}, ...}}
+    """
+    spans: dict[str, dict] = {}
+    for name, seconds, tags in records:
+        label = f"{name}:{tags['site']}" if "site" in tags else name
+        entry = spans.setdefault(label, {"count": 0, "total_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += seconds * 1000
+    for entry in spans.values():
+        entry["total_ms"] = round(entry["total_ms"], 3)
+    block: dict[str, Any] = {"spans": spans}
+    if total_seconds is not None:
+        block["total_ms"] = round(total_seconds * 1000, 3)
+    return block
+
+
+# ── Spans ─────────────────────────────────────────────────
+
+
+class _Span:
+    __slots__ = ("name", "start", "tags")
+
+    def __init__(self, name: str, tags: dict[str, str]):
+        self.name = name
+        self.tags = tags
+        self.start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter() - self.start
+        if exc[0] is not None:
+            self.tags["error"] = exc[0].__name__
+        _collector.record(self.name, elapsed, self.tags)
+        records = _capture.get()
+        if records is not None:
+            records.append((self.name, elapsed, self.tags))
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **tags: str) -> Any:
+    """Time a block. Near-free when no collector or capture is active."""
+    if not _collector.enabled and _capture.get() is None:
+        return _NULL_SPAN
+    return _Span(name, tags)
+
+
+def count(name: str, value: float = 1, **tags: str) -> None:
+    """Increment a counter on the active collector (no-op when disabled)."""
+    if _collector.enabled:
+        _collector.incr(name, value, tags)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator form of span() for whole functions."""
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def attach_timings(result: Any, records: list, started: float) -> Any:
+    """Add a `timings` block to a dict result (other results pass through)."""
+    if isinstance(result, dict):
+        result["timings"] = summarize_timings(records, time.perf_counter() - started)
+    return result
+
+
+def instrument_handler(name: str) -> Callable[[F], F]:
+    """Decorator for MCP tool handlers (sync or async): one span per call,
+    plus a `timings` block on the returned dict when DRAFT_TIMINGS=1."""
+
+    def decorator(fn: F) -> F:
+        import inspect  # Only the MCP server decorates handlers; keep it off the engine's import
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not TIMINGS:
+                    with span(name):
+                        return await fn(*args, **kwargs)
+                started = time.perf_counter()
+                with capture_timings() as records, span(name):
+                    result = await fn(*args, **kwargs)
+                return attach_timings(result, records, started)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TIMINGS:
+                with span(name):
+                    return fn(*args, **kwargs)
+            started = time.perf_counter()
+            with capture_timings() as records, span(name):
+                result = fn(*args, **kwargs)
+            return attach_timings(result, records, started)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _label(name: str, tags: dict[str, str]) -> str:
+    if not tags:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in sorted(tags.items())) + "}"
@@ -0,0 +1,372 @@
+"""Background maintenance for long-running servers.
+
+SessionSweeper closes sessions that outlived their tier's idle or absolute
+TTL (config.SESSION_IDLE_TTL / SESSION_MAX_TTL). Expiry is also enforced
+lazily on lookup, so the sweeper only bounds how long abandoned sessions
+linger in the open set; it is safe to run in several processes at once.
+
+AuditRetention moves old audit rows out of SQLite into monthly gzip NDJSON
+segments (audit-YYYY-MM.ndjson.gz in AUDIT_ARCHIVE_DIR, audit-YYYY-MM.sN.ndjson.gz
+for shard N), deleting them in bounded batches, then checkpoints the WAL and
+VACUUMs when worthwhile. iter_audit_history() reads archived and live rows
+as one stream, and iter_audit_ndjson() encodes either for export (REST
+GET /audit, CLI).
+
+rebalance_shards() moves sessions to the shard they now hash to after
+DRAFT_DB_SHARDS changes.
+"""
+
+import abc
+import gzip
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Generator, Iterator
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from pathlib import Path
+
+from draft_protocol import storage
+from draft_protocol.config import (
+    AUDIT_ARCHIVE_DIR,
+    AUDIT_MAX_ROWS,
+    AUDIT_RETENTION_DAYS,
+    AUDIT_RETENTION_INTERVAL,
+    SESSION_SWEEP_INTERVAL,
+)
+
+logger = logging.getLogger("draft_protocol.maintenance")
+
+
+class _PeriodicTask(abc.ABC):
+    """Daemon thread calling run_once() every `interval` seconds."""
+
+    name = "draft-maintenance"
+
+    def __init__(self, interval: float):
+        if interval <= 0:
+            raise ValueError(f"interval must be > 0, got {interval}")
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @abc.abstractmethod
+    def run_once(self):
+        """One maintenance pass (called on the task's thread)."""
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:  # Keep going; a locked DB now is fine next time
+                logger.exception("%s run failed", self.name)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+# ── Session Expiry ────────────────────────────────────────
+
+
+class SessionSweeper(_PeriodicTask):
+    """Expires stale sessions every `interval` seconds."""
+
+    name = "draft-session-sweeper"
+
+    def __init__(self, interval: float = SESSION_SWEEP_INTERVAL, batch_size: int = 500):
+        super().__init__(interval)
+        self.batch_size = batch_size
+
+    def sweep_once(self) -> int:
+        """Expire stale sessions in batches until none are left. Returns how many closed."""
+        total = 0
+        while True:
+            closed = storage.expire_sessions(limit=self.batch_size)
+            total += len(closed)
+            if len(closed) < self.batch_size:
+                break
+        if total:
+            logger.info("Expired %d stale session(s)", total)
+        return total
+
+    run_once = sweep_once
+
+
+# ── Audit Retention ───────────────────────────────────────
+
+
+def _segment_path(archive_dir: Path, month: str, shard: int = 0) -> Path:
+    return archive_dir / (f"audit-{month}.s{shard}.ndjson.gz" if shard else f"audit-{month}.ndjson.gz")
+
+
+def _shard_segments(archive_dir: Path, shard: int) -> list[tuple[str, Path]]:
+    """(month, path) of one shard's segments, oldest first."""
+    suffix = f".s{shard}.ndjson.gz" if shard else ".ndjson.gz"
+    segments = []
+    for path in archive_dir.glob(f"audit-*{suffix}"):
+        month = path.name[len("audit-") : -len(suffix)]
+        if "." not in month:  # audit-YYYY-MM.sN.ndjson.gz also ends in .ndjson.gz
+            segments.append((month, path))
+    return sorted(segments)
+
+
+def _append_segment(path: Path, rows: list[dict]) -> None:
+    """Append rows as a new gzip member and fsync before the caller deletes them."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="ab") as gz:
+            gz.write("".join(json.dumps(r, sort_keys=True) + "\n" for r in rows).encode())
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def archive_audit(
+    retention_days: float = AUDIT_RETENTION_DAYS,
+    max_rows: int = AUDIT_MAX_ROWS,
+    archive_dir: Path | None = None,
+    batch_size: int = 1000,
+    pause: float = 0.0,
+) -> dict:
+    """Move audit rows past the retention policy into monthly archive segments.
+
+    Rows are archived and deleted `batch_size` at a time, each delete its own
+    short transaction, sleeping `pause` seconds between batches so writers
+    are never stalled for long. A crash between writing a segment and the
+    delete only duplicates rows in the archive; readers skip them. Each
+    shard is archived to its own segments and `max_rows` applies per shard.
+
+    Returns {"archived": n, "through_id": highest id covered by the policy}.
+    """
+    archive_dir = Path(archive_dir or AUDIT_ARCHIVE_DIR)
+    before = None
+    if retention_days > 0:
+        before = (datetime.now(timezone.utc) - timedelta(days=retention_days)).isoformat()
+    archived = last_through = 0
+    for index, shard in enumerate(storage.shard_paths()):
+        through = storage.audit_retention_cutoff(before, max_rows, shard=shard)
+        last_through = max(last_through, through)
+        after = 0
+        while through:
+            rows = storage.fetch_audit_range(after, through, batch_size, shard=shard)
+            if not rows:
+                break
+            for month, group in groupby(rows, key=lambda r: r["created_at"][:7]):
+                _append_segment(_segment_path(archive_dir, month, index), list(group))
+            storage.delete_audit_range(after, rows[-1]["id"], shard=shard)
+            after = rows[-1]["id"]
+            archived += len(rows)
+            if pause:
+                time.sleep(pause)
+    if archived:
+        logger.info("Archived %d audit row(s) to %s", archived, archive_dir)
+    return {"archived": archived, "through_id": last_through}
+
+
+def iter_audit_history(
+    session_id: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    archive_dir: Path | None = None,
+    *,
+    tool_name: str | None = None,
+    action: str | None = None,
+    tenant: str | None = None,
+    after_id: int = 0,
+) -> Iterator[dict]:
+    """Yield audit rows from archive segments, then the live table, oldest first.
+
+    Filters match storage.iter_audit(); since/until are ISO timestamps
+    (inclusive / exclusive) and segments for months outside the range are
+    not opened. Each shard's archive and live rows form one id-ordered
+    stream; the shards' streams are merged by id.
+    """
+    archive_dir = Path(archive_dir or AUDIT_ARCHIVE_DIR)
+    filters = {"tool_name": tool_name, "action": action}
+    streams = [
+        _shard_history(index, shard, archive_dir, session_id, since, until, after_id, filters, tenant)
+        for index, shard in enumerate(storage.shard_paths())
+    ]
+    yield from streams[0] if len(streams) == 1 else heapq.merge(*streams, key=lambda r: r["id"])
+
+
+def _shard_history(
+    index: int,
+    shard: Path,
+    archive_dir: Path,
+    session_id: str | None,
+    since: str | None,
+    until: str | None,
+    after_id: int,
+    filters: dict,
+    tenant: str | None = None,
+) -> Iterator[dict]:
+    wanted = {"session_id": session_id, **filters}
+    sessions = storage.tenant_session_ids(tenant, shard) if tenant is not None else None
+    # Month order is not id order (writers racing a month boundary, rows
+    # move_session re-inserted with new ids), so segments are merged by id
+    segments = [
+        _segment_rows(path)
+        for month, path in _shard_segments(archive_dir, index)
+        if not ((since and month < since[:7]) or (until and month > until[:7]))
+    ]
+    archived_through = 0
+    for row in heapq.merge(*segments, key=lambda r: r["id"]):
+        archived_through = row["id"]
+        if (
+            row["id"] > after_id
+            and all(value is None or row[key] == value for key, value in wanted.items())
+            and (sessions is None or row["session_id"] in sessions)
+            and (since is None or row["created_at"] >= since)
+            and (until is None or row["created_at"] < until)
+        ):
+            yield row
+    # Archived ids are a prefix of the shard's ids; the live table may still
+    # hold rows an interrupted run archived but did not delete
+    after_id = max(after_id, archived_through)
+    yield from storage.iter_audit(session_id, since, until, after_id=after_id, shard=shard, tenant=tenant, **filters)
+
+
+def _segment_rows(path: Path) -> Iterator[dict]:
+    """One segment's rows in id order, without rows an interrupted run archived twice."""
+    last_id = 0
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            if row["id"] <= last_id:  # Re-archived after an interrupted run
+                continue
+            last_id = row["id"]
+            yield row
+
+
+def iter_audit_ndjson(
+    include_archive: bool = False, chunk_bytes: int = 65536, **filters
+) -> Generator[bytes, None, None]:
+    """Encode audit rows as NDJSON, yielded in chunks of about `chunk_bytes`.
+
+    filters are those of storage.iter_audit() / iter_audit_history(); with
+    include_archive, archived segments are streamed before the live table.
+    """
+    rows = iter_audit_history(**filters) if include_archive else storage.iter_audit(**filters)
+    buf: list[bytes] = []
+    size = 0
+    for row in rows:
+        line = json.dumps(row, default=str).encode() + b"\n"
+        buf.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield b"".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield b"".join(buf)
+
+
+class AuditRetention(_PeriodicTask):
+    """Archives old audit rows and compacts the database every `interval` seconds."""
+
+    name = "draft-audit-retention"
+
+    def __init__(
+        self,
+        interval: float = AUDIT_RETENTION_INTERVAL,
+        retention_days: float = AUDIT_RETENTION_DAYS,
+        max_rows: int = AUDIT_MAX_ROWS,
+        archive_dir: Path | None = None,
+        batch_size: int = 1000,
+        pause: float = 0.05,
+        vacuum_ratio: float = 0.25,
+    ):
+        super().__init__(interval)
+        self.retention_days = retention_days
+        self.max_rows = max_rows
+        self.archive_dir = archive_dir
+        self.batch_size = batch_size
+        self.pause = pause
+        self.vacuum_ratio = vacuum_ratio
+
+    def run_once(self) -> dict:
+        result = archive_audit(self.retention_days, self.max_rows, self.archive_dir, self.batch_size, self.pause)
+        if result["archived"]:
+            compacted = [storage.compact_db(self.vacuum_ratio, shard=shard) for shard in storage.shard_paths()]
+            result.update(
+                free_pages=sum(c["free_pages"] for c in compacted),
+                pages=sum(c["pages"] for c in compacted),
+                vacuumed=any(c["vacuumed"] for c in compacted),
+            )
+        return result
+
+
+# ── Shard Rebalancing ─────────────────────────────────────
+
+
+def rebalance_shards(dry_run: bool = False, batch_size: int = 500) -> dict:
+    """Move sessions to the shard storage.path_for() now routes them to.
+
+    Covers every configured shard plus leftover shard files from a larger
+    DRAFT_DB_SHARDS. Stop the servers first (see storage.move_session).
+    Returns {"moved": sessions, "audit_rows": rows, "plan": {"src -> dst": sessions}};
+    with dry_run nothing is moved and audit_rows stays 0.
+    """
+    moved = audit_rows = 0
+    plan: dict[str, int] = {}
+    for source in storage.shard_files():
+        after = ""
+        while True:
+            batch = storage.misplaced_sessions(source, batch_size, after)
+            if not batch:
+                break
+            for session_id in batch:
+                target = storage.path_for(session_id)
+                key = f"{source.name} -> {target.name}"
+                plan[key] = plan.get(key, 0) + 1
+                if not dry_run:
+                    audit_rows += storage.move_session(session_id, source, target)
+                moved += 1
+            after = batch[-1]
+    if moved and not dry_run:
+        logger.info("Rebalanced %d session(s) across shards", moved)
+    return {"moved": moved, "audit_rows": audit_rows, "plan": plan}
+
+
+# ── Process-wide tasks ────────────────────────────────────
+
+_sweeper: SessionSweeper | None = None
+_retention: AuditRetention | None = None
+
+
+def start_sweeper() -> SessionSweeper | None:
+    """Start the process-wide sweeper (no-op if DRAFT_SESSION_SWEEP_INTERVAL is 0)."""
+    global _sweeper
+    if SESSION_SWEEP_INTERVAL <= 0:
+        return None
+    if _sweeper is None:
+        _sweeper = SessionSweeper()
+    return _sweeper.start()
+
+
+def start_retention() -> AuditRetention | None:
+    """Start audit retention if a policy is configured (DRAFT_AUDIT_RETENTION_DAYS / _MAX_ROWS)."""
+    global _retention
+    if AUDIT_RETENTION_INTERVAL <= 0 or (AUDIT_RETENTION_DAYS <= 0 and AUDIT_MAX_ROWS <= 0):
+        return None
+    if _retention is None:
+        _retention = AuditRetention()
+    return _retention.start()
+
+
+def start_maintenance() -> None:
+    """Start every configured background task. Call once per server (pool)."""
+    start_sweeper()
+    start_retention()
@@ -0,0 +1,148 @@
+"""Prometheus Metrics — text exposition of collected spans, counters and gauges.
+
+Served by the REST transport at GET /metrics. Spans recorded by the
+HistogramCollector become histograms, one family per span prefix:
+
+  rest.*      -> draft_rest_request_duration_seconds{method, route}
+  provider.*  -> draft_provider_duration_seconds{op, provider, site}
+  storage.*   -> draft_storage_duration_seconds{op}
+  classify.*  -> draft_classify_stage_duration_seconds{stage}
+  mcp.*       -> draft_mcp_tool_duration_seconds{tool}
+  hook.*      -> draft_hook_duration_seconds{hook}
+
+Counters (draft_*_total) are emitted as-is. Gauges are sampled at scrape
+time from callables registered with register_gauge().
+"""
+
+import logging
+from collections.abc import Callable
+
+from draft_protocol import instrumentation
+
+logger = logging.getLogger("draft_protocol.metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# span prefix -> (metric family, label for the span suffix, help text)
+_HISTOGRAM_FAMILIES = {
+    "rest": ("draft_rest_request_duration_seconds", "method", "REST request latency by endpoint."),
+    "provider": ("draft_provider_duration_seconds", "op", "LLM/embedding provider call latency."),
+    "storage": ("draft_storage_duration_seconds", "op", "SQLite storage operation latency."),
+    "classify": ("draft_classify_stage_duration_seconds", "stage", "Tier classification stage latency."),
+    "mcp": ("draft_mcp_tool_duration_seconds", "tool", "MCP tool handler latency."),
+    "hook": ("draft_hook_duration_seconds", "hook", "Extension hook call latency, per attempt."),
+}
+_DEFAULT_FAMILY = ("draft_span_duration_seconds", "span", "Latency of other instrumented spans.")
+
+COUNTER_HELP = {
+    "draft_rest_requests_total": "REST requests by method, route and status.",
+    "draft_classify_total": "Classifications by tier and decision path (hook, keyword, regex, exemplar, llm, fallback).",
+    "draft_provider_errors_total": "Failed provider calls by op, provider and kind (timeout, http, network, invalid).",
+    "draft_sessions_expired_total": "Sessions closed by TTL expiry, by reason (idle, max_age).",
+    "draft_map_fields_total": "Fields per map_dimensions call, by result (assessed, reused from the last mapping).",
+    "draft_session_conflicts_total": "Session updates that lost a compare-and-swap race and were retried, by op.",
+    "draft_cache_requests_total": "Cache lookups by cache and result (hit, miss); hit ratio = hit / total.",
+    "draft_pipeline_total": "run_pipeline calls (draft_pipeline, POST /pipeline), by last stage run.",
+    "draft_hook_calls_total": "Extension hook attempts by hook and result (ok, error, timeout, dropped, skipped).",
+}
+
+_gauges: dict[str, tuple[Callable[[], float], str]] = {}
+
+
+def register_gauge(name: str, fn: Callable[[], float], help_text: str = "") -> None:
+    """Expose fn() as a gauge, sampled on every scrape. Re-registering replaces."""
+    _gauges[name] = (fn, help_text)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(tags: dict[str, str]) -> str:
+    if not tags:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(tags.items())) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _histogram_lines(collector: instrumentation.HistogramCollector) -> list[str]:
+    families: dict[str, tuple[str, list[str]]] = {}
+    bounds = [b / 1000 for b in collector.buckets_ms] + [float("inf")]
+    for s in collector.series():
+        prefix, _, suffix = s["name"].partition(".")
+        family, label, help_text = _HISTOGRAM_FAMILIES.get(prefix, _DEFAULT_FAMILY)
+        tags = dict(s["tags"])
+        tags[label] = suffix if prefix in _HISTOGRAM_FAMILIES else s["name"]
+        lines = families.setdefault(family, (help_text, []))[1]
+        running = 0
+        for bound, n in zip(bounds, s["buckets"], strict=True):
+            running += n
+            lines.append(f"{family}_bucket{_labels({**tags, 'le': _number(bound)})} {running}")
+        lines.append(f"{family}_sum{_labels(tags)} {_number(round(s['sum_ms'] / 1000, 9))}")
+        lines.append(f"{family}_count{_labels(tags)} {s['count']}")
+    out = []
+    for family, (help_text, lines) in sorted(families.items()):
+        out += [f"# HELP {family} {help_text}", f"# TYPE {family} histogram", *lines]
+    return out
+
+
+def _counter_lines(collector: instrumentation.HistogramCollector) -> list[str]:
+    out: list[str] = []
+    current = None
+    for c in collector.counters():
+        if c["name"] != current:
+            current = c["name"]
+            out += [f"# HELP {current} {COUNTER_HELP.get(current, current)}", f"# TYPE {current} counter"]
+        out.append(f"{current}{_labels(c['tags'])} {_number(c['value'])}")
+    return out
+
+
+def _gauge_lines() -> list[str]:
+    out = []
+    for name, (fn, help_text) in sorted(_gauges.items()):
+        try:
+            value = fn()
+        except Exception as e:  # A broken gauge must not take down the whole scrape
+            logger.debug("Gauge %s failed: %s", name, e)
+            continue
+        out += [f"# HELP {name} {help_text or name}", f"# TYPE {name} gauge", f"{name} {_number(value)}"]
+    return out
+
+
+def render_prometheus() -> str:
+    """Render all metrics in Prometheus text exposition format (0.0.4)."""
+    collector = instrumentation.get_collector()
+    lines: list[str] = []
+    if isinstance(collector, instrumentation.HistogramCollector):
+        lines += _histogram_lines(collector)
+        lines += _counter_lines(collector)
+    else:
+        lines.append("# Latency histograms and counters require DRAFT_METRICS=histogram")
+    lines += _gauge_lines()
+    return "\n".join(lines) + "\n"
+
+
+# ── Built-in gauges ───────────────────────────────────────
+
+
+def _active_sessions() -> float:
+    from draft_protocol import storage
+
+    return storage.count_active_sessions()
+
+
+register_gauge("draft_active_sessions", _active_sessions, "Sessions not yet closed.")
+
+
+def _hook_queue_depth() -> float:
+    from draft_protocol import hooks
+
+    return hooks.queue_depth()
+
+
+register_gauge("draft_hook_queue_depth", _hook_queue_depth, "Hook events waiting for a dispatch worker.")
@@ -0,0 +1,351 @@
+"""Mock LLM/Embedding Server — deterministic stand-in for Ollama, OpenAI and Anthropic.
+
+Lets the LLM and embedding code paths run reproducibly in CI, benchmarks
+and load tests without a real model. Stdlib only.
+
+Endpoints (shapes match what providers.py sends and parses):
+  POST /api/chat               — Ollama chat (JSON schema in "format")
+  POST /api/embed              — Ollama embeddings (str or list input)
+  POST [/v1]/chat/completions  — OpenAI-compatible chat
+  POST [/v1]/embeddings        — OpenAI-compatible embeddings
+  POST [/v1]/messages          — Anthropic messages
+  GET  /health                 — Health check
+  GET  /stats                  — Request counters (handy for tests)
+
+Responses are derived from a hash of the request text: the same prompt
+always yields the same schema-valid JSON, and embeddings are feature-hashed
+bags of words (similar texts get similar vectors). Latency, jitter, error
+rate and timeouts are configurable and drawn from a seeded RNG.
+
+Start:
+  python -m draft_protocol.mock_provider --port 11435 --latency-ms 50 --jitter-ms 10
+
+Then point DRAFT at it:
+  DRAFT_LLM_PROVIDER=ollama DRAFT_LLM_MODEL=mock DRAFT_EMBED_MODEL=mock \\
+  DRAFT_API_BASE=http://127.0.0.1:11435 python -m draft_protocol
+(For openai/anthropic, use DRAFT_API_BASE=http://127.0.0.1:11435/v1.)
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+EMBED_DIM = 256
+
+_WORD = re.compile(r"[a-z0-9]+")
+# providers.py appends the schema to OpenAI/Anthropic prompts after this marker
+_SCHEMA_MARKER = "matching this schema, no other text:\n"
+
+
+# ── Deterministic content ─────────────────────────────────
+
+
+def _seed(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+
+
+def deterministic_embedding(text: str, dim: int = EMBED_DIM) -> list[float]:
+    """Feature-hashed bag of words, L2-normalized."""
+    vec = [0.0] * dim
+    for word in _WORD.findall(text.lower()):
+        h = _seed(word)
+        vec[h % dim] += 1.0 if (h >> 32) & 1 else -1.0
+    norm = math.sqrt(sum(x * x for x in vec))
+    return [x / norm for x in vec] if norm else vec
+
+
+def schema_instance(schema: dict, seed: int) -> Any:
+    """Build a value that validates against a (simple) JSON schema."""
+    if "enum" in schema:
+        return schema["enum"][seed % len(schema["enum"])]
+    kind = schema.get("type")
+    if kind == "object":
+        return {key: schema_instance(sub, _seed(f"{seed}:{key}")) for key, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [schema_instance(schema.get("items", {}), _seed(f"{seed}:{i}")) for i in range(seed % 3 + 1)]
+    if kind == "number":
+        lo, hi = schema.get("minimum", 0.0), schema.get("maximum", 1.0)
+        return round(lo + (seed % 1000) / 999 * (hi - lo), 3)
+    if kind == "integer":
+        lo, hi = schema.get("minimum", 0), schema.get("maximum", 100)
+        return lo + seed % (hi - lo + 1)
+    if kind == "boolean":
+        return seed % 2 == 0
+    return f"mock-{seed % 16**8:08x}"
+
+
+def _schema_from_prompt(prompt: str) -> dict:
+    """Recover the schema providers.py embeds in OpenAI/Anthropic prompts."""
+    _, sep, tail = prompt.rpartition(_SCHEMA_MARKER)
+    if not sep:
+        return {"type": "object", "properties": {"response": {"type": "string"}}}
+    try:
+        schema = json.loads(tail.strip())
+    except ValueError:
+        return {"type": "object", "properties": {"response": {"type": "string"}}}
+    return schema if isinstance(schema, dict) else {}
+
+
+def _last_user_content(messages: list) -> str:
+    for msg in reversed(messages or []):
+        if isinstance(msg, dict) and msg.get("role") == "user":
+            content = msg.get("content", "")
+            if isinstance(content, list):  # Anthropic content blocks
+                return "".join(b.get("text", "") for b in content if isinstance(b, dict))
+            return str(content)
+    return ""
+
+
+def _inputs(value: Any) -> list[str]:
+    return [str(v) for v in value] if isinstance(value, list) else [str(value or "")]
+
+
+# ── Server ────────────────────────────────────────────────
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 128  # Async clients connect in bursts; the default backlog is 5
+
+
+class MockProviderServer:
+    """Threaded mock provider. Use as a context manager or start()/stop().
+
+    Args:
+        latency_ms: Base delay added to every model response.
+        jitter_ms: Uniform ± jitter around the base delay.
+        error_rate: Probability (0-1) of an HTTP 500 response.
+        timeout_rate: Probability (0-1) of stalling for `stall_s` before replying.
+        stall_s: How long a "timeout" request stalls (default 60s).
+        seed: RNG seed for latency/error/timeout draws.
+        embed_dim: Embedding vector length.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        stall_s: float = 60.0,
+        seed: int = 0,
+        embed_dim: int = EMBED_DIM,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.stall_s = stall_s
+        self.embed_dim = embed_dim
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.stats: dict[str, int] = {}
+        self._httpd = _MockHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockProviderServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-provider", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()  # Release stalled "timeout" requests
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def __enter__(self) -> "MockProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # Fault injection — one locked draw per request keeps the sequence reproducible
+    def _draw(self) -> tuple[float, bool, bool]:
+        with self._lock:
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            fail = self._rng.random() < self.error_rate
+            stall = self._rng.random() < self.timeout_rate
+        return delay, fail, stall
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def respond(self, path: str, body: dict) -> tuple[int, dict]:
+        """Compute (status, JSON body) for a POST. Applies latency and faults."""
+        route = path[3:] if path.startswith("/v1/") else path
+        handler = _ROUTES.get(route)
+        if handler is None:
+            return 404, {"error": f"Unknown endpoint {path}"}
+        self._count(route)
+        delay, fail, stall = self._draw()
+        if stall:
+            self._count("stalled")
+            self._stop.wait(self.stall_s)
+        elif delay:
+            time.sleep(delay)
+        if fail:
+            self._count("errors")
+            return 500, {"error": "Injected failure"}
+        return 200, handler(self, body)
+
+
+def _ollama_chat(server: MockProviderServer, body: dict) -> dict:
+    prompt = _last_user_content(body.get("messages", []))
+    schema = body.get("format")
+    if not isinstance(schema, dict):
+        schema = _schema_from_prompt(prompt)
+    content = json.dumps(schema_instance(schema, _seed(prompt)))
+    return {"model": body.get("model", "mock"), "message": {"role": "assistant", "content": content}, "done": True}
+
+
+def _ollama_embed(server: MockProviderServer, body: dict) -> dict:
+    texts = _inputs(body.get("input"))
+    return {
+        "model": body.get("model", "mock"),
+        "embeddings": [deterministic_embedding(t, server.embed_dim) for t in texts],
+    }
+
+
+def _openai_chat(server: MockProviderServer, body: dict) -> dict:
+    prompt = _last_user_content(body.get("messages", []))
+    content = json.dumps(schema_instance(_schema_from_prompt(prompt), _seed(prompt)))
+    return {
+        "object": "chat.completion",
+        "model": body.get("model", "mock"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+    }
+
+
+def _openai_embed(server: MockProviderServer, body: dict) -> dict:
+    texts = _inputs(body.get("input"))
+    return {
+        "object": "list",
+        "model": body.get("model", "mock"),
+        "data": [
+            {"object": "embedding", "index": i, "embedding": deterministic_embedding(t, server.embed_dim)}
+            for i, t in enumerate(texts)
+        ],
+    }
+
+
+def _anthropic_messages(server: MockProviderServer, body: dict) -> dict:
+    prompt = _last_user_content(body.get("messages", []))
+    text = json.dumps(schema_instance(_schema_from_prompt(prompt), _seed(prompt)))
+    return {
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", "mock"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+    }
+
+
+_ROUTES = {
+    "/api/chat": _ollama_chat,
+    "/api/embed": _ollama_embed,
+    "/chat/completions": _openai_chat,
+    "/embeddings": _openai_embed,
+    "/messages": _anthropic_messages,
+}
+
+
+def _make_handler(server: MockProviderServer) -> type[BaseHTTPRequestHandler]:
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send_json(self, data: dict, status: int = 200):
+            payload = json.dumps(data).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json({"status": "ok", "service": "draft-mock-provider"})
+            elif self.path == "/stats":
+                with server._lock:
+                    self._send_json(dict(server.stats))
+            else:
+                self._send_json({"error": "Not found"}, 404)
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length)) if length else {}
+            except ValueError:
+                self._send_json({"error": "Invalid JSON"}, 400)
+                return
+            status, data = server.respond(self.path, body if isinstance(body, dict) else {})
+            # Client gave up (timeout) — expected under fault injection
+            with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+                self._send_json(data, status)
+
+        def log_message(self, format, *args):
+            """Suppress default stderr logging."""
+
+    return MockHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="draft-mock-provider",
+        description="Deterministic mock Ollama/OpenAI/Anthropic server for DRAFT performance testing.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", "-p", type=int, default=11435)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base response latency (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform ± jitter (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Fraction of requests that stall")
+    parser.add_argument("--stall-s", type=float, default=60.0, help="Stall duration for timeouts (s)")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for latency and fault draws")
+    parser.add_argument("--embed-dim", type=int, default=EMBED_DIM, help="Embedding dimension")
+    args = parser.parse_args()
+
+    server = MockProviderServer(
+        args.host,
+        args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        stall_s=args.stall_s,
+        seed=args.seed,
+        embed_dim=args.embed_dim,
+    )
+    print(f"DRAFT mock provider running on {server.url}")
+    print("Endpoints: /api/chat, /api/embed, [/v1]/chat/completions, [/v1]/embeddings, [/v1]/messages")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
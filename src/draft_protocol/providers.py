@@ -8,7 +8,12 @@ Supported providers:
 
 All providers implement two operations:
   - chat(): Send a prompt, get structured JSON back
-  - embed(): Get a vector embedding for text
+  - embed(): Get a vector embedding for text (embed_many(): several per request)
+
+achat(), aembed() and aembed_many() are the asyncio equivalents. Both
+clients share each provider's request builder and response parser; the sync
+one posts with urllib, the async one over asyncio streams, so awaiting a
+provider call never blocks the event loop.
 
 Set via environment variables:
   DRAFT_LLM_PROVIDER=ollama|openai|anthropic|none
@@ -18,22 +23,35 @@ Set via environment variables:
   DRAFT_API_BASE=https://...  (optional custom endpoint)
 """
 
+import contextlib
+import functools
 import json
 import logging
-import urllib.error
-import urllib.request
+from collections.abc import Callable
+from typing import Any, NamedTuple
 
 from draft_protocol.config import (
     API_BASE,
     API_KEY,
+    EMBED_BATCH_SIZE,
     EMBED_MODEL,
     LLM_MODEL,
     LLM_PROVIDER,
 )
+from draft_protocol.instrumentation import count, span
 
 logger = logging.getLogger(__name__)
 
 
+class _Request(NamedTuple):
+    """One provider call: the JSON body to POST where, and how to read the reply."""
+
+    url: str
+    data: dict
+    headers: dict
+    parse: Callable[[dict], Any]
+
+
 def _post(url: str, data: dict, headers: dict, timeout: int = 30) -> dict:
     """HTTP POST with JSON body. Returns parsed response.
 
@@ -42,6 +60,11 @@ def _post(url: str, data: dict, headers: dict, timeout: int = 30) -> dict:
         json.JSONDecodeError: Invalid JSON in response.
         socket.timeout: Request timed out.
     """
+    # Imported on first call: urllib.request pulls in http.client, email and
+    # ssl, which dominates import time for keyword-only deployments.
+    import urllib.error
+    import urllib.request
+
     body = json.dumps(data).encode("utf-8")
     req = urllib.request.Request(url, data=body, method="POST", headers=headers)
     try:
@@ -56,13 +79,116 @@ def _post(url: str, data: dict, headers: dict, timeout: int = 30) -> dict:
         raise
 
 
+# ── Async HTTP ────────────────────────────────────────────
+# A minimal HTTP/1.1 client on asyncio streams: one connection per request
+# (Connection: close), JSON in and out. Failures raise the same families as
+# _post — OSError for network, HTTP and timeout errors, ValueError for bad
+# JSON — so callers handle both transports alike.
+
+
+class _HTTPStatusError(OSError):
+    """HTTP error status from the async client (the counterpart of urllib's HTTPError)."""
+
+    def __init__(self, code: int, reason: str):
+        super().__init__(f"HTTP Error {code}: {reason}")
+        self.code = code
+        self.reason = reason
+
+
+@functools.lru_cache(maxsize=1)
+def _ssl_context() -> Any:
+    import ssl
+
+    return ssl.create_default_context()
+
+
+async def _apost(url: str, data: dict, headers: dict, timeout: int = 30) -> dict:
+    """Async HTTP POST with JSON body. Returns parsed response.
+
+    Raises:
+        _HTTPStatusError: Status 400 or above.
+        OSError: Network errors; TimeoutError once `timeout` seconds have passed.
+        json.JSONDecodeError: Invalid JSON in response.
+    """
+    import asyncio
+
+    try:
+        status, reason, payload = await asyncio.wait_for(_aexchange(url, data, headers), timeout)
+    except asyncio.TimeoutError as e:  # Not yet the builtin TimeoutError on 3.10
+        logger.warning("Network error connecting to %s: timed out after %ss", url, timeout)
+        raise TimeoutError(f"timed out after {timeout}s") from e
+    except OSError as e:
+        logger.warning("Network error connecting to %s: %s", url, e)
+        raise
+    if status >= 400:
+        logger.warning("HTTP %d from %s: %s", status, url, reason)
+        raise _HTTPStatusError(status, reason)
+    result: dict = json.loads(payload)
+    return result
+
+
+async def _aexchange(url: str, data: dict, headers: dict) -> tuple[int, str, bytes]:
+    """Send one POST and read the whole response: (status, reason, body)."""
+    import asyncio
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Unsupported URL: {url}")
+    secure = parts.scheme == "https"
+    body = json.dumps(data).encode("utf-8")
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    head = [
+        f"POST {target} HTTP/1.1",
+        f"Host: {parts.netloc}",
+        f"Content-Length: {len(body)}",
+        "Connection: close",
+        *(f"{key}: {value}" for key, value in headers.items()),
+    ]
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, parts.port or (443 if secure else 80), ssl=_ssl_context() if secure else None
+    )
+    try:
+        writer.write("\r\n".join(head).encode("latin-1") + b"\r\n\r\n" + body)
+        await writer.drain()
+        status_line = (await reader.readline()).decode("latin-1").split(" ", 2)
+        if len(status_line) < 2 or not status_line[1].isdigit():
+            raise ConnectionError("Malformed or empty HTTP status line")
+        fields = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            key, _, value = line.decode("latin-1").partition(":")
+            fields[key.strip().lower()] = value.strip()
+        if "chunked" in fields.get("transfer-encoding", "").lower():
+            payload = b""
+            while size := int((await reader.readline()).split(b";")[0].strip() or b"0", 16):
+                payload += await reader.readexactly(size)
+                await reader.readexactly(2)  # CRLF after each chunk
+        elif "content-length" in fields:
+            payload = await reader.readexactly(int(fields["content-length"]))
+        else:
+            payload = await reader.read()
+    except asyncio.IncompleteReadError as e:
+        raise ConnectionError("Connection closed mid-response") from e
+    finally:
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+    reason = status_line[2].strip() if len(status_line) > 2 else ""
+    return int(status_line[1]), reason, payload
+
+
 # ── Provider: Ollama ──────────────────────────────────────
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _ollama_base() -> str:
+    return API_BASE or "http://localhost:11434"
+
 
-def _ollama_chat(prompt: str, schema: dict, timeout: int = 30) -> dict | None:
-    base = API_BASE or "http://localhost:11434"
-    resp = _post(
-        f"{base}/api/chat",
+def _ollama_chat(prompt: str, schema: dict) -> _Request:
+    return _Request(
+        f"{_ollama_base()}/api/chat",
         {
             "model": LLM_MODEL,
             "messages": [{"role": "user", "content": prompt}],
@@ -70,131 +196,149 @@ def _ollama_chat(prompt: str, schema: dict, timeout: int = 30) -> dict | None:
             "format": schema,
             "options": {"temperature": 0.1, "num_predict": 500},
         },
-        {"Content-Type": "application/json"},
-        timeout=timeout,
+        _JSON_HEADERS,
+        lambda resp: _json_content(resp.get("message", {}).get("content", ""), fenced=False),
     )
-    content = resp.get("message", {}).get("content", "").strip()
-    if not content:
-        return None
-    parsed: dict = json.loads(content)  # type: ignore[assignment]
-    return parsed
 
 
-def _ollama_embed(text: str, timeout: int = 30) -> list:
-    base = API_BASE or "http://localhost:11434"
-    resp = _post(
-        f"{base}/api/embed",
+def _ollama_embed(text: str) -> _Request:
+    return _Request(
+        f"{_ollama_base()}/api/embed",
         {"model": EMBED_MODEL, "input": text},
-        {"Content-Type": "application/json"},
-        timeout=timeout,
+        _JSON_HEADERS,
+        lambda resp: (resp.get("embeddings") or [[]])[0],
+    )
+
+
+def _ollama_embed_many(texts: list[str]) -> _Request:
+    return _Request(
+        f"{_ollama_base()}/api/embed",
+        {"model": EMBED_MODEL, "input": texts},
+        _JSON_HEADERS,
+        lambda resp: list(resp.get("embeddings", [])),
     )
-    embs = resp.get("embeddings", [])
-    return embs[0] if embs else []
 
 
 # ── Provider: OpenAI-compatible ───────────────────────────
 
 
-def _openai_chat(prompt: str, schema: dict, timeout: int = 30) -> dict | None:
-    base = API_BASE or "https://api.openai.com/v1"
-    headers = {
+def _openai_base() -> str:
+    return API_BASE or "https://api.openai.com/v1"
+
+
+def _openai_headers() -> dict:
+    return {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {API_KEY}",
     }
+
+
+def _openai_chat(prompt: str, schema: dict) -> _Request:
     # Build JSON schema instruction since not all OpenAI-compatible APIs support response_format
-    schema_instruction = f"\n\nRespond ONLY with valid JSON matching this schema, no other text:\n{json.dumps(schema)}"
-    resp = _post(
-        f"{base}/chat/completions",
+    return _Request(
+        f"{_openai_base()}/chat/completions",
         {
             "model": LLM_MODEL,
-            "messages": [{"role": "user", "content": prompt + schema_instruction}],
+            "messages": [{"role": "user", "content": prompt + _schema_instruction(schema)}],
             "temperature": 0.1,
             "max_tokens": 500,
         },
-        headers,
-        timeout=timeout,
+        _openai_headers(),
+        lambda resp: _json_content(resp.get("choices", [{}])[0].get("message", {}).get("content", "")),
     )
-    content = resp.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
-    # Strip markdown fences if present
-    if content.startswith("```"):
-        content = content.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
-    if not content:
-        return None
-    parsed: dict = json.loads(content)  # type: ignore[assignment]
-    return parsed
 
 
-def _openai_embed(text: str, timeout: int = 30) -> list:
-    base = API_BASE or "https://api.openai.com/v1"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {API_KEY}",
-    }
-    resp = _post(
-        f"{base}/embeddings",
+def _openai_embed(text: str) -> _Request:
+    return _Request(
+        f"{_openai_base()}/embeddings",
         {"model": EMBED_MODEL, "input": text},
-        headers,
-        timeout=timeout,
+        _openai_headers(),
+        lambda resp: (resp.get("data") or [{}])[0].get("embedding", []),
     )
-    data = resp.get("data", [])
-    return data[0].get("embedding", []) if data else []
+
+
+def _openai_embed_many(texts: list[str]) -> _Request:
+    def parse(resp: dict) -> list[list]:
+        data = sorted(resp.get("data", []), key=lambda d: d.get("index", 0))
+        return [d.get("embedding", []) for d in data]
+
+    return _Request(f"{_openai_base()}/embeddings", {"model": EMBED_MODEL, "input": texts}, _openai_headers(), parse)
 
 
 # ── Provider: Anthropic ───────────────────────────────────
 
 
-def _anthropic_chat(prompt: str, schema: dict, timeout: int = 30) -> dict | None:
-    base = API_BASE or "https://api.anthropic.com/v1"
-    headers = {
-        "Content-Type": "application/json",
-        "x-api-key": API_KEY,
-        "anthropic-version": "2023-06-01",
-    }
-    schema_instruction = f"\n\nRespond ONLY with valid JSON matching this schema, no other text:\n{json.dumps(schema)}"
-    resp = _post(
-        f"{base}/messages",
+def _anthropic_chat(prompt: str, schema: dict) -> _Request:
+    def parse(resp: dict) -> dict | None:
+        blocks = resp.get("content", [])
+        return _json_content("".join(b.get("text", "") for b in blocks if b.get("type") == "text"))
+
+    return _Request(
+        f"{API_BASE or 'https://api.anthropic.com/v1'}/messages",
         {
             "model": LLM_MODEL,
             "max_tokens": 500,
-            "messages": [{"role": "user", "content": prompt + schema_instruction}],
+            "messages": [{"role": "user", "content": prompt + _schema_instruction(schema)}],
             "temperature": 0.1,
         },
-        headers,
-        timeout=timeout,
+        {
+            "Content-Type": "application/json",
+            "x-api-key": API_KEY,
+            "anthropic-version": "2023-06-01",
+        },
+        parse,
     )
-    content_blocks = resp.get("content", [])
-    text = ""
-    for block in content_blocks:
-        if block.get("type") == "text":
-            text += block.get("text", "")
+
+
+def _anthropic_embed(text: str) -> None:
+    # Anthropic doesn't offer embeddings — fall back to empty
+    return None
+
+
+def _anthropic_embed_many(texts: list[str]) -> None:
+    return None
+
+
+# ── Response Helpers ──────────────────────────────────────
+
+
+def _schema_instruction(schema: dict) -> str:
+    return f"\n\nRespond ONLY with valid JSON matching this schema, no other text:\n{json.dumps(schema)}"
+
+
+def _json_content(text: str, fenced: bool = True) -> dict | None:
+    """Parse a model's JSON reply, stripping markdown fences if present. None if empty."""
     text = text.strip()
-    if text.startswith("```"):
+    if fenced and text.startswith("```"):
         text = text.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
     if not text:
         return None
-    parsed: dict = json.loads(text)  # type: ignore[assignment]
+    parsed: dict = json.loads(text)
     return parsed
 
 
-def _anthropic_embed(text: str, timeout: int = 30) -> list:
-    # Anthropic doesn't offer embeddings — fall back to empty
-    return []
-
-
 # ── Provider Dispatch ─────────────────────────────────────
+# Each entry builds a _Request for the provider, or returns None when the
+# provider does not support the operation.
 
-_CHAT_PROVIDERS = {
+_CHAT_PROVIDERS: dict[str, Callable[[str, dict], _Request]] = {
     "ollama": _ollama_chat,
     "openai": _openai_chat,
     "anthropic": _anthropic_chat,
 }
 
-_EMBED_PROVIDERS = {
+_EMBED_PROVIDERS: dict[str, Callable[[str], _Request | None]] = {
     "ollama": _ollama_embed,
     "openai": _openai_embed,
     "anthropic": _anthropic_embed,
 }
 
+_EMBED_MANY_PROVIDERS: dict[str, Callable[[list[str]], _Request | None]] = {
+    "ollama": _ollama_embed_many,
+    "openai": _openai_embed_many,
+    "anthropic": _anthropic_embed_many,
+}
+
 
 def llm_available() -> bool:
     """True if an LLM provider is configured and has a model set."""
@@ -206,36 +350,139 @@ def embed_available() -> bool:
     return bool(LLM_PROVIDER and LLM_PROVIDER != "none" and EMBED_MODEL)
 
 
-def chat(prompt: str, schema: dict, timeout: int = 30) -> dict | None:
+def _chat_request(prompt: str, schema: dict) -> _Request | None:
+    build = _CHAT_PROVIDERS.get(LLM_PROVIDER) if llm_available() else None
+    return build(prompt, schema) if build else None
+
+
+def _embed_request(text: str) -> _Request | None:
+    build = _EMBED_PROVIDERS.get(LLM_PROVIDER) if embed_available() else None
+    return build(text) if build else None
+
+
+def _embed_batches(texts: list[str]) -> list[tuple[list[str], _Request | None]]:
+    """EMBED_BATCH_SIZE slices of texts, each with its request (None if unsupported)."""
+    build = _EMBED_MANY_PROVIDERS.get(LLM_PROVIDER) if embed_available() else None
+    size = max(EMBED_BATCH_SIZE, 1)
+    batches = [texts[start : start + size] for start in range(0, len(texts), size)]
+    return [(batch, build(batch) if build else None) for batch in batches]
+
+
+def _failed(op: str, e: Exception) -> None:
+    logger.debug("Provider %s failed (%s): %s", op, LLM_PROVIDER, e)
+    count("draft_provider_errors_total", op=op, provider=LLM_PROVIDER, kind=_error_kind(e))
+
+
+def _batch_vectors(batch: list[str], vectors: Any) -> list[list]:
+    return vectors if isinstance(vectors, list) and len(vectors) == len(batch) else [[] for _ in batch]
+
+
+def chat(prompt: str, schema: dict, timeout: int = 30, site: str = "") -> dict | None:
     """Send a structured prompt to the configured LLM provider.
 
+    `site` names the calling function for latency instrumentation.
     Returns parsed dict matching schema, or None on any failure.
     """
-    if not llm_available():
-        return None
-    fn = _CHAT_PROVIDERS.get(LLM_PROVIDER)
-    if not fn:
+    req = _chat_request(prompt, schema)
+    if req is None:
         return None
     try:
-        result = fn(prompt, schema, timeout)
+        with span("provider.chat", provider=LLM_PROVIDER, site=site or "chat"):
+            result = req.parse(_post(req.url, req.data, req.headers, timeout=timeout))
         return result if isinstance(result, dict) else None
-    except (urllib.error.URLError, json.JSONDecodeError, OSError, ValueError) as e:
-        logger.debug("LLM chat failed (%s): %s", LLM_PROVIDER, e)
+    except (OSError, ValueError) as e:  # URLError/timeouts are OSError, JSONDecodeError is ValueError
+        _failed("chat", e)
         return None
 
 
-def embed(text: str, timeout: int = 30) -> list:
+def embed(text: str, timeout: int = 30, site: str = "") -> list:
     """Get embedding vector for text from the configured provider.
 
+    `site` names the calling function for latency instrumentation.
     Returns list of floats, or empty list on any failure.
     """
-    if not embed_available():
+    req = _embed_request(text)
+    if req is None:
         return []
-    fn = _EMBED_PROVIDERS.get(LLM_PROVIDER)
-    if not fn:
+    try:
+        with span("provider.embed", provider=LLM_PROVIDER, site=site or "embed"):
+            result: list = req.parse(_post(req.url, req.data, req.headers, timeout=timeout))
+        return result
+    except (OSError, ValueError) as e:  # URLError/timeouts are OSError, JSONDecodeError is ValueError
+        _failed("embed", e)
         return []
+
+
+def embed_many(texts: list[str], timeout: int = 30, site: str = "") -> list[list]:
+    """Embeddings for several texts, EMBED_BATCH_SIZE per provider request.
+
+    Returns one vector per text, in order; texts in a failed batch get [].
+    """
+    out: list[list] = []
+    for batch, req in _embed_batches(texts):
+        vectors = []
+        if req is not None:
+            try:
+                with span("provider.embed_many", provider=LLM_PROVIDER, site=site or "embed_many"):
+                    vectors = req.parse(_post(req.url, req.data, req.headers, timeout=timeout))
+            except (OSError, ValueError) as e:
+                _failed("embed", e)
+        out += _batch_vectors(batch, vectors)
+    return out
+
+
+async def achat(prompt: str, schema: dict, timeout: int = 30, site: str = "") -> dict | None:
+    """chat() without blocking the event loop."""
+    req = _chat_request(prompt, schema)
+    if req is None:
+        return None
     try:
-        return fn(text, timeout)
-    except (urllib.error.URLError, json.JSONDecodeError, OSError, ValueError) as e:
-        logger.debug("Embedding failed (%s): %s", LLM_PROVIDER, e)
+        with span("provider.chat", provider=LLM_PROVIDER, site=site or "chat"):
+            result = req.parse(await _apost(req.url, req.data, req.headers, timeout=timeout))
+        return result if isinstance(result, dict) else None
+    except (OSError, ValueError) as e:
+        _failed("chat", e)
+        return None
+
+
+async def aembed(text: str, timeout: int = 30, site: str = "") -> list:
+    """embed() without blocking the event loop."""
+    req = _embed_request(text)
+    if req is None:
+        return []
+    try:
+        with span("provider.embed", provider=LLM_PROVIDER, site=site or "embed"):
+            result: list = req.parse(await _apost(req.url, req.data, req.headers, timeout=timeout))
+        return result
+    except (OSError, ValueError) as e:
+        _failed("embed", e)
         return []
+
+
+async def aembed_many(texts: list[str], timeout: int = 30, site: str = "") -> list[list]:
+    """embed_many() without blocking the event loop; the batches are sent concurrently."""
+    import asyncio
+
+    async def one(batch: list[str], req: _Request | None) -> list[list]:
+        vectors = []
+        if req is not None:
+            try:
+                with span("provider.embed_many", provider=LLM_PROVIDER, site=site or "embed_many"):
+                    vectors = req.parse(await _apost(req.url, req.data, req.headers, timeout=timeout))
+            except (OSError, ValueError) as e:
+                _failed("embed", e)
+        return _batch_vectors(batch, vectors)
+
+    batches = await asyncio.gather(*(one(batch, req) for batch, req in _embed_batches(texts)))
+    return [vector for vectors in batches for vector in vectors]
+
+
+def _error_kind(e: Exception) -> str:
+    """Bucket a provider failure for metrics: timeout, http, network or invalid."""
+    if isinstance(e, TimeoutError) or isinstance(getattr(e, "reason", None), TimeoutError):
+        return "timeout"
+    if hasattr(e, "code") and hasattr(e, "reason"):  # urllib.error.HTTPError, _HTTPStatusError
+        return "http"
+    if isinstance(e, OSError):
+        return "network"
+    return "invalid"
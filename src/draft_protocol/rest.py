@@ -9,18 +9,39 @@ Endpoints:
   POST /map         — Map dimensions for a session
   POST /confirm     — Confirm a field value
   POST /gate        — Check gate status
+  POST /pipeline    — Create a session and run intake through `until` in one call
+  POST /elicit/stream — Elicitation questions as Server-Sent Events (also GET ?session_id=)
   GET  /status      — Get active session status
   GET  /health      — Health check
+  GET  /metrics     — Prometheus text exposition (latency, counts, gauges)
+  GET  /audit       — Stream the tenant's audit log as NDJSON (filters in the query string)
+
+Tenants:
+  Sessions are scoped per tenant: `Authorization: Bearer <api key>` (the
+  tenant is derived from a hash of the key), else `X-Draft-Tenant: <name>`,
+  else the default tenant. /session and /status only see that tenant's
+  active session. X-Draft-Tenant is a label, not authentication: any client
+  can send any name (except the reserved `key:` prefix of API-key tenants).
+
+Timings:
+  Send `X-Draft-Timings: 1` (or run with DRAFT_TIMINGS=1) and JSON object
+  responses gain a `timings` block with per-stage latency.
 
 Start:
   python -m draft_protocol --transport rest --port 8420
+  python -m draft_protocol --transport rest --workers 4   # pre-fork, see workers.py
 """
 
+import hashlib
 import json
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any
+from urllib.parse import parse_qs, urlsplit
 
-from draft_protocol import engine, storage
+from draft_protocol import engine, instrumentation, maintenance, metrics, storage
+from draft_protocol.config import METRICS_BACKEND, TIMINGS
+from draft_protocol.instrumentation import attach_timings, capture_timings, count, span
 
 # Maximum request body size (1 MB)
 MAX_BODY_SIZE = 1_048_576
@@ -28,21 +49,64 @@ MAX_BODY_SIZE = 1_048_576
 MAX_MESSAGE_LEN = 10_240  # 10 KB
 MAX_CONTEXT_LEN = 51_200  # 50 KB
 
+# GET /audit query parameter -> storage.iter_audit() filter
+_AUDIT_FILTERS = {
+    "session_id": "session_id",
+    "tool": "tool_name",
+    "action": "action",
+    "since": "since",
+    "until": "until",
+}
+
+_ALLOW_HEADERS = "Content-Type, Authorization, X-Draft-Tenant, X-Draft-Timings"
+
+# Paths used as span tags; anything else is tagged "unmatched" to bound cardinality.
+_ROUTES = {
+    "GET": ("/health", "/status", "/metrics", "/audit", "/elicit/stream"),
+    "POST": (
+        "/classify",
+        "/session",
+        "/map",
+        "/confirm",
+        "/gate",
+        "/elicit",
+        "/elicit/stream",
+        "/assumptions",
+        "/pipeline",
+    ),
+}
+
 
 class DraftHandler(BaseHTTPRequestHandler):
     """Minimal REST handler — no framework dependencies."""
 
+    # Set per request by _dispatch when timings are requested.
+    _timings: list | None = None
+    _started: float = 0.0
+    _status: int = 0
+
     def _send_json(self, data: Any, status: int = 200):
+        if self._timings is not None:
+            data = attach_timings(data, self._timings, self._started)
         body = json.dumps(data, default=str).encode("utf-8")
+        self._status = status
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Access-Control-Allow-Headers", _ALLOW_HEADERS)
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
         self.wfile.write(body)
 
+    def _tenant(self) -> str:
+        """Tenant for this request: API key, then X-Draft-Tenant, then the default ("")."""
+        auth = self.headers.get("Authorization") or ""
+        if auth.startswith("Bearer ") and auth[7:].strip():
+            # Never store the key itself; a stable digest identifies the tenant
+            return storage.KEY_TENANT_PREFIX + hashlib.sha256(auth[7:].strip().encode()).hexdigest()[:16]
+        return storage.validate_claimed_tenant(self.headers.get("X-Draft-Tenant") or "")
+
     def _read_json(self) -> dict:
         try:
             length = int(self.headers.get("Content-Length", 0))
@@ -59,14 +123,123 @@ class DraftHandler(BaseHTTPRequestHandler):
         self.send_response(204)
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Access-Control-Allow-Headers", _ALLOW_HEADERS)
         self.end_headers()
 
+    def _dispatch(self, method: str, handler) -> None:
+        """Run a handler inside a `rest.<METHOD>` span, capturing timings if asked."""
+        path = urlsplit(self.path).path
+        route = path if path in _ROUTES[method] else "unmatched"
+        self._status = 0
+        try:
+            if not (TIMINGS or self.headers.get("X-Draft-Timings") == "1"):
+                with span(f"rest.{method}", route=route):
+                    handler()
+                return
+            self._started = time.perf_counter()
+            with capture_timings() as records:
+                self._timings = records
+                try:
+                    with span(f"rest.{method}", route=route):
+                        handler()
+                finally:
+                    self._timings = None
+        finally:
+            count("draft_rest_requests_total", method=method, route=route, status=str(self._status or 500))
+
     def do_GET(self):
-        if self.path == "/health":
+        self._dispatch("GET", self._handle_get)
+
+    def do_POST(self):
+        self._dispatch("POST", self._handle_post_retried)
+
+    def _handle_post_retried(self):
+        try:
+            self._handle_post()
+        except storage.ConcurrentModificationError as e:  # Engine retries ran out; the client may retry
+            self._send_json({"error": str(e)}, 409)
+
+    def _send_metrics(self):
+        body = metrics.render_prometheus().encode("utf-8")
+        self._status = 200
+        self.send_response(200)
+        self.send_header("Content-Type", metrics.CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_audit(self, query: dict[str, list[str]]):
+        """Stream the tenant's matching audit rows as NDJSON; the response ends when the connection closes.
+
+        Rows are limited to sessions of the caller's tenant, and there is no
+        CORS header: other origins cannot read the audit trail from a browser.
+        Only API-key tenants are protected: a header (or default) tenant's
+        trail is readable by any client that can reach the server and names it.
+        """
+        filters: dict[str, Any] = {key: query[param][0] for param, key in _AUDIT_FILTERS.items() if param in query}
+        try:
+            filters["after_id"] = int(query.get("after", ["0"])[0])
+            filters["tenant"] = self._tenant()
+        except ValueError as e:
+            message = str(e) if filters.get("after_id") is not None else "after must be an integer audit id"
+            self._send_json({"error": message}, 400)
+            return
+        include_archive = query.get("archive", [""])[0] == "1"
+        self._status = 200
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        chunks = maintenance.iter_audit_ndjson(include_archive=include_archive, **filters)
+        try:
+            for chunk in chunks:
+                self.wfile.write(chunk)
+        except (BrokenPipeError, ConnectionResetError):  # Client went away mid-export
+            pass
+        finally:
+            chunks.close()
+
+    def _send_elicitation(self, session_id: str):
+        """Stream engine.iter_elicitation() as Server-Sent Events (`event: <kind>`, JSON data)."""
+        if not session_id:
+            self._send_json({"error": "session_id required"}, 400)
+            return
+        self._status = 200
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        events = engine.iter_elicitation(session_id)
+        try:
+            for event in events:
+                self.wfile.write(f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n".encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):  # Client went away; stop generating
+            pass
+        finally:
+            events.close()
+
+    def _handle_get(self):
+        url = urlsplit(self.path)
+        if url.path == "/audit":
+            self._send_audit(parse_qs(url.query))
+        elif url.path == "/elicit/stream":
+            self._send_elicitation(parse_qs(url.query).get("session_id", [""])[0])
+        elif self.path == "/health":
             self._send_json({"status": "ok", "service": "draft-protocol", "version": "0.1.0"})
+        elif self.path == "/metrics":
+            self._send_metrics()
         elif self.path == "/status":
-            session = storage.get_active_session()
+            try:
+                tenant = self._tenant()
+            except ValueError as e:
+                self._send_json({"error": str(e)}, 400)
+                return
+            session = storage.get_active_session(tenant)
             if session:
                 gate = engine.check_gate(session["id"])
                 self._send_json(
@@ -84,7 +257,7 @@ class DraftHandler(BaseHTTPRequestHandler):
         else:
             self._send_json({"error": "Not found"}, 404)
 
-    def do_POST(self):
+    def _handle_post(self):
         try:
             data = self._read_json()
         except ValueError as e:
@@ -117,14 +290,19 @@ class DraftHandler(BaseHTTPRequestHandler):
             if len(message) > MAX_MESSAGE_LEN:
                 self._send_json({"error": f"message too long ({len(message)} > {MAX_MESSAGE_LEN})"}, 400)
                 return
-            # Close any active session first
-            active = storage.get_active_session()
+            try:
+                tenant = self._tenant()
+            except ValueError as e:
+                self._send_json({"error": str(e)}, 400)
+                return
+            # Close this tenant's active session first
+            active = storage.get_active_session(tenant)
             if active:
                 storage.close_session(active["id"])
             tier, reasoning, confidence = engine.classify_tier(message)
             if tier_override and tier_override in ("CASUAL", "STANDARD", "CONSEQUENTIAL"):
                 tier = tier_override
-            sid = storage.create_session(tier, message)
+            sid = storage.create_session(tier, message, tenant)
             self._send_json(
                 {
                     "session_id": sid,
@@ -134,6 +312,28 @@ class DraftHandler(BaseHTTPRequestHandler):
                 }
             )
 
+        elif path == "/pipeline":
+            message = data.get("message", "")
+            context = data.get("context", "")
+            if not message or not message.strip():
+                self._send_json({"error": "message required"}, 400)
+                return
+            if len(message) > MAX_MESSAGE_LEN:
+                self._send_json({"error": f"message too long ({len(message)} > {MAX_MESSAGE_LEN})"}, 400)
+                return
+            if len(context) > MAX_CONTEXT_LEN:
+                self._send_json({"error": f"context too long ({len(context)} > {MAX_CONTEXT_LEN})"}, 400)
+                return
+            try:
+                tenant = self._tenant()
+            except ValueError as e:
+                self._send_json({"error": str(e)}, 400)
+                return
+            result = engine.run_pipeline(
+                message, context, data.get("until", "elicit"), data.get("tier_override", ""), tenant
+            )
+            self._send_json(result, 400 if "error" in result else 200)
+
         elif path == "/map":
             sid = data.get("session_id", "")
             context = data.get("context", "")
@@ -172,6 +372,9 @@ class DraftHandler(BaseHTTPRequestHandler):
             result = engine.generate_elicitation(sid)
             self._send_json({"questions": result})
 
+        elif path == "/elicit/stream":
+            self._send_elicitation(data.get("session_id", ""))
+
         elif path == "/assumptions":
             sid = data.get("session_id", "")
             if not sid:
@@ -187,11 +390,21 @@ class DraftHandler(BaseHTTPRequestHandler):
         """Suppress default stderr logging."""
 
 
+def enable_default_metrics() -> None:
+    """With DRAFT_METRICS unset, collect histograms so /metrics has something to serve."""
+    if not METRICS_BACKEND:
+        instrumentation.set_collector(instrumentation.HistogramCollector())
+
+
 def run_rest_server(host: str = "127.0.0.1", port: int = 8420):
-    """Start the REST API server."""
-    server = HTTPServer((host, port), DraftHandler)
+    """Start the REST API server (one process, a thread per request)."""
+    enable_default_metrics()
+    server = ThreadingHTTPServer((host, port), DraftHandler)
     print(f"DRAFT Protocol REST API running on http://{host}:{port}")
-    print("Endpoints: /classify, /session, /map, /confirm, /gate, /elicit, /assumptions, /status, /health")
+    print(
+        "Endpoints: /classify, /session, /pipeline, /map, /confirm, /gate, /elicit, /elicit/stream, /assumptions, "
+        "/status, /health, /metrics, /audit"
+    )
     try:
         server.serve_forever()
     except KeyboardInterrupt:
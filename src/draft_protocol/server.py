@@ -3,19 +3,38 @@
 Ensures AI understands human intent before execution begins.
 Transport: stdio (MCP standard)
 
-Tools (20):
+Tools (21):
   draft_intake / draft_open_elicit / draft_map / draft_elicit / draft_confirm
+  draft_pipeline
   draft_confirm_batch / draft_quick_confirm
   draft_assumptions / draft_score_assumptions / draft_verify / draft_verify_batch
   draft_gate / draft_review / draft_status / draft_unscreen
   draft_add_assumption / draft_override / draft_close
   draft_escalate / draft_deescalate
+
+Tools are async: provider calls are awaited on the server's event loop and
+SQLite work runs on engine's thread pool (see engine.offload), so one
+process serves many sessions concurrently under the SSE and HTTP transports.
+
+draft_elicit streams: each question, and each LLM suggestion as it
+completes, is sent as a log notification (with progress) before the tool
+returns the full list, so clients can show the first question at once.
+
+Sessions are scoped to the MCP client (ctx.client_id): draft_intake and
+draft_status only see the calling client's active session.
+
+Every tool runs inside an "mcp.<tool>" span; with DRAFT_TIMINGS=1 responses
+carry a `timings` block (see instrumentation.py).
 """
 
-from fastmcp import FastMCP
+import contextlib
+import json
+
+from fastmcp import Context, FastMCP
 
 from draft_protocol import engine, storage
 from draft_protocol.config import DIMENSION_NAMES
+from draft_protocol.instrumentation import instrument_handler
 
 mcp = FastMCP(
     name="DRAFT Protocol Server",
@@ -38,8 +57,19 @@ _CREATE = {"readOnlyHint": False, "idempotentHint": False, "openWorldHint": Fals
 _DESTRUCT = {"readOnlyHint": False, "destructiveHint": True, "idempotentHint": True, "openWorldHint": False}
 
 
+def _tenant(ctx: Context | None) -> str:
+    """Session scope for this call: the MCP client id, if the transport provides one."""
+    if ctx is None:
+        return ""
+    try:
+        return storage.validate_claimed_tenant(ctx.client_id or "")
+    except (RuntimeError, ValueError):  # Outside a request, or an unusable id
+        return ""
+
+
 @mcp.tool(annotations={"title": "Start DRAFT Session", **_CREATE})
-def draft_intake(message: str, tier_override: str = "") -> dict:
+@instrument_handler("mcp.draft_intake")
+async def draft_intake(message: str, tier_override: str = "", ctx: Context | None = None) -> dict:
     """Start a DRAFT elicitation session.
 
     Classifies the message into CASUAL / STANDARD / CONSEQUENTIAL
@@ -49,16 +79,17 @@ def draft_intake(message: str, tier_override: str = "") -> dict:
         message: The user's original request or intent description.
         tier_override: Optional. Force "CASUAL", "STANDARD", or "CONSEQUENTIAL".
     """
-    active = storage.get_active_session()
+    tenant = _tenant(ctx)
+    active = await engine.offload(storage.get_active_session, tenant)
     if active:
-        storage.close_session(active["id"])
+        await engine.offload(storage.close_session, active["id"])
 
     if tier_override and engine.resolve_tier_override(tier_override):
         tier = engine.resolve_tier_override(tier_override)
         reasoning = f"Tier manually set to {tier}"
         confidence = 1.0
     else:
-        tier, reasoning, confidence = engine.classify_tier(message)
+        tier, reasoning, confidence = await engine.aclassify_tier(message)
 
     if tier == "REJECTED":
         return {
@@ -66,9 +97,13 @@ def draft_intake(message: str, tier_override: str = "") -> dict:
             "detail": reasoning,
         }
 
-    session_id = storage.create_session(tier, message)
-    storage.log_audit(
-        session_id, "draft_intake", "session_created", f"Tier: {tier} (conf: {confidence:.2f}). {reasoning}"
+    session_id = await engine.offload(storage.create_session, tier, message, tenant)
+    await engine.offload(
+        storage.log_audit,
+        session_id,
+        "draft_intake",
+        "session_created",
+        f"Tier: {tier} (conf: {confidence:.2f}). {reasoning}",
     )
 
     result = {
@@ -87,8 +122,42 @@ def draft_intake(message: str, tier_override: str = "") -> dict:
     return result
 
 
+@mcp.tool(annotations={"title": "Run DRAFT Pipeline", **_CREATE})
+@instrument_handler("mcp.draft_pipeline")
+async def draft_pipeline(
+    message: str, context: str = "", until: str = "elicit", tier_override: str = "", ctx: Context | None = None
+) -> dict:
+    """Start a session and run intake through `until` in one call.
+
+    Equivalent to draft_intake, draft_open_elicit, draft_map, draft_elicit
+    and draft_assumptions in sequence, without the round trips. The session
+    and its audit trail are saved in one transaction.
+
+    Args:
+        message: The user's original request or intent description.
+        context: Optional. Context for draft_map; defaults to the message.
+        until: Last stage to run: "intake", "open_elicit", "map", "elicit" (default), or "assumptions".
+        tier_override: Optional. Force a tier, as in draft_intake.
+    """
+    result = await engine.offload(engine.run_pipeline, message, context, until, tier_override, _tenant(ctx))
+    if "error" in result:
+        return result
+    if "dimensions" in result:
+        result["summary"] = _dimension_summary(result["dimensions"])
+    if result.get("questions"):
+        result["next_step"] = "Present the questions to the human. Record answers with draft_confirm_batch."
+    elif "dimensions" in result:
+        result["next_step"] = "Call draft_gate to check readiness."
+    elif "question" in result.get("open_elicitation", {}):
+        result["next_step"] = "Present the open question to the human, then call draft_map with their answer."
+    else:
+        result["next_step"] = _next_step_for_tier(result["tier"])
+    return result
+
+
 @mcp.tool(annotations={"title": "Map DRAFT Dimensions", **_WRITE})
-def draft_map(session_id: str, context: str) -> dict:
+@instrument_handler("mcp.draft_map")
+async def draft_map(session_id: str, context: str) -> dict:
     """Map all 5 DRAFT dimensions against the provided context.
 
     Screens non-mandatory dimensions (R, A, F) for applicability.
@@ -98,8 +167,8 @@ def draft_map(session_id: str, context: str) -> dict:
         session_id: Active session ID from draft_intake.
         context: Combined user intent + any clarifications so far.
     """
-    dimensions = engine.map_dimensions(session_id, context)
-    session = storage.get_session(session_id)
+    dimensions = await engine.amap_dimensions(session_id, context)
+    session = await engine.offload(storage.get_session, session_id)
 
     summary = _dimension_summary(dimensions)
     return {
@@ -112,7 +181,8 @@ def draft_map(session_id: str, context: str) -> dict:
 
 
 @mcp.tool(annotations={"title": "Open Elicitation", **_RO})
-def draft_open_elicit(session_id: str) -> dict:
+@instrument_handler("mcp.draft_open_elicit")
+async def draft_open_elicit(session_id: str) -> dict:
     """Open elicitation — ask one unstructured question before mapping.
 
     For TASK+ tiers, invites the human to describe their full intent
@@ -122,11 +192,12 @@ def draft_open_elicit(session_id: str) -> dict:
     Args:
         session_id: Active session ID from draft_intake.
     """
-    return engine.open_elicitation(session_id)
+    return await engine.offload(engine.open_elicitation, session_id)
 
 
 @mcp.tool(annotations={"title": "Score Assumptions", **_RO})
-def draft_score_assumptions(session_id: str) -> dict:
+@instrument_handler("mcp.draft_score_assumptions")
+async def draft_score_assumptions(session_id: str) -> dict:
     """Score assumptions by falsifiability, impact, and novelty.
 
     CIA Key Assumptions Check quality criteria. Low-quality assumptions
@@ -135,11 +206,12 @@ def draft_score_assumptions(session_id: str) -> dict:
     Args:
         session_id: Active session ID with generated assumptions.
     """
-    return engine.score_assumptions(session_id)
+    return await engine.offload(engine.score_assumptions, session_id)
 
 
 @mcp.tool(annotations={"title": "Generate Elicitation Questions", **_RO})
-def draft_elicit(session_id: str) -> dict:
+@instrument_handler("mcp.draft_elicit")
+async def draft_elicit(session_id: str, ctx: Context | None = None) -> dict:
     """Generate targeted elicitation questions for MISSING and AMBIGUOUS fields.
 
     Returns questions with suggested answer scaffolds.
@@ -148,7 +220,10 @@ def draft_elicit(session_id: str) -> dict:
     Args:
         session_id: Active session ID.
     """
-    questions = engine.generate_elicitation(session_id)
+    if ctx is None:
+        questions = await engine.agenerate_elicitation(session_id)
+    else:
+        questions = await _stream_elicitation(session_id, ctx)
     return {
         "session_id": session_id,
         "question_count": len(questions),
@@ -157,8 +232,28 @@ def draft_elicit(session_id: str) -> dict:
     }
 
 
+async def _stream_elicitation(session_id: str, ctx: Context) -> list[dict]:
+    """Collect engine.aiter_elicitation(), notifying the client as each event arrives."""
+    questions: list[dict] = []
+    ready = 0
+    async for event in engine.aiter_elicitation(session_id):
+        if event["event"] == "error":
+            return [{"error": event["error"]}]
+        if event["event"] == "question":
+            questions.append(event["question"])
+            ready += not event["pending"]
+        elif event["event"] == "suggestion":
+            questions[event["index"]]["suggestion"] = event["suggestion"]
+            ready += 1
+        with contextlib.suppress(Exception):  # Notifications are best effort; the result carries everything
+            await ctx.info(json.dumps(event, default=str))
+            await ctx.report_progress(ready, len(questions) or None)
+    return questions
+
+
 @mcp.tool(annotations={"title": "Confirm DRAFT Field", **_WRITE})
-def draft_confirm(session_id: str, field_key: str, value: str) -> dict:
+@instrument_handler("mcp.draft_confirm")
+async def draft_confirm(session_id: str, field_key: str, value: str) -> dict:
     """Confirm a DRAFT field with a human-provided answer.
 
     Args:
@@ -166,11 +261,12 @@ def draft_confirm(session_id: str, field_key: str, value: str) -> dict:
         field_key: Field to confirm (e.g., "D1", "R3", "T2").
         value: The human's answer for this field.
     """
-    return engine.confirm_field(session_id, field_key, value)
+    return await engine.offload(engine.confirm_field, session_id, field_key, value)
 
 
 @mcp.tool(annotations={"title": "Confirm Multiple Fields", **_WRITE})
-def draft_confirm_batch(session_id: str, fields: str) -> dict:
+@instrument_handler("mcp.draft_confirm_batch")
+async def draft_confirm_batch(session_id: str, fields: str) -> dict:
     """Confirm multiple DRAFT fields in a single call.
 
     50-60% reduction in tool call overhead vs individual confirms.
@@ -186,11 +282,12 @@ def draft_confirm_batch(session_id: str, fields: str) -> dict:
         parsed = _json.loads(fields) if isinstance(fields, str) else fields
     except (ValueError, TypeError):
         return {"error": 'fields must be valid JSON: \'{"D1": "value", "D2": "value"}\''}
-    return engine.confirm_batch(session_id, parsed)
+    return await engine.offload(engine.confirm_batch, session_id, parsed)
 
 
 @mcp.tool(annotations={"title": "Quick Confirm Satisfied", **_WRITE})
-def draft_quick_confirm(session_id: str) -> dict:
+@instrument_handler("mcp.draft_quick_confirm")
+async def draft_quick_confirm(session_id: str) -> dict:
     """Promote all SATISFIED fields to CONFIRMED in one call.
 
     Useful after draft_map when many fields were auto-extracted correctly.
@@ -200,11 +297,12 @@ def draft_quick_confirm(session_id: str) -> dict:
     Args:
         session_id: Active session ID.
     """
-    return engine.quick_confirm_satisfied(session_id)
+    return await engine.offload(engine.quick_confirm_satisfied, session_id)
 
 
 @mcp.tool(annotations={"title": "Surface Assumptions", **_RO})
-def draft_assumptions(session_id: str) -> dict:
+@instrument_handler("mcp.draft_assumptions")
+async def draft_assumptions(session_id: str) -> dict:
     """Surface 3-5 key assumptions as falsifiable claims.
 
     Present to human as: "I'm assuming X. Is that correct?"
@@ -213,7 +311,7 @@ def draft_assumptions(session_id: str) -> dict:
     Args:
         session_id: Active session ID.
     """
-    assumptions = engine.generate_assumptions(session_id)
+    assumptions = await engine.agenerate_assumptions(session_id)
     return {
         "session_id": session_id,
         "assumption_count": len(assumptions),
@@ -223,7 +321,8 @@ def draft_assumptions(session_id: str) -> dict:
 
 
 @mcp.tool(annotations={"title": "Verify Assumption", **_WRITE})
-def draft_verify(session_id: str, assumption_index: int, verified: bool, note: str = "") -> dict:
+@instrument_handler("mcp.draft_verify")
+async def draft_verify(session_id: str, assumption_index: int, verified: bool, note: str = "") -> dict:
     """Verify or reject an assumption.
 
     If rejected, affected fields need re-elicitation.
@@ -234,11 +333,12 @@ def draft_verify(session_id: str, assumption_index: int, verified: bool, note: s
         verified: True if human confirms, False if they reject.
         note: Optional human note.
     """
-    return engine.verify_assumption(session_id, assumption_index, verified, note)
+    return await engine.offload(engine.verify_assumption, session_id, assumption_index, verified, note)
 
 
 @mcp.tool(annotations={"title": "Verify Multiple Assumptions", **_WRITE})
-def draft_verify_batch(session_id: str, verifications: str) -> dict:
+@instrument_handler("mcp.draft_verify_batch")
+async def draft_verify_batch(session_id: str, verifications: str) -> dict:
     """Verify or reject multiple assumptions in a single call.
 
     Args:
@@ -252,11 +352,12 @@ def draft_verify_batch(session_id: str, verifications: str) -> dict:
         parsed = _json.loads(verifications) if isinstance(verifications, str) else verifications
     except (ValueError, TypeError):
         return {"error": 'verifications must be valid JSON: \'{"0": true, "1": false}\''}
-    return engine.verify_batch(session_id, parsed)
+    return await engine.offload(engine.verify_batch, session_id, parsed)
 
 
 @mcp.tool(annotations={"title": "Check Confirmation Gate", **_RO})
-def draft_gate(session_id: str) -> dict:
+@instrument_handler("mcp.draft_gate")
+async def draft_gate(session_id: str) -> dict:
     """Check the confirmation gate: are all applicable fields confirmed?
 
     Returns GO (all clear) or NO-GO (with list of blockers).
@@ -265,11 +366,12 @@ def draft_gate(session_id: str) -> dict:
     Args:
         session_id: Active session ID.
     """
-    return engine.check_gate(session_id)
+    return await engine.acheck_gate(session_id)
 
 
 @mcp.tool(annotations={"title": "Elicitation Quality Review", **_RO})
-def draft_review(session_id: str) -> dict:
+@instrument_handler("mcp.draft_review")
+async def draft_review(session_id: str) -> dict:
     """Elicitation quality self-assessment (Step 7).
 
     Mandatory for CONSEQUENTIAL tier. Recommended for STANDARD.
@@ -278,11 +380,12 @@ def draft_review(session_id: str) -> dict:
     Args:
         session_id: Active session ID.
     """
-    return engine.elicitation_review(session_id)
+    return await engine.offload(engine.elicitation_review, session_id)
 
 
 @mcp.tool(annotations={"title": "View Session State", **_RO})
-def draft_status(session_id: str = "") -> dict:
+@instrument_handler("mcp.draft_status")
+async def draft_status(session_id: str = "", ctx: Context | None = None) -> dict:
     """View current DRAFT session state.
 
     Shows tier, dimension map, field statuses, assumptions, gate status.
@@ -291,12 +394,15 @@ def draft_status(session_id: str = "") -> dict:
     Args:
         session_id: Optional. Defaults to active session.
     """
-    session = storage.get_active_session() if not session_id else storage.get_session(session_id)
+    if session_id:
+        session = await engine.offload(storage.get_session, session_id)
+    else:
+        session = await engine.offload(storage.get_active_session, _tenant(ctx))
 
     if not session:
         return {"error": "No active session. Use draft_intake to start one."}
 
-    gate = engine.check_gate(session["id"])
+    gate = await engine.acheck_gate(session["id"])
 
     return {
         "session_id": session["id"],
@@ -311,7 +417,8 @@ def draft_status(session_id: str = "") -> dict:
 
 
 @mcp.tool(annotations={"title": "Unscreen Dimension", **_WRITE})
-def draft_unscreen(session_id: str, dimension_key: str) -> dict:
+@instrument_handler("mcp.draft_unscreen")
+async def draft_unscreen(session_id: str, dimension_key: str) -> dict:
     """Reverse screening on a dimension that was incorrectly marked N/A.
 
     Only works on non-mandatory dimensions (R, A, F).
@@ -321,11 +428,12 @@ def draft_unscreen(session_id: str, dimension_key: str) -> dict:
         session_id: Active session ID.
         dimension_key: The dimension to unscreen ("R", "A", or "F").
     """
-    return engine.unscreen_dimension(session_id, dimension_key)
+    return await engine.offload(engine.unscreen_dimension, session_id, dimension_key)
 
 
 @mcp.tool(annotations={"title": "Add Manual Assumption", **_CREATE})
-def draft_add_assumption(session_id: str, claim: str, source: str = "manual", falsifier: str = "") -> dict:
+@instrument_handler("mcp.draft_add_assumption")
+async def draft_add_assumption(session_id: str, claim: str, source: str = "manual", falsifier: str = "") -> dict:
     """Add a manually authored assumption to the session.
 
     Use for Devil's Advocate assumptions or any assumption not auto-generated
@@ -338,11 +446,12 @@ def draft_add_assumption(session_id: str, claim: str, source: str = "manual", fa
         source: Origin of the assumption (default: "manual"). Use "devils_advocate" for DA step.
         falsifier: What would prove this wrong. Auto-generated if omitted.
     """
-    return engine.add_assumption(session_id, claim, source, falsifier)
+    return await engine.offload(engine.add_assumption, session_id, claim, source, falsifier)
 
 
 @mcp.tool(annotations={"title": "Override Blocked Gate", **_DESTRUCT})
-def draft_override(session_id: str, reason: str) -> dict:
+@instrument_handler("mcp.draft_override")
+async def draft_override(session_id: str, reason: str) -> dict:
     """Override a blocked gate with a logged reason (authorized override).
 
     For tool limitations only — NOT a governance bypass. The override is
@@ -352,23 +461,25 @@ def draft_override(session_id: str, reason: str) -> dict:
         session_id: Active session ID.
         reason: Mandatory explanation of why override is justified.
     """
-    return engine.override_gate(session_id, reason)
+    return await engine.offload(engine.override_gate, session_id, reason)
 
 
 @mcp.tool(annotations={"title": "Close Session", **_DESTRUCT})
-def draft_close(session_id: str) -> dict:
+@instrument_handler("mcp.draft_close")
+async def draft_close(session_id: str) -> dict:
     """Close a DRAFT session.
 
     Args:
         session_id: Session to close.
     """
-    storage.close_session(session_id)
-    storage.log_audit(session_id, "draft_close", "session_closed", "")
+    await engine.offload(storage.close_session, session_id)
+    await engine.offload(storage.log_audit, session_id, "draft_close", "session_closed", "")
     return {"session_id": session_id, "status": "closed"}
 
 
 @mcp.tool(annotations={"title": "Escalate Tier", **_CREATE})
-def draft_escalate(session_id: str, reason: str) -> dict:
+@instrument_handler("mcp.draft_escalate")
+async def draft_escalate(session_id: str, reason: str) -> dict:
     """Manually escalate session tier.
 
     Casual -> Standard -> Consequential. Cannot exceed Consequential.
@@ -377,11 +488,12 @@ def draft_escalate(session_id: str, reason: str) -> dict:
         session_id: Active session ID.
         reason: Why escalation is needed.
     """
-    return engine.escalate_tier(session_id, reason)
+    return await engine.offload(engine.escalate_tier, session_id, reason)
 
 
 @mcp.tool(annotations={"title": "De-escalate Tier", **_CREATE})
-def draft_deescalate(session_id: str, reason: str) -> dict:
+@instrument_handler("mcp.draft_deescalate")
+async def draft_deescalate(session_id: str, reason: str) -> dict:
     """Manually de-escalate session tier (authorized override).
 
     Consequential -> Standard -> Casual. Logged but honored.
@@ -390,7 +502,7 @@ def draft_deescalate(session_id: str, reason: str) -> dict:
         session_id: Active session ID.
         reason: Reason for de-escalation.
     """
-    return engine.deescalate_tier(session_id, reason)
+    return await engine.offload(engine.deescalate_tier, session_id, reason)
 
 
 # ── Helpers ───────────────────────────────────────────────
@@ -1,11 +1,34 @@
-"""SQLite storage for DRAFT sessions."""
+"""SQLite storage for DRAFT sessions.
 
+Sharding: with DRAFT_DB_SHARDS=N, sessions and their audit trails are
+spread over N database files (draft.db, draft-1.db, ...) by consistent
+hashing of the session id, so writers contend on N write locks instead
+of one. register_storage_path_hook() can take over the routing. Nonce
+and replay state stays in the home shard (draft.db). Connections are
+pooled per shard.
+"""
+
+import bisect
+import functools
+import hashlib
+import heapq
+import itertools
 import json
+import os
 import sqlite3
+import threading
+import time
 import uuid
-from datetime import datetime, timezone
+import zlib
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
 
-from draft_protocol.config import DB_PATH
+from draft_protocol import config
+from draft_protocol.config import DB_BUSY_TIMEOUT_MS, DB_PATH, DB_POOL_SIZE, DB_SHARDS
+from draft_protocol.extension_points import get_storage_path_hook
+from draft_protocol.instrumentation import count, timed
 
 # M1.4: Valid tier enum — reject anything not in this set
 VALID_TIERS = {"TRIVIAL", "LOOKUP", "TASK", "MULTI", "CONSEQUENTIAL", "CASUAL", "STANDARD"}  # Legacy compat
@@ -23,96 +46,415 @@ _UPDATABLE_FIELDS = frozenset(
         "review_done",
         "review_notes",
         "closed_at",
+        "context_segments",
+        "context_fps",
     }
 )
 
+# Session columns stored as JSON text
+_JSON_FIELDS = ("dimensions", "assumptions", "context_segments", "context_fps")
+
+
+class ConcurrentModificationError(Exception):
+    """A compare-and-swap update_session() lost a race: the session moved past expected_version."""
+
+    def __init__(self, session_id: str, expected_version: int):
+        super().__init__(f"Session {session_id} was modified concurrently (expected version {expected_version})")
+        self.session_id = session_id
+        self.expected_version = expected_version
+
+
+# ── Shards ────────────────────────────────────────────────
+
+
+class HashRing:
+    """Consistent-hash ring over shard indexes, `vnodes` points per shard.
+
+    Growing the ring from N to N+1 shards remaps only ~1/(N+1) of the keys.
+    """
+
+    def __init__(self, names: list[str], vnodes: int = 64):
+        points = sorted((_hash64(f"{name}#{v}"), index) for index, name in enumerate(names) for v in range(vnodes))
+        self._keys = [p for p, _ in points]
+        self._shards = [i for _, i in points]
+
+    def lookup(self, key: str) -> int:
+        i = bisect.bisect(self._keys, _hash64(key)) % len(self._keys)
+        return self._shards[i]
+
+
+def _hash64(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+@functools.lru_cache(maxsize=8)
+def _ring(names: tuple[str, ...]) -> HashRing:
+    return HashRing(list(names))
+
+
+@functools.lru_cache(maxsize=8)
+def _hook_takes_key(hook: Callable) -> bool:
+    import inspect  # Only with a storage path hook registered
+
+    try:
+        return len(inspect.signature(hook).parameters) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+def shard_paths() -> list[Path]:
+    """All configured database files; index 0 is the home shard."""
+    hook = get_storage_path_hook()
+    home = Path(hook()) if hook is not None and not _hook_takes_key(hook) else DB_PATH
+    return [home] + [home.with_name(f"{home.stem}-{i}{home.suffix}") for i in range(1, DB_SHARDS)]
+
+
+def path_for(session_id: str | None) -> Path:
+    """Database file that holds `session_id` (the home shard for None).
+
+    A storage path hook taking an argument is called as hook(session_id)
+    and should return one of shard_paths(); otherwise the session id is
+    placed on the consistent-hash ring.
+    """
+    hook = get_storage_path_hook()
+    if session_id is not None and hook is not None and _hook_takes_key(hook):
+        return Path(hook(session_id))
+    paths = shard_paths()
+    if session_id is None or len(paths) == 1:
+        return paths[0]
+    return paths[_ring(tuple(p.name for p in paths)).lookup(session_id)]
+
+
+def _audit_id_base(path: Path) -> int:
+    """First audit id of a shard: ids stay unique, and ordered by shard, across files."""
+    paths = shard_paths()
+    index = paths.index(path) if path in paths else (zlib.crc32(str(path).encode()) & 0xFFFFF) + 1
+    return index << 40
+
+
+# ── Connections ───────────────────────────────────────────
 
-def get_db() -> sqlite3.Connection:
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
+
+class _PooledConnection(sqlite3.Connection):
+    """A connection whose close() hands it back to its shard's pool."""
+
+    _pool: "_Pool | None" = None
+    _idle = False
+
+    def close(self):
+        if self._pool is None or not self._pool.release(self):
+            super().close()
+
+
+class _Pool:
+    """Keeps up to `size` idle connections to one database file."""
+
+    def __init__(self, path: Path, size: int):
+        self.path = path
+        self.size = size
+        self._idle: list[_PooledConnection] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._idle:
+                conn = self._idle.pop()
+                conn._idle = False
+                return conn
+        conn = sqlite3.connect(
+            str(self.path),
+            timeout=DB_BUSY_TIMEOUT_MS / 1000,
+            factory=_PooledConnection,
+            check_same_thread=False,  # Pooled: used by one thread at a time, not always the same
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn._pool = self
+        return conn
+
+    def release(self, conn: _PooledConnection) -> bool:
+        """Return conn to the pool; False if the caller should really close it."""
+        if conn._idle:  # Closed twice
+            return True
+        try:
+            if conn.in_transaction:  # Uncommitted work is discarded, as close() would
+                conn.rollback()
+        except sqlite3.Error:
+            return False
+        with self._lock:
+            if len(self._idle) < self.size:
+                conn._idle = True
+                self._idle.append(conn)
+                return True
+        return False
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn._pool = None
+            conn.close()
+
+
+_pools: dict[Path, _Pool] = {}
+_pools_lock = threading.Lock()
+_init_lock = threading.Lock()
+_initialized: set[Path] = set()
+_inherited: list = []  # Pools copied into a forked child: never used or closed there
+
+
+def _pool_for(path: Path) -> _Pool:
+    pool = _pools.get(path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(path, _Pool(path, DB_POOL_SIZE))
+    return pool
+
+
+def close_pools() -> None:
+    """Close every idle pooled connection (e.g. before forking workers)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _forget_pools_after_fork() -> None:
+    # SQLite connections must not cross fork(); drop the parent's without closing them
+    _inherited.append(dict(_pools))
+    _pools.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pools_after_fork)
+
+
+def get_db(path: Path | None = None) -> sqlite3.Connection:
+    """Pooled connection to a shard (the home shard by default), created on first use.
+
+    close() returns the connection to the pool.
+    """
+    path = path or shard_paths()[0]
+    if path not in _initialized:
+        _init_path(path)
+    return _pool_for(path).acquire()
+
+
+def _db_for(session_id: str | None) -> sqlite3.Connection:
+    return get_db(path_for(session_id))
 
 
 def init_db():
-    """Create tables if they don't exist."""
-    conn = get_db()
-    conn.executescript("""
-        CREATE TABLE IF NOT EXISTS sessions (
-            id TEXT PRIMARY KEY,
-            tier TEXT NOT NULL DEFAULT 'CASUAL',
-            intent TEXT,
-            provisional_interpretation TEXT,
-            dimensions JSON NOT NULL DEFAULT '{}',
-            assumptions JSON NOT NULL DEFAULT '[]',
-            gate_passed INTEGER NOT NULL DEFAULT 0,
-            gate_hmac TEXT,
-            review_done INTEGER NOT NULL DEFAULT 0,
-            review_notes TEXT,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            closed_at TEXT
-        );
-        CREATE TABLE IF NOT EXISTS audit_log (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_id TEXT REFERENCES sessions(id),
-            tool_name TEXT NOT NULL,
-            action TEXT NOT NULL,
-            detail TEXT,
-            created_at TEXT NOT NULL
-        );
-    """)
-    conn.commit()
-    conn.close()
-
-
-# Initialize on import
-init_db()
-
-
-def _migrate_gate_hmac():
-    """Add gate_hmac column if missing (migration for existing DBs)."""
-    conn = get_db()
+    """Create the DB directory, tables and pending migrations in every shard (idempotent).
+
+    Runs once per process and file, on first use (or explicitly before
+    forking workers). Nothing is touched at import time so that importing
+    draft_protocol stays cheap.
+    """
+    for path in shard_paths():
+        _init_path(path)
+
+
+def _init_path(path: Path):
+    with _init_lock:
+        if path in _initialized:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = _pool_for(path).acquire()
+        try:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id TEXT PRIMARY KEY,
+                    tier TEXT NOT NULL DEFAULT 'CASUAL',
+                    intent TEXT,
+                    provisional_interpretation TEXT,
+                    dimensions JSON NOT NULL DEFAULT '{}',
+                    assumptions JSON NOT NULL DEFAULT '[]',
+                    gate_passed INTEGER NOT NULL DEFAULT 0,
+                    gate_hmac TEXT,
+                    review_done INTEGER NOT NULL DEFAULT 0,
+                    review_notes TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    closed_at TEXT,
+                    tenant TEXT NOT NULL DEFAULT '',
+                    version INTEGER NOT NULL DEFAULT 0,
+                    context_segments JSON NOT NULL DEFAULT '[]',
+                    context_fps JSON NOT NULL DEFAULT '{}'
+                );
+                CREATE TABLE IF NOT EXISTS audit_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT REFERENCES sessions(id),
+                    tool_name TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    detail TEXT,
+                    created_at TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS nonce_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    high_water INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO nonce_state (id, high_water) VALUES (0, 0);
+                CREATE TABLE IF NOT EXISTS replay_keys (
+                    key TEXT PRIMARY KEY,
+                    expires_at INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_replay_keys_expires ON replay_keys(expires_at);
+                CREATE INDEX IF NOT EXISTS idx_sessions_open ON sessions(closed_at, created_at);
+                CREATE INDEX IF NOT EXISTS idx_audit_log_created ON audit_log(created_at);
+            """)
+            _migrate_gate_hmac(conn)
+            _migrate_tenant(conn)
+            _migrate_version(conn)
+            _migrate_context_segments(conn)
+            _migrate_context_fps(conn)
+            # Start this shard's audit ids in its own range (no-op once rows exist)
+            conn.execute(
+                "INSERT INTO sqlite_sequence (name, seq) SELECT 'audit_log', ? "
+                "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'audit_log')",
+                (_audit_id_base(path),),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        _initialized.add(path)
+
+
+def _add_session_column(conn: sqlite3.Connection, name: str, ddl: str):
+    """Add a sessions column if missing (migration for existing DBs)."""
     try:
-        conn.execute("SELECT gate_hmac FROM sessions LIMIT 1")
+        conn.execute(f"SELECT {name} FROM sessions LIMIT 1")
     except sqlite3.OperationalError:
-        conn.execute("ALTER TABLE sessions ADD COLUMN gate_hmac TEXT")
-        conn.commit()
-    conn.close()
+        try:
+            conn.execute(f"ALTER TABLE sessions ADD COLUMN {name} {ddl}")
+        except sqlite3.OperationalError as e:
+            # Another process migrated between our check and ALTER
+            if "duplicate column" not in str(e):
+                raise
+
+
+def _migrate_gate_hmac(conn: sqlite3.Connection):
+    """Add gate_hmac column if missing (migration for existing DBs)."""
+    _add_session_column(conn, "gate_hmac", "TEXT")
+
+
+def _migrate_tenant(conn: sqlite3.Connection):
+    """Add the tenant column (existing sessions join the default tenant '') and its index."""
+    _add_session_column(conn, "tenant", "TEXT NOT NULL DEFAULT ''")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_tenant_open ON sessions(tenant, closed_at, created_at)")
+
+
+def _migrate_version(conn: sqlite3.Connection):
+    """Add the version column used for compare-and-swap updates (existing sessions start at 0)."""
+    _add_session_column(conn, "version", "INTEGER NOT NULL DEFAULT 0")
 
 
-_migrate_gate_hmac()
+def _migrate_context_segments(conn: sqlite3.Connection):
+    """Add the paragraph hashes of the last mapped context (incremental re-mapping)."""
+    _add_session_column(conn, "context_segments", "JSON NOT NULL DEFAULT '[]'")
+
+
+def _migrate_context_fps(conn: sqlite3.Connection):
+    """Add the context fingerprints of the last mapping, by dimension and field key."""
+    _add_session_column(conn, "context_fps", "JSON NOT NULL DEFAULT '{}'")
 
 
 def _now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def create_session(tier: str, intent: str) -> str:
-    """Create a new DRAFT session. Returns session_id."""
+MAX_TENANT_LEN = 128
+
+
+def validate_tenant(tenant: str) -> str:
+    """Return tenant if usable as a session scope key, else raise ValueError."""
+    if not isinstance(tenant, str) or len(tenant) > MAX_TENANT_LEN or not tenant.isprintable():
+        raise ValueError(f"Invalid tenant: must be printable text of at most {MAX_TENANT_LEN} characters")
+    return tenant
+
+
+# Prefix of tenants derived from an API key (REST `Authorization: Bearer`)
+KEY_TENANT_PREFIX = "key:"
+
+
+def validate_claimed_tenant(tenant: str) -> str:
+    """validate_tenant() for a name the caller picks itself (a header, a client id).
+
+    Such names are not authenticated, so they may not use the prefix
+    reserved for API-key tenants.
+    """
+    if isinstance(tenant, str) and tenant.startswith(KEY_TENANT_PREFIX):
+        raise ValueError(f"Invalid tenant: the '{KEY_TENANT_PREFIX}' prefix is reserved for API-key tenants")
+    return validate_tenant(tenant)
+
+
+@timed("storage.create_session")
+def create_session(
+    tier: str,
+    intent: str,
+    tenant: str = "",
+    *,
+    audit: list[tuple[str, str, str]] | None = None,
+    replaces: str | None = None,
+    **fields,
+) -> str:
+    """Create a new DRAFT session owned by `tenant` ("" = default). Returns session_id.
+
+    `fields` are initial values for updatable columns (as in update_session)
+    and `audit` holds (tool_name, action, detail) entries for the new
+    session; both are written in the same transaction as the session.
+    `replaces` is a session to close: in the same transaction when it lives
+    in the new session's shard, otherwise right after it.
+    """
     # M1.4: Validate tier enum
     if tier not in VALID_TIERS:
         raise ValueError(f"Invalid tier '{tier}'. Must be one of: {', '.join(sorted(VALID_TIERS))}")
+    bad_fields = set(fields) - (_UPDATABLE_FIELDS - {"tier", "intent"})
+    if bad_fields:
+        raise ValueError(f"Invalid field(s): {', '.join(sorted(bad_fields))}")
     # Map legacy 3-tier names to 5-tier
     _LEGACY_MAP = {"CASUAL": "TRIVIAL", "STANDARD": "TASK"}
     tier = _LEGACY_MAP.get(tier, tier)
+    validate_tenant(tenant)
     sid = str(uuid.uuid4())[:12]
-    conn = get_db()
     now = _now()
-    conn.execute(
-        "INSERT INTO sessions (id, tier, intent, dimensions, assumptions, created_at, updated_at) "
-        "VALUES (?, ?, ?, '{}', '[]', ?, ?)",
-        (sid, tier, intent, now, now),
-    )
-    conn.commit()
-    conn.close()
+    row = {"id": sid, "tier": tier, "intent": intent, "dimensions": {}, "assumptions": [], **fields}
+    row.update(created_at=now, updated_at=now, tenant=tenant)
+    for k in _JSON_FIELDS:
+        if k in row:
+            row[k] = json.dumps(row[k])
+    conn = _db_for(sid)
+    try:
+        conn.execute(
+            f"INSERT INTO sessions ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+            list(row.values()),
+        )
+        if audit:
+            conn.executemany(
+                "INSERT INTO audit_log (session_id, tool_name, action, detail, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(sid, *entry, now) for entry in audit],
+            )
+        same_shard = replaces is not None and path_for(replaces) == path_for(sid)
+        if same_shard:
+            conn.execute(
+                "UPDATE sessions SET closed_at = ?, updated_at = ?, version = version + 1 "
+                "WHERE id = ? AND closed_at IS NULL",
+                (now, now, replaces),
+            )
+        conn.commit()
+    finally:
+        conn.close()
+    if replaces is not None and not same_shard:
+        close_session(replaces)
     return sid
 
 
+@timed("storage.get_session")
 def get_session(session_id: str) -> dict | None:
     """Retrieve a session by ID."""
-    conn = get_db()
+    conn = _db_for(session_id)
     try:
         row = conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
     finally:
@@ -120,40 +462,115 @@ def get_session(session_id: str) -> dict | None:
     if not row:
         return None
     d = dict(row)
-    d["dimensions"] = json.loads(d["dimensions"])
-    d["assumptions"] = json.loads(d["assumptions"])
+    for k in _JSON_FIELDS:
+        d[k] = json.loads(d[k])
     return d
 
 
+@timed("storage.is_session_closed")
 def is_session_closed(session_id: str) -> bool:
     """Check if a session is closed. M1.3: Closed session guard."""
-    conn = get_db()
+    conn = _db_for(session_id)
     try:
-        row = conn.execute("SELECT closed_at FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        row = conn.execute(
+            "SELECT id, tier, created_at, updated_at, closed_at FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
     finally:
         conn.close()
     if not row:
         return True  # Nonexistent sessions treated as closed
-    return row["closed_at"] is not None
+    if row["closed_at"] is not None:
+        return True
+    if _expiry_reason(row, datetime.now(timezone.utc)):
+        expire_sessions(session_ids=[session_id])
+        return True
+    return False
 
 
-def get_active_session() -> dict | None:
-    """Get the most recent unclosed session."""
-    conn = get_db()
-    try:
-        row = conn.execute("SELECT * FROM sessions WHERE closed_at IS NULL ORDER BY created_at DESC LIMIT 1").fetchone()
-    finally:
-        conn.close()
+@timed("storage.get_active_session")
+def get_active_session(tenant: str = "") -> dict | None:
+    """Get the tenant's most recent unclosed, unexpired session.
+
+    One index seek on (tenant, closed_at, created_at) per shard; other
+    tenants' sessions are never returned.
+    """
+    attempted: set[str] = set()
+    while True:
+        row = None
+        for path in shard_paths():
+            conn = get_db(path)
+            try:
+                found = conn.execute(
+                    "SELECT * FROM sessions WHERE tenant = ? AND closed_at IS NULL ORDER BY created_at DESC LIMIT 1",
+                    (tenant,),
+                ).fetchone()
+            finally:
+                conn.close()
+            if found and (row is None or found["created_at"] > row["created_at"]):
+                row = found
+        if not row or not _expiry_reason(row, datetime.now(timezone.utc)):
+            break
+        # Lazy expiry: close just this session, then look again. A session a
+        # concurrent writer closed first is simply gone on the next read.
+        if row["id"] in attempted:
+            return None
+        attempted.add(row["id"])
+        expire_sessions(session_ids=[row["id"]])
     if not row:
         return None
     d = dict(row)
-    d["dimensions"] = json.loads(d["dimensions"])
-    d["assumptions"] = json.loads(d["assumptions"])
+    for k in _JSON_FIELDS:
+        d[k] = json.loads(d[k])
     return d
 
 
-def update_session(session_id: str, **kwargs):
-    """Update session fields. JSON fields auto-serialized."""
+@timed("storage.count_active_sessions")
+def count_active_sessions() -> int:
+    """Number of unclosed sessions (for the active-sessions gauge)."""
+    total = 0
+    for path in shard_paths():
+        conn = get_db(path)
+        try:
+            total += conn.execute("SELECT COUNT(*) FROM sessions WHERE closed_at IS NULL").fetchone()[0]
+        finally:
+            conn.close()
+    return total
+
+
+@timed("storage.confirmed_tiers")
+def confirmed_tiers(limit: int = 1000, tenant: str = "") -> list[tuple[str, str]]:
+    """(intent, tier) of the tenant's most recently updated sessions whose gate passed, newest first.
+
+    A passed gate means the human worked through elicitation at that tier,
+    which makes the pair a labeled example for tier classification. Other
+    tenants' intents are never returned.
+    """
+    rows: list[sqlite3.Row] = []
+    for path in shard_paths():
+        conn = get_db(path)
+        try:
+            rows += conn.execute(
+                "SELECT intent, tier, updated_at FROM sessions"
+                " WHERE tenant = ? AND gate_passed = 1 AND intent IS NOT NULL AND intent != ''"
+                " ORDER BY updated_at DESC LIMIT ?",
+                (tenant, limit),
+            ).fetchall()
+        finally:
+            conn.close()
+    rows.sort(key=lambda row: row["updated_at"], reverse=True)
+    return [(row["intent"], row["tier"]) for row in rows[:limit]]
+
+
+@timed("storage.update_session")
+def update_session(session_id: str, expected_version: int | None = None, **kwargs) -> int | None:
+    """Update session fields. JSON fields auto-serialized.
+
+    Every update bumps the session's version. With expected_version the
+    update is a compare-and-swap: it applies only if the session is still
+    at that version, returns the new version, and otherwise raises
+    ConcurrentModificationError so the caller can re-read and retry. A
+    compare-and-swap on a session that no longer exists raises ValueError.
+    """
     # Validate field names against whitelist to prevent SQL injection
     bad_fields = set(kwargs.keys()) - _UPDATABLE_FIELDS
     if bad_fields:
@@ -161,35 +578,483 @@ def update_session(session_id: str, **kwargs):
     # M1.4: Validate tier if being updated
     if "tier" in kwargs and kwargs["tier"] not in VALID_TIERS:
         raise ValueError(f"Invalid tier '{kwargs['tier']}'. Must be one of: {', '.join(sorted(VALID_TIERS))}")
-    conn = get_db()
+    conn = _db_for(session_id)
     try:
-        sets = ["updated_at = ?"]
-        vals = [_now()]
+        sets = ["updated_at = ?", "version = version + 1"]
+        vals: list[Any] = [_now()]
         for k, v in kwargs.items():
-            if k in ("dimensions", "assumptions"):
+            if k in _JSON_FIELDS:
                 v = json.dumps(v)
             sets.append(f"{k} = ?")
             vals.append(v)
+        where = "id = ?"
         vals.append(session_id)
-        conn.execute(f"UPDATE sessions SET {', '.join(sets)} WHERE id = ?", vals)
+        if expected_version is not None:
+            where += " AND version = ?"
+            vals.append(expected_version)
+        cur = conn.execute(f"UPDATE sessions SET {', '.join(sets)} WHERE {where}", vals)
         conn.commit()
+        if expected_version is None:
+            return None
+        if cur.rowcount != 1:
+            if conn.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is None:
+                raise ValueError(f"Session not found: {session_id}")
+            raise ConcurrentModificationError(session_id, expected_version)
     finally:
         conn.close()
+    return expected_version + 1
 
 
+@timed("storage.close_session")
 def close_session(session_id: str):
     """Mark session closed."""
     update_session(session_id, closed_at=_now())
 
 
+# ── Session Expiry ────────────────────────────────────────
+
+_EXPIRE_BATCH = 500
+
+
+def _expiry_reason(row: sqlite3.Row, now: datetime) -> str | None:
+    """'max_age' or 'idle' if an open session has outlived its tier's TTLs, else None."""
+    max_ttl = config.SESSION_MAX_TTL.get(row["tier"], 0)
+    if max_ttl and datetime.fromisoformat(row["created_at"]) <= now - timedelta(seconds=max_ttl):
+        return "max_age"
+    idle_ttl = config.SESSION_IDLE_TTL.get(row["tier"], 0)
+    if idle_ttl and datetime.fromisoformat(row["updated_at"]) <= now - timedelta(seconds=idle_ttl):
+        return "idle"
+    return None
+
+
+@timed("storage.expire_sessions")
+def expire_sessions(limit: int = _EXPIRE_BATCH, session_ids: list[str] | None = None) -> list[str]:
+    """Close up to `limit` open sessions past their idle or absolute TTL.
+
+    Candidates are selected per tier with the TTL cutoffs pushed into SQL,
+    then closed and audited (one "expired" entry each) in a single
+    transaction. With session_ids, only those sessions are considered.
+    Returns the ids closed; fewer than `limit` means nothing is left.
+    """
+    if session_ids is not None and not session_ids:
+        return []
+    now = datetime.now(timezone.utc)
+    clauses: list[str] = []
+    params: list[str] = []
+    for tier in sorted(set(config.SESSION_IDLE_TTL) | set(config.SESSION_MAX_TTL)):
+        cutoffs = [
+            (column, (now - timedelta(seconds=ttl[tier])).isoformat())
+            for column, ttl in (("updated_at", config.SESSION_IDLE_TTL), ("created_at", config.SESSION_MAX_TTL))
+            if ttl.get(tier, 0) > 0
+        ]
+        if cutoffs:
+            clauses.append(f"(tier = ? AND ({' OR '.join(f'{column} <= ?' for column, _ in cutoffs)}))")
+            params += [tier, *(cutoff for _, cutoff in cutoffs)]
+    if not clauses:
+        return []
+    where = f"closed_at IS NULL AND ({' OR '.join(clauses)})"
+    if session_ids is not None:
+        targets: dict[Path, list[str]] = {}
+        for sid in session_ids:
+            targets.setdefault(path_for(sid), []).append(sid)
+    else:
+        targets = {path: [] for path in shard_paths()}
+    expired: list[tuple[str, str]] = []
+    for path, ids in targets.items():
+        if len(expired) >= limit:
+            break
+        shard_where = where + (f" AND id IN ({','.join('?' * len(ids))})" if ids else "")
+        expired += _expire_in(path, shard_where, [*params, *ids], limit - len(expired), now)
+    for _, reason in expired:
+        count("draft_sessions_expired_total", reason=reason)
+    return [sid for sid, _ in expired]
+
+
+def _expire_in(path: Path, where: str, params: list[str], limit: int, now: datetime) -> list[tuple[str, str]]:
+    conn = get_db(path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(
+            f"SELECT id, tier, created_at, updated_at FROM sessions WHERE {where} LIMIT ?", (*params, limit)
+        ).fetchall()
+        expired = [(row["id"], _expiry_reason(row, now) or "idle") for row in rows]
+        stamp = now.isoformat()
+        conn.executemany(
+            "UPDATE sessions SET closed_at = ?, updated_at = ?, version = version + 1 WHERE id = ? AND closed_at IS NULL",
+            [(stamp, stamp, sid) for sid, _ in expired],
+        )
+        conn.executemany(
+            "INSERT INTO audit_log (session_id, tool_name, action, detail, created_at) VALUES (?, ?, ?, ?, ?)",
+            [(sid, "session_expiry", "expired", f"reason={reason}", stamp) for sid, reason in expired],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return expired
+
+
+@timed("storage.reserve_nonces")
+def reserve_nonces(count: int) -> int:
+    """Reserve `count` assertion nonces; returns the first of the block.
+
+    The high-water mark is persisted and bumped under an IMMEDIATE
+    transaction, so blocks are disjoint across processes and never reused
+    after a restart (unused nonces in a block are simply skipped).
+    """
+    if count < 1:
+        raise ValueError(f"count must be >= 1, got {count}")
+    conn = get_db()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("UPDATE nonce_state SET high_water = high_water + ? WHERE id = 0", (count,))
+        high = conn.execute("SELECT high_water FROM nonce_state WHERE id = 0").fetchone()[0]
+        conn.commit()
+    finally:
+        conn.close()
+    return high - count + 1
+
+
+@timed("storage.claim_replay_key")
+def claim_replay_key(key: str, expires_at: int) -> bool:
+    """Record a verified assertion key. False if a live entry already exists (replay)."""
+    conn = get_db()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        # An expired leftover does not count; replace it
+        conn.execute("DELETE FROM replay_keys WHERE key = ? AND expires_at < ?", (key, int(time.time())))
+        cur = conn.execute("INSERT OR IGNORE INTO replay_keys (key, expires_at) VALUES (?, ?)", (key, expires_at))
+        conn.commit()
+    finally:
+        conn.close()
+    return cur.rowcount == 1
+
+
+@timed("storage.purge_replay_keys")
+def purge_replay_keys(now: int) -> int:
+    """Delete replay keys that expired before `now`. Returns rows removed."""
+    conn = get_db()
+    try:
+        cur = conn.execute("DELETE FROM replay_keys WHERE expires_at < ?", (now,))
+        conn.commit()
+    finally:
+        conn.close()
+    return cur.rowcount
+
+
+@timed("storage.log_audit")
 def log_audit(session_id: str, tool_name: str, action: str, detail: str = ""):
     """Write audit trail entry."""
-    conn = get_db()
+    log_audit_many([(session_id, tool_name, action, detail)])
+
+
+@timed("storage.log_audit_many")
+def log_audit_many(entries: list[tuple[str, str, str, str]]):
+    """Write several (session_id, tool_name, action, detail) entries, one transaction per shard."""
+    if not entries:
+        return
+    now = _now()
+    by_path: dict[Path, list[tuple]] = {}
+    for entry in entries:
+        by_path.setdefault(path_for(entry[0]), []).append((*entry, now))
+    for path, rows in by_path.items():
+        conn = get_db(path)
+        try:
+            conn.executemany(
+                "INSERT INTO audit_log (session_id, tool_name, action, detail, created_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+# ── Audit Queries ─────────────────────────────────────────
+
+
+def _audit_where(
+    session_id: str | None,
+    since: str | None,
+    until: str | None,
+    tool_name: str | None,
+    action: str | None,
+    tenant: str | None = None,
+) -> tuple[str, list[str]]:
+    """SQL fragment (" AND ...") and params for the audit filters that are set.
+
+    `tenant` keeps rows of that tenant's sessions (a session and its audit
+    rows live in the same shard).
+    """
+    filters = (
+        ("session_id = ?", session_id),
+        ("session_id IN (SELECT id FROM sessions WHERE tenant = ?)", tenant),
+        ("tool_name = ?", tool_name),
+        ("action = ?", action),
+        ("created_at >= ?", since),
+        ("created_at < ?", until),
+    )
+    set_filters = [(clause, value) for clause, value in filters if value is not None]
+    return "".join(f" AND {clause}" for clause, _ in set_filters), [value for _, value in set_filters]
+
+
+def _audit_shards(session_id: str | None) -> list[Path]:
+    return [path_for(session_id)] if session_id is not None else shard_paths()
+
+
+def _audit_page(path: Path, where: str, params: list[str], after_id: int, limit: int) -> list[dict]:
+    conn = get_db(path)
+    try:
+        rows = conn.execute(
+            f"SELECT * FROM audit_log WHERE id > ?{where} ORDER BY id LIMIT ?", (after_id, *params, limit)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(r) for r in rows]
+
+
+@timed("storage.query_audit")
+def query_audit(
+    session_id: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    *,
+    tool_name: str | None = None,
+    action: str | None = None,
+    tenant: str | None = None,
+    after_id: int = 0,
+    limit: int = 100,
+) -> dict:
+    """One page of audit entries in id order.
+
+    since/until are ISO timestamps (inclusive / exclusive). Pass the returned
+    next_cursor as after_id to get the next page; it is None on the last one.
+    Pages are keyset queries on id, so deep pages cost the same as the first.
+    Audit ids are unique across shards; each shard contributes up to `limit`
+    rows and the merged page keeps the lowest ids.
+    """
+    if limit < 1:
+        raise ValueError(f"limit must be >= 1, got {limit}")
+    where, params = _audit_where(session_id, since, until, tool_name, action, tenant)
+    pages = [_audit_page(path, where, params, after_id, limit) for path in _audit_shards(session_id)]
+    entries = list(itertools.islice(heapq.merge(*pages, key=lambda r: r["id"]), limit))
+    return {"entries": entries, "next_cursor": entries[-1]["id"] if len(entries) == limit else None}
+
+
+def iter_audit(
+    session_id: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    batch_size: int = 1000,
+    *,
+    tool_name: str | None = None,
+    action: str | None = None,
+    tenant: str | None = None,
+    after_id: int = 0,
+    shard: Path | None = None,
+) -> Iterator[dict]:
+    """Yield audit rows in id order, reading `batch_size` rows per query.
+
+    Memory stays constant however large the log. Each batch is a keyset
+    query on its own short-lived connection, so a slow consumer never pins
+    a read snapshot (which would block WAL checkpoints). Without `shard`,
+    every shard is read and the streams merged by id. With `tenant`, only
+    rows of that tenant's sessions are returned.
+    """
+    where, params = _audit_where(session_id, since, until, tool_name, action, tenant)
+    paths = [shard] if shard is not None else _audit_shards(session_id)
+    streams = [_iter_shard_audit(path, where, params, after_id, batch_size) for path in paths]
+    yield from streams[0] if len(streams) == 1 else heapq.merge(*streams, key=lambda r: r["id"])
+
+
+def tenant_session_ids(tenant: str, shard: Path) -> set[str]:
+    """Ids of the tenant's sessions stored in `shard` (for filtering archived audit rows)."""
+    conn = get_db(shard)
+    try:
+        return {row[0] for row in conn.execute("SELECT id FROM sessions WHERE tenant = ?", (tenant,))}
+    finally:
+        conn.close()
+
+
+def _iter_shard_audit(path: Path, where: str, params: list[str], after_id: int, batch_size: int) -> Iterator[dict]:
+    while True:
+        rows = _audit_page(path, where, params, after_id, batch_size)
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        after_id = rows[-1]["id"]
+
+
+# ── Audit Retention ───────────────────────────────────────
+
+
+@timed("storage.audit_retention_cutoff")
+def audit_retention_cutoff(before: str | None = None, keep_rows: int = 0, shard: Path | None = None) -> int:
+    """Highest audit id due for archival in `shard` (default: home), or 0.
+
+    A row is due if it was created before the ISO timestamp `before` or is
+    older than the newest `keep_rows` rows of that shard (0 disables that policy).
+    """
+    conn = get_db(shard)
     try:
+        cutoff = 0
+        if before:
+            cutoff = conn.execute("SELECT MAX(id) FROM audit_log WHERE created_at < ?", (before,)).fetchone()[0] or 0
+        if keep_rows > 0:
+            row = conn.execute("SELECT id FROM audit_log ORDER BY id DESC LIMIT 1 OFFSET ?", (keep_rows,)).fetchone()
+            if row:
+                cutoff = max(cutoff, row[0])
+    finally:
+        conn.close()
+    return cutoff
+
+
+@timed("storage.fetch_audit_range")
+def fetch_audit_range(after_id: int, through_id: int, limit: int = 1000, shard: Path | None = None) -> list[dict]:
+    """Up to `limit` audit rows with after_id < id <= through_id, in id order."""
+    conn = get_db(shard)
+    try:
+        rows = conn.execute(
+            "SELECT * FROM audit_log WHERE id > ? AND id <= ? ORDER BY id LIMIT ?", (after_id, through_id, limit)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(r) for r in rows]
+
+
+@timed("storage.delete_audit_range")
+def delete_audit_range(after_id: int, through_id: int, shard: Path | None = None) -> int:
+    """Delete audit rows with after_id < id <= through_id. Returns rows removed."""
+    conn = get_db(shard)
+    try:
+        cur = conn.execute("DELETE FROM audit_log WHERE id > ? AND id <= ?", (after_id, through_id))
+        conn.commit()
+    finally:
+        conn.close()
+    return cur.rowcount
+
+
+@timed("storage.compact_db")
+def compact_db(vacuum_ratio: float = 0.25, shard: Path | None = None) -> dict:
+    """Checkpoint the WAL and VACUUM once free pages reach `vacuum_ratio` of the file.
+
+    VACUUM rewrites the whole database and blocks writers while it runs, so
+    it is only worth it after large deletes (e.g. audit archival).
+    """
+    conn = get_db(shard)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        pages = conn.execute("PRAGMA page_count").fetchone()[0]
+        vacuumed = bool(pages) and free / pages >= vacuum_ratio
+        if vacuumed:
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+    return {"free_pages": free, "pages": pages, "vacuumed": vacuumed}
+
+
+# ── Rebalancing ───────────────────────────────────────────
+
+
+def shard_files() -> list[Path]:
+    """shard_paths() plus leftover shard files on disk (e.g. after lowering DRAFT_DB_SHARDS)."""
+    paths = shard_paths()
+    home = paths[0]
+    leftovers = [
+        p
+        for p in home.parent.glob(f"{home.stem}-*{home.suffix}")
+        if p not in paths and p.stem[len(home.stem) + 1 :].isdigit()
+    ]
+    return paths + sorted(leftovers, key=lambda p: int(p.stem[len(home.stem) + 1 :]))
+
+
+@timed("storage.shard_stats")
+def shard_stats() -> list[dict]:
+    """Row counts and file size per shard file, home first."""
+    stats = []
+    for path in shard_files():
+        conn = get_db(path)
+        try:
+            sessions, open_sessions = conn.execute(
+                "SELECT COUNT(*), COUNT(*) - COUNT(closed_at) FROM sessions"
+            ).fetchone()
+            audit_rows = conn.execute("SELECT COUNT(*) FROM audit_log").fetchone()[0]
+        finally:
+            conn.close()
+        stats.append(
+            {
+                "path": str(path),
+                "sessions": sessions,
+                "open_sessions": open_sessions,
+                "audit_rows": audit_rows,
+                "bytes": path.stat().st_size,
+            }
+        )
+    return stats
+
+
+def misplaced_sessions(path: Path, limit: int = 500, after: str = "") -> list[str]:
+    """Up to `limit` session ids stored in `path` that path_for() now routes elsewhere.
+
+    Scans ids greater than `after`, so callers can walk a shard in pages.
+    """
+    found: list[str] = []
+    while len(found) < limit:
+        conn = get_db(path)
+        try:
+            ids = [r[0] for r in conn.execute("SELECT id FROM sessions WHERE id > ? ORDER BY id LIMIT 1000", (after,))]
+        finally:
+            conn.close()
+        found += [sid for sid in ids if path_for(sid) != path]
+        if len(ids) < 1000:
+            break
+        after = ids[-1]
+    return found[:limit]
+
+
+@timed("storage.move_session")
+def move_session(session_id: str, source: Path, target: Path) -> int:
+    """Move a session and its audit trail from `source` to `target`. Returns audit rows moved.
+
+    The copy lands in one target transaction (replacing a partial earlier
+    copy), then the source rows go in a second, so an interrupted move is
+    safe to repeat. Moved audit rows get new ids in the target's id range.
+    Run with servers stopped: writes routed to the target before the move
+    find no session there.
+    """
+    conn = get_db(source)
+    try:
+        session = conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        audit = conn.execute(
+            "SELECT session_id, tool_name, action, detail, created_at FROM audit_log WHERE session_id = ? ORDER BY id",
+            (session_id,),
+        ).fetchall()
+    finally:
+        conn.close()
+    if session is None:
+        raise ValueError(f"Session not found in {source}: {session_id}")
+    columns = session.keys()
+    conn = get_db(target)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM audit_log WHERE session_id = ?", (session_id,))
         conn.execute(
+            f"INSERT OR REPLACE INTO sessions ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            tuple(session),
+        )
+        conn.executemany(
             "INSERT INTO audit_log (session_id, tool_name, action, detail, created_at) VALUES (?, ?, ?, ?, ?)",
-            (session_id, tool_name, action, detail, _now()),
+            [tuple(r) for r in audit],
         )
         conn.commit()
     finally:
         conn.close()
+    conn = get_db(source)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM audit_log WHERE session_id = ?", (session_id,))
+        conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+        conn.commit()
+    finally:
+        conn.close()
+    return len(audit)
@@ -0,0 +1,237 @@
+"""Pre-fork worker pool for the REST transport.
+
+  python -m draft_protocol --transport rest --workers 4
+
+The parent initializes the database, binds the listening socket once and
+forks N workers. Each worker inherits the socket and serves it with a
+ThreadingHTTPServer; the kernel hands each accepted connection to one of
+them. Workers share nothing but the SQLite file (WAL mode + busy timeout),
+so CPU-bound work (classification, cosine math, JSON) scales past the GIL.
+
+Parent signals:
+  SIGTERM / SIGINT  — stop, let workers drain in-flight requests, exit
+  SIGHUP            — rolling restart, one worker at a time
+
+Workers that die unexpectedly are replaced, with backoff if they crash on
+start. Each worker reserves its own assertion-nonce blocks (see hmac_utils);
+the worker in slot 1 also runs background maintenance (see maintenance).
+Metrics are per process: a /metrics scrape reports the worker that served it.
+
+POSIX only (needs os.fork). Elsewhere --workers falls back to one process.
+"""
+
+import contextlib
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from draft_protocol import hmac_utils, maintenance, storage
+from draft_protocol.rest import DraftHandler, enable_default_metrics
+
+logger = logging.getLogger("draft_protocol.workers")
+
+DRAIN_TIMEOUT = 30.0
+_MIN_UPTIME = 1.0  # Dying sooner than this counts as a crash on start
+_MAX_BACKOFF = 10.0
+
+
+class _InheritedSocketServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer on a socket that is already bound and listening."""
+
+    # Non-daemon request threads: server_close() joins them, which is the drain.
+    daemon_threads = False
+    block_on_close = True
+
+    def __init__(self, sock: socket.socket, handler_cls: type):
+        super().__init__(sock.getsockname()[:2], handler_cls, bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+        self.server_name, self.server_port = sock.getsockname()[:2]
+
+
+def _worker_main(sock: socket.socket, handler_cls: type, worker_id: int, sweep: bool = False) -> None:
+    """Serve until SIGTERM, then stop accepting and finish in-flight requests."""
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    # Terminal Ctrl-C / hangup reach the whole process group; the parent decides.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    hmac_utils.configure_worker(worker_id)
+    if sweep:
+        maintenance.start_maintenance()
+
+    server = _InheritedSocketServer(sock, handler_cls)
+    thread = threading.Thread(target=server.serve_forever, name=f"draft-worker-{worker_id}", daemon=True)
+    thread.start()
+    while not stop.wait(0.5) and thread.is_alive():
+        pass
+    server.shutdown()
+    server.server_close()
+
+
+class PreforkServer:
+    """Supervises N forked REST workers sharing one listening socket."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8420,
+        workers: int = 2,
+        handler_cls: type = DraftHandler,
+        drain_timeout: float = DRAIN_TIMEOUT,
+    ):
+        if workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers}")
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.handler_cls = handler_cls
+        self.drain_timeout = drain_timeout
+        self._sock: socket.socket | None = None
+        self._children: dict[int, tuple[int, float]] = {}  # pid -> (slot, started)
+        self._pending: dict[int, float] = {}  # slot -> monotonic time to respawn
+        self._failures: dict[int, int] = {}  # slot -> consecutive crash-on-start count
+        self._next_worker_id = 0
+        self._stopping = False
+        self._reload = False
+
+    # ── Lifecycle ──
+
+    def serve(self) -> None:
+        """Bind, fork workers and supervise until SIGTERM/SIGINT."""
+        storage.init_db()  # Once, before fork: workers never race the DDL/migrations
+        storage.close_pools()  # Connections must not cross fork()
+        enable_default_metrics()
+        self._sock = socket.create_server((self.host, self.port), backlog=128)
+        self.port = self._sock.getsockname()[1]
+        previous = {
+            sig: signal.signal(sig, handler)
+            for sig, handler in (
+                (signal.SIGTERM, self._on_stop),
+                (signal.SIGINT, self._on_stop),
+                (signal.SIGHUP, self._on_reload),
+            )
+        }
+        try:
+            for slot in range(1, self.workers + 1):
+                self._spawn(slot)
+            print(f"DRAFT Protocol REST API running on http://{self.host}:{self.port} ({self.workers} workers)")
+            self._supervise()
+        finally:
+            self._shutdown()
+            self._sock.close()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def _on_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _on_reload(self, signum, frame) -> None:
+        self._reload = True
+
+    # ── Workers ──
+
+    def _spawn(self, slot: int) -> int:
+        sock = self._sock
+        if sock is None:
+            raise RuntimeError("serve() must bind the listening socket before workers are spawned")
+        self._next_worker_id += 1
+        worker_id = self._next_worker_id
+        pid = os.fork()
+        if pid == 0:  # Child: never return into the parent's stack
+            code = 0
+            try:
+                # Only slot 1 runs maintenance: one set of background tasks per pool, and
+                # the parent stays single-threaded so forking it is safe.
+                _worker_main(sock, self.handler_cls, worker_id, sweep=slot == 1)
+            except BaseException:
+                logger.exception("Worker %d crashed", worker_id)
+                code = 1
+            finally:
+                os._exit(code)
+        self._children[pid] = (slot, time.monotonic())
+        return pid
+
+    def _supervise(self) -> None:
+        while not self._stopping:
+            self._reap()
+            if self._reload:
+                self._reload = False
+                self._rolling_restart()
+            now = time.monotonic()
+            for slot, due in list(self._pending.items()):
+                if due <= now and not self._stopping:
+                    del self._pending[slot]
+                    self._spawn(slot)
+            time.sleep(0.1)
+
+    def _reap(self, retiring: set[int] | None = None) -> None:
+        """Collect exited children; schedule replacements unless retiring or stopping."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            code = os.waitstatus_to_exitcode(status)
+            slot, started = self._children.pop(pid, (None, 0.0))
+            if slot is None or self._stopping or (retiring and pid in retiring):
+                continue
+            uptime = time.monotonic() - started
+            self._failures[slot] = self._failures.get(slot, 0) + 1 if uptime < _MIN_UPTIME else 0
+            delay = min(0.1 * 2 ** self._failures[slot], _MAX_BACKOFF) if self._failures[slot] else 0.0
+            logger.warning("Worker pid %d exited (code %d) after %.1fs; restarting", pid, code, uptime)
+            self._pending[slot] = time.monotonic() + delay
+
+    def _rolling_restart(self) -> None:
+        """Replace each worker: start the new one first, then drain the old one."""
+        for pid, (slot, _) in list(self._children.items()):
+            if self._stopping:
+                return
+            self._spawn(slot)
+            self._stop_children({pid})
+
+    def _stop_children(self, pids: set[int]) -> None:
+        """SIGTERM pids, wait up to drain_timeout, then SIGKILL stragglers."""
+        for pid in pids:
+            _signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.drain_timeout
+        while time.monotonic() < deadline and self._alive(pids):
+            self._reap(retiring=pids)
+            time.sleep(0.05)
+        for pid in self._alive(pids):
+            logger.warning("Worker pid %d did not drain in %.0fs; killing", pid, self.drain_timeout)
+            _signal(pid, signal.SIGKILL)
+        while self._alive(pids):
+            self._reap(retiring=pids)
+            time.sleep(0.05)
+
+    def _alive(self, pids: set[int]) -> set[int]:
+        return pids & self._children.keys()
+
+    def _shutdown(self) -> None:
+        self._stopping = True
+        self._pending.clear()
+        if self._children:
+            self._stop_children(set(self._children))
+
+
+def _signal(pid: int, sig: int) -> None:
+    with contextlib.suppress(ProcessLookupError):
+        os.kill(pid, sig)
+
+
+def serve_prefork(host: str = "127.0.0.1", port: int = 8420, workers: int = 2) -> None:
+    """Run the REST API in `workers` processes (single process if fork is unavailable)."""
+    if not hasattr(os, "fork"):
+        from draft_protocol.rest import run_rest_server
+
+        logger.warning("os.fork unavailable on this platform; running a single REST process")
+        run_rest_server(host=host, port=port)
+        return
+    PreforkServer(host, port, workers).serve()
@@ -1,6 +1,38 @@
 """Pytest configuration for draft-protocol tests."""
 
+from collections import OrderedDict
+
+import pytest
+
 
 def pytest_configure(config):
     config.addinivalue_line("markers", "integration: requires live services")
     config.addinivalue_line("markers", "slow: long-running tests")
+
+
+@pytest.fixture
+def mock_server():
+    """A running mock LLM/embedding server (draft_protocol.mock_provider)."""
+    from draft_protocol.mock_provider import MockProviderServer
+
+    with MockProviderServer() as server:
+        yield server
+
+
+@pytest.fixture
+def use_provider(monkeypatch):
+    """use_provider(server, provider, base_suffix="") points the providers at a mock server.
+
+    Embedding caches are emptied, so each test sees the server's own vectors.
+    """
+    from draft_protocol import engine, providers
+
+    def use(server, provider, base_suffix=""):
+        monkeypatch.setattr(providers, "LLM_PROVIDER", provider)
+        monkeypatch.setattr(providers, "LLM_MODEL", "mock-llm")
+        monkeypatch.setattr(providers, "EMBED_MODEL", "mock-embed")
+        monkeypatch.setattr(providers, "API_BASE", server.url + base_suffix)
+        monkeypatch.setattr(engine, "_field_question_embeddings", {})
+        monkeypatch.setattr(engine, "_chunk_embeddings", OrderedDict())
+
+    return use
@@ -0,0 +1,89 @@
+"""Tests for audit queries and NDJSON export."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+if "DRAFT_DB_PATH" not in os.environ:
+    os.environ["DRAFT_DB_PATH"] = tempfile.mktemp(suffix=".db")
+
+import pytest
+
+from draft_protocol import maintenance, storage
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+@pytest.fixture
+def audit_db(tmp_path, monkeypatch):
+    """Fresh database with two sessions and a known audit trail."""
+    monkeypatch.setattr(storage, "DB_PATH", tmp_path / "draft.db")
+    a = storage.create_session("TASK", "a")
+    b = storage.create_session("TASK", "b")
+    storage.log_audit_many(
+        [(a, "draft_map", "map", "1"), (b, "draft_map", "map", "2"), (a, "draft_gate", "check", "3")]
+        + [(a, "draft_confirm", "confirm", str(i)) for i in range(7)]
+    )
+    yield {"a": a, "b": b, "path": tmp_path / "draft.db"}
+
+
+class TestQueryAudit:
+    def test_keyset_pages_cover_everything_once(self, audit_db):
+        seen, cursor = [], 0
+        while cursor is not None:
+            page = storage.query_audit(after_id=cursor, limit=3)
+            seen += [e["id"] for e in page["entries"]]
+            cursor = page["next_cursor"]
+        assert seen == list(range(1, 11))
+
+    def test_filters(self, audit_db):
+        by_session = storage.query_audit(session_id=audit_db["b"])["entries"]
+        assert [e["detail"] for e in by_session] == ["2"]
+        by_tool = storage.query_audit(tool_name="draft_gate")["entries"]
+        assert [e["action"] for e in by_tool] == ["check"]
+        by_action = storage.query_audit(session_id=audit_db["a"], action="confirm", limit=100)
+        assert len(by_action["entries"]) == 7 and by_action["next_cursor"] is None
+
+    def test_time_range(self, audit_db):
+        assert storage.query_audit(until="2000-01-01")["entries"] == []
+        assert len(storage.query_audit(since="2000-01-01", limit=50)["entries"]) == 10
+
+    def test_invalid_limit(self, audit_db):
+        with pytest.raises(ValueError):
+            storage.query_audit(limit=0)
+
+    def test_iter_audit_batches(self, audit_db):
+        rows = list(storage.iter_audit(batch_size=4, action="confirm", after_id=5))
+        assert [r["id"] for r in rows] == [6, 7, 8, 9, 10]
+
+
+class TestExport:
+    def test_ndjson_chunks(self, audit_db):
+        chunks = list(maintenance.iter_audit_ndjson(chunk_bytes=200, session_id=audit_db["a"]))
+        assert len(chunks) > 1
+        lines = b"".join(chunks).decode().splitlines()
+        assert len(lines) == 9
+        assert all(json.loads(line)["session_id"] == audit_db["a"] for line in lines)
+
+    def test_ndjson_includes_archive(self, audit_db, tmp_path, monkeypatch):
+        monkeypatch.setattr(maintenance, "AUDIT_ARCHIVE_DIR", tmp_path / "arc")
+        maintenance.archive_audit(retention_days=0, max_rows=4)
+        live = b"".join(maintenance.iter_audit_ndjson()).decode().splitlines()
+        everything = b"".join(maintenance.iter_audit_ndjson(include_archive=True)).decode().splitlines()
+        assert len(live) == 4
+        assert [json.loads(line)["id"] for line in everything] == list(range(1, 11))
+
+    def test_cli_export(self, audit_db, tmp_path):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(p for p in (str(SRC), env.get("PYTHONPATH", "")) if p)
+        env["DRAFT_DB_PATH"] = str(audit_db["path"])
+        out = tmp_path / "audit.ndjson"
+        subprocess.run(
+            [sys.executable, "-m", "draft_protocol", "audit", "export", "--tool", "draft_map", "-o", str(out)],
+            env=env,
+            check=True,
+        )
+        assert [json.loads(line)["detail"] for line in out.read_text().splitlines()] == ["1", "2"]
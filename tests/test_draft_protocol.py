@@ -1,7 +1,9 @@
 """Tests for DRAFT Protocol — standalone package."""
 
+import asyncio
 import os
 import tempfile
+import time
 
 import pytest
 
@@ -9,6 +11,7 @@ import pytest
 _test_db = tempfile.mktemp(suffix=".db")
 os.environ["DRAFT_DB_PATH"] = _test_db
 
+from draft_protocol import engine, providers, storage  # noqa: E402
 from draft_protocol.engine import (  # noqa: E402
     add_assumption,
     check_gate,
@@ -24,12 +27,14 @@ from draft_protocol.engine import (  # noqa: E402
 )
 from draft_protocol.storage import (  # noqa: E402
     VALID_TIERS,
+    ConcurrentModificationError,
     close_session,
     create_session,
     get_active_session,
     get_session,
     is_session_closed,
     log_audit,
+    update_session,
 )
 
 # ── Tier Classification ───────────────────────────────────
@@ -87,6 +92,56 @@ class TestTierClassification:
         assert tier in ("STANDARD", "CONSEQUENTIAL")
 
 
+_EXEMPLAR_SEED = {
+    "TASK": ["add a retry option to the upload command", "add a retry flag to the upload tool"],
+    "LOOKUP": ["what does the parser return for empty input", "what does the loader return for empty files"],
+}
+
+
+class TestExemplarClassifier:
+    @pytest.fixture(autouse=True)
+    def _index(self, monkeypatch, mock_server, use_provider):
+        use_provider(mock_server, "ollama")
+        monkeypatch.setattr(engine, "_exemplars", engine._ExemplarIndex(_EXEMPLAR_SEED))
+
+    def test_confident_vote_skips_llm(self, mock_server):
+        tier, reasoning, confidence = engine.classify_tier("add a retry option to the download command")
+        assert tier == "TASK" and reasoning.startswith("Exemplar vote") and confidence <= 0.9
+        assert mock_server.stats.get("/api/chat", 0) == 0
+        embeds = mock_server.stats["/api/embed"]  # Seed batch + the message
+        assert asyncio.run(engine.aclassify_tier("add a retry option to the download command"))[0] == "TASK"
+        assert mock_server.stats["/api/embed"] == embeds and mock_server.stats.get("/api/chat", 0) == 0
+
+    def test_close_vote_escalates_to_llm(self, monkeypatch, mock_server):
+        monkeypatch.setattr(engine, "EXEMPLAR_MIN_MARGIN", 1.01)
+        engine.classify_tier("add a retry option to the download command")
+        assert mock_server.stats["/api/chat"] == 1
+
+    def test_refresh_from_confirmed_sessions(self):
+        sid = storage.create_session("MULTI", "move every service onto the new queue client")
+        storage.update_session(sid, gate_passed=1)
+        assert ("move every service onto the new queue client", "MULTI") in storage.confirmed_tiers()
+        first = engine.refresh_tier_exemplars()
+        assert first["added"] >= 1 and first["total"] == len(engine._exemplars)
+        assert engine.refresh_tier_exemplars()["added"] == 0
+        assert engine.classify_tier("move every service onto the new queue client")[0] == "MULTI"
+
+    def test_refresh_is_tenant_scoped(self):
+        sid = storage.create_session("MULTI", "rotate the signing keys of team b", tenant="team-b")
+        storage.update_session(sid, gate_passed=1)
+        assert ("rotate the signing keys of team b", "MULTI") not in storage.confirmed_tiers()
+        assert storage.confirmed_tiers(tenant="team-b") == [("rotate the signing keys of team b", "MULTI")]
+        assert engine.refresh_tier_exemplars(tenant="team-b")["added"] == 1
+
+    def test_failed_embedding_is_not_memoized(self, monkeypatch):
+        message = "add a retry option to the download command"
+        embed = engine._embed
+        monkeypatch.setattr(engine, "_embed", lambda text, site="": [])  # Provider down
+        assert engine._exemplars.vote(message) is None
+        monkeypatch.setattr(engine, "_embed", embed)
+        assert engine._exemplars.vote(message) is not None
+
+
 # ── Session Lifecycle ─────────────────────────────────────
 
 
@@ -116,6 +171,65 @@ class TestSessionLifecycle:
         # No exception = success (audit log is write-only in this interface)
 
 
+class TestTenants:
+    def test_active_session_is_per_tenant(self):
+        alice = create_session("TASK", "alice work", tenant="alice")
+        bob = create_session("TASK", "bob work", tenant="bob")
+        default = create_session("TASK", "default work")
+        assert get_active_session("alice")["id"] == alice
+        assert get_active_session("bob")["id"] == bob
+        assert get_active_session()["id"] == default
+        close_session(bob)
+        assert get_active_session("bob") is None
+        assert get_active_session("alice")["id"] == alice
+        assert get_session(alice)["tenant"] == "alice"
+
+    def test_unknown_tenant_has_no_session(self):
+        assert get_active_session("nobody-yet") is None
+
+    @pytest.mark.parametrize("tenant", ["x" * 129, "bad\nname"])
+    def test_invalid_tenant_rejected(self, tenant):
+        with pytest.raises(ValueError, match="Invalid tenant"):
+            create_session("TASK", "x", tenant=tenant)
+
+    def test_lookup_uses_tenant_index(self):
+        from draft_protocol.storage import get_db
+
+        conn = get_db()
+        try:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM sessions WHERE tenant = ? AND closed_at IS NULL "
+                "ORDER BY created_at DESC LIMIT 1",
+                ("alice",),
+            ).fetchall()
+        finally:
+            conn.close()
+        detail = " ".join(row[-1] for row in plan)
+        assert "idx_sessions_tenant_open" in detail
+        assert "TEMP B-TREE" not in detail
+
+    def test_existing_database_migrated(self, tmp_path, monkeypatch):
+        import sqlite3
+
+        from draft_protocol import storage
+
+        db = tmp_path / "old.db"
+        conn = sqlite3.connect(db)
+        conn.execute(
+            "CREATE TABLE sessions (id TEXT PRIMARY KEY, tier TEXT NOT NULL DEFAULT 'CASUAL', intent TEXT, "
+            "provisional_interpretation TEXT, dimensions JSON NOT NULL DEFAULT '{}', "
+            "assumptions JSON NOT NULL DEFAULT '[]', gate_passed INTEGER NOT NULL DEFAULT 0, "
+            "review_done INTEGER NOT NULL DEFAULT 0, review_notes TEXT, created_at TEXT NOT NULL, "
+            "updated_at TEXT NOT NULL, closed_at TEXT)"
+        )
+        conn.execute("INSERT INTO sessions (id, tier, created_at, updated_at) VALUES ('old', 'TASK', ?, ?)", ("9", "9"))
+        conn.commit()
+        conn.close()
+        monkeypatch.setattr(storage, "DB_PATH", db)
+        assert storage.get_session("old")["tenant"] == ""
+        assert storage.get_session("old")["version"] == 0
+
+
 # ── Dimension Mapping ─────────────────────────────────────
 
 
@@ -157,6 +271,99 @@ class TestDimensionMapping:
                 assert 0.0 <= info.get("confidence", 0.5) <= 1.0
 
 
+class TestIncrementalMapping:
+    """Re-mapping reuses assessments whose context window is unchanged."""
+
+    # Longer than the LLM field window, so appended paragraphs fall outside it
+    BASE = "Build a tool. d1 is covered here.\n\n" + "background " * 250
+
+    @pytest.fixture
+    def assessor(self, monkeypatch):
+        from draft_protocol import engine
+
+        calls = []
+
+        def fake_assess(field_key, question, text):
+            calls.append((field_key, text))
+            status = "SATISFIED" if field_key.lower() in text.lower() else "MISSING"
+            return {"status": status, "confidence": 0.9, "extracted": field_key}
+
+        monkeypatch.setattr(engine, "_llm_available", lambda: True)
+        monkeypatch.setattr(engine, "_screen_dimension_llm", engine._context_suggests_applicable)
+        monkeypatch.setattr(engine, "_assess_field_llm", fake_assess)
+        return calls
+
+    def test_same_context_reassesses_nothing(self, assessor):
+        sid = create_session("STANDARD", "test")
+        map_dimensions(sid, self.BASE)
+        assert assessor
+        assessor.clear()
+        map_dimensions(sid, self.BASE)
+        assert assessor == []
+
+    def test_appended_paragraph_only_checks_open_fields(self, assessor):
+        sid = create_session("STANDARD", "test")
+        map_dimensions(sid, self.BASE)
+        assessor.clear()
+        dims = map_dimensions(sid, self.BASE + "\n\nAnswers: t1 and t2.")
+        assert {text for _, text in assessor} == {"Answers: t1 and t2."}
+        assert "D1" not in {fk for fk, _ in assessor}  # Already SATISFIED
+        assert dims["T"]["T1"]["status"] == dims["T"]["T2"]["status"] == "SATISFIED"
+        assert dims["D"]["D1"]["status"] == "SATISFIED"
+        assert dims["T"]["T3"]["status"] == "MISSING"
+
+    def test_edited_window_reassesses_in_full(self, assessor):
+        sid = create_session("STANDARD", "test")
+        map_dimensions(sid, self.BASE)
+        confirm_field(sid, "D2", "Developer tooling")
+        assessor.clear()
+        map_dimensions(sid, self.BASE.replace("Build a tool", "Build a service"))
+        fields = {fk for fk, _ in assessor}
+        assert "D1" in fields and "D2" not in fields  # Confirmed fields are never reassessed
+        assert all(text.startswith("Build a service") for _, text in assessor)
+
+    def test_screened_dimension_reopens_on_new_paragraph(self, assessor):
+        sid = create_session("STANDARD", "test")
+        dims = map_dimensions(sid, self.BASE)
+        assert dims["R"].get("_screened")
+        dims = map_dimensions(sid, self.BASE + "\n\nOnly the lead has authority; r1 decides.")
+        assert not dims["R"].get("_screened")
+        assert dims["R"]["R1"]["status"] == "SATISFIED"
+
+    def test_fingerprints_stay_out_of_dimensions(self, assessor):
+        sid = create_session("STANDARD", "test")
+        dims = map_dimensions(sid, self.BASE)
+        assert "_ctx" not in str(dims) and "context_fp" not in str(dims)
+        assert get_session(sid)["context_fps"]["D1"]
+
+
+class TestKeywordIndex:
+    """The compiled index agrees with plain `keyword in text.lower()` checks."""
+
+    TEXTS = (
+        "Build a tool; failure is not about the FAILS of the old service.",
+        "Forbidden output: never output secrets. Can modify the API if the data is invalid.",
+        "A revolutionary, groundbreaking and truly unique paradigm-shifting engine.",
+        "",
+    )
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_matches_substring_semantics(self, text):
+        from draft_protocol import engine
+
+        found = engine._keywords().scan(text)
+        for group, terms in engine._keywords().groups.items():
+            assert engine._keywords().hits(found, group) == [t for t in terms if t in text.lower()], group
+
+    def test_overlapping_and_prefix_terms(self):
+        from draft_protocol import engine
+
+        found = engine._keywords().scan("the failure")
+        assert {"fail", "failure"} <= found  # Same start position
+        assert engine._keywords().hits(engine._keywords().scan("xcannot changex"), "F3") == ["cannot change"]
+        assert "cannot" in engine._keywords().scan("xcannot changex")
+
+
 # ── Field Confirmation ────────────────────────────────────
 
 
@@ -193,6 +400,73 @@ class TestFieldConfirmation:
         assert session["dimensions"]["D"]["D1"]["status"] == "CONFIRMED"
 
 
+class TestOptimisticConcurrency:
+    def test_updates_bump_version(self):
+        sid = create_session("STANDARD", "test")
+        assert get_session(sid)["version"] == 0
+        update_session(sid, intent="changed")
+        assert update_session(sid, expected_version=1, intent="again") == 2
+
+    def test_stale_version_is_rejected(self):
+        sid = create_session("STANDARD", "test")
+        update_session(sid, expected_version=0, intent="first")
+        with pytest.raises(ConcurrentModificationError):
+            update_session(sid, expected_version=0, intent="lost update")
+        assert get_session(sid)["intent"] == "first"
+
+    def test_parallel_confirms_all_land(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        sid = create_session("STANDARD", "test")
+        map_dimensions(sid, "Build a tool")
+        fields = ["D1", "D2", "D3", "D4", "D5", "T1", "T2", "T3", "T4"]
+        with ThreadPoolExecutor(max_workers=len(fields)) as pool:
+            results = list(pool.map(lambda fk: confirm_field(sid, fk, f"Answer for {fk}"), fields))
+        assert all(r["status"] == "CONFIRMED" for r in results)
+        dims = get_session(sid)["dimensions"]
+        assert all(dims[fk[0]][fk]["extracted"] == f"Answer for {fk}" for fk in fields)
+
+    def test_retries_are_bounded(self, monkeypatch):
+        from draft_protocol import engine, storage
+
+        sid = create_session("STANDARD", "test")
+        map_dimensions(sid, "Build a tool")
+        calls = []
+
+        def always_stale(session_id, expected_version=None, **kwargs):
+            calls.append(expected_version)
+            raise ConcurrentModificationError(session_id, expected_version)
+
+        monkeypatch.setattr(storage, "update_session", always_stale)
+        with pytest.raises(ConcurrentModificationError):
+            confirm_field(sid, "D1", "A CLI tool")
+        assert len(calls) == engine._CAS_ATTEMPTS
+
+    def test_missing_session_is_not_a_conflict(self):
+        with pytest.raises(ValueError, match="not found"):
+            update_session("no-such-session", expected_version=0, intent="x")
+
+    def test_override_retry_does_not_repeat_gate_check(self, monkeypatch):
+        from draft_protocol import storage
+
+        sid = create_session("STANDARD", "test")
+        map_dimensions(sid, "Build a tool")
+        real_update = storage.update_session
+        conflicts = [1, 1]
+
+        def flaky_update(session_id, expected_version=None, **kwargs):
+            if conflicts:
+                conflicts.pop()
+                raise ConcurrentModificationError(session_id, expected_version)
+            return real_update(session_id, expected_version, **kwargs)
+
+        monkeypatch.setattr(storage, "update_session", flaky_update)
+        assert override_gate(sid, "Proceeding with known gaps")["status"] == "OVERRIDDEN"
+        actions = [e["action"] for e in storage.query_audit(sid, limit=50)["entries"]]
+        assert actions.count("gate_check") == 1
+        assert actions.count("OVERRIDDEN") == 1
+
+
 # ── Gate ──────────────────────────────────────────────────
 
 
@@ -261,6 +535,49 @@ class TestAssumptions:
         result = add_assumption(sid, "", "manual")
         assert "error" in result
 
+    @pytest.fixture
+    def claims(self, monkeypatch):
+        """An LLM that answers every assumption prompt with a new claim."""
+        sent = []
+
+        def fake_chat(prompt, schema, timeout=30, site=""):
+            if schema is not engine._ASSUMPTION_SCHEMA:
+                return None
+            sent.append(prompt)
+            return {"claim": f"claim number {len(sent)}", "falsifier": "if it is not", "impact": "high"}
+
+        monkeypatch.setattr(engine, "_llm_available", lambda: True)
+        monkeypatch.setattr(providers, "chat", fake_chat)
+        return sent
+
+    def test_repeated_prompt_gets_distinct_claims(self, claims):
+        from draft_protocol.engine import run_pipeline
+
+        sid = create_session("STANDARD", "Build a tool")
+        map_dimensions(sid, "Build a tool")
+        claims_of = [a["claim"] for a in generate_assumptions(sid) if a["source"] == "llm_adversarial"]
+        assert len(claims_of) > 1 and len(set(claims_of)) == len(claims_of)
+        claims.clear()
+        result = run_pipeline("Build a tool", "Build a tool", until="assumptions", tier_override="STANDARD")
+        assert [a["claim"] for a in result["assumptions"] if a["source"] == "llm_adversarial"] == claims_of
+
+    def test_conflict_rerun_replays_claims(self, claims, monkeypatch):
+        sid = create_session("STANDARD", "Build a tool")
+        map_dimensions(sid, "Build a tool")
+        real_update = storage.update_session
+        conflicts = [1]
+
+        def flaky_update(session_id, expected_version=None, **kwargs):
+            if conflicts:
+                conflicts.pop()
+                raise ConcurrentModificationError(session_id, expected_version)
+            return real_update(session_id, expected_version, **kwargs)
+
+        monkeypatch.setattr(storage, "update_session", flaky_update)
+        generated = [a["claim"] for a in generate_assumptions(sid) if a["source"] == "llm_adversarial"]
+        assert not conflicts
+        assert generated == [f"claim number {n}" for n in range(1, len(claims) + 1)]
+
 
 # ── Unscreen ──────────────────────────────────────────────
 
@@ -333,6 +650,161 @@ class TestElicitation:
             assert "question" in q
 
 
+class TestStreamingElicitation:
+    CONTEXT = "Build a CSV parser that rejects malformed rows.\n\nSuccess means every test passes."
+
+    def _mapped(self):
+        sid = storage.create_session("TASK", "Build a CSV parser")
+        engine.map_dimensions(sid, self.CONTEXT)
+        return sid
+
+    def test_questions_first_then_parallel_suggestions(self, monkeypatch, mock_server, use_provider):
+        use_provider(mock_server, "ollama")
+        monkeypatch.setattr(engine, "ELICIT_CONCURRENCY", 8)
+        sid = self._mapped()
+        expected = engine.generate_elicitation(sid)
+        assert len(expected) > 2
+
+        mock_server.latency_ms = 100
+        started = time.perf_counter()
+        events = engine.iter_elicitation(sid)
+        first = next(events)
+        first_at = time.perf_counter() - started
+        rest = list(events)
+        total = time.perf_counter() - started
+
+        assert first["event"] == "question" and first["pending"] and first_at < 0.1
+        kinds = [first["event"]] + [e["event"] for e in rest]
+        assert kinds == ["question"] * len(expected) + ["suggestion"] * len(expected) + ["done"]
+        assert total < 0.1 * len(expected)  # Suggestions are fetched concurrently
+        suggestions = {e["index"]: e["suggestion"] for e in rest if e["event"] == "suggestion"}
+        assert [suggestions[i] for i in range(len(expected))] == [q["suggestion"] for q in expected]
+
+    def test_async_iterator_and_errors(self, mock_server, use_provider):
+        use_provider(mock_server, "ollama")
+        sid = self._mapped()
+
+        async def collect(session_id):
+            return [event async for event in engine.aiter_elicitation(session_id)]
+
+        def by_index(events):  # Suggestions arrive in completion order
+            return sorted(events, key=lambda e: (e["event"], e.get("index", 0)))
+
+        assert by_index(asyncio.run(collect(sid))) == by_index(engine.iter_elicitation(sid))
+        assert next(engine.iter_elicitation("missing"))["event"] == "error"
+        storage.close_session(sid)
+        assert [e["event"] for e in asyncio.run(collect(sid))] == ["error"]
+
+
+# ── Pipeline ──────────────────────────────────────────────
+
+
+class TestPipeline:
+    MESSAGE = "Build a governance engine for tool calls across multiple services"
+    # Evaluative words trigger the sycophancy assumption during mapping
+    CONTEXT = (
+        "Build a revolutionary, groundbreaking, truly unique engine. It accepts input data files and "
+        "produces an output report. Success means all tests pass; failure is any error."
+    )
+
+    def test_matches_stepwise_calls(self):
+        from draft_protocol.engine import open_elicitation, run_pipeline
+        from draft_protocol.storage import iter_audit
+
+        result = run_pipeline(self.MESSAGE, self.CONTEXT, until="assumptions", tenant="pipe")
+        sid = create_session(result["tier"], self.MESSAGE, "step")
+        open_elicitation(sid)
+        dims = map_dimensions(sid, self.CONTEXT)
+        questions = generate_elicitation(sid)
+        assumptions = generate_assumptions(sid)
+
+        assert result["stages"] == ["intake", "open_elicit", "map", "elicit", "assumptions"]
+        assert result["dimensions"] == dims
+        assert result["questions"] == questions
+        assert [{k: v for k, v in a.items() if k != "index"} for a in result["assumptions"]] == assumptions
+        saved = get_session(result["session_id"])
+        assert saved["dimensions"] == dims and saved["assumptions"] == assumptions
+        stepwise = [(r["tool_name"], r["action"]) for r in iter_audit(sid)]
+        piped = [(r["tool_name"], r["action"]) for r in iter_audit(result["session_id"])]
+        assert piped == [("draft_intake", "session_created"), *stepwise]
+        assert ("draft_map", "sycophancy_screen") in piped
+
+    def test_writes_once(self, monkeypatch):
+        from draft_protocol import storage
+        from draft_protocol.engine import run_pipeline
+
+        def no_write(*args, **kwargs):
+            raise AssertionError("pipeline stages must not write")
+
+        previous = run_pipeline(self.MESSAGE, until="intake", tenant="write-once")["session_id"]
+        monkeypatch.setattr(storage, "update_session", no_write)
+        monkeypatch.setattr(storage, "log_audit_many", no_write)
+        monkeypatch.setattr(storage, "close_session", no_write)
+        result = run_pipeline(self.MESSAGE, self.CONTEXT, tenant="write-once")
+        assert result["questions"] and "assumptions" not in result
+        assert get_session(result["session_id"])["context_segments"]
+        assert get_session(previous)["closed_at"]  # Closed in the create_session transaction
+
+    def test_until_intake_and_invalid_stage(self):
+        from draft_protocol.engine import run_pipeline
+
+        first = run_pipeline(self.MESSAGE, until="intake", tenant="short")
+        assert first["stages"] == ["intake"] and "dimensions" not in first
+        second = run_pipeline(self.MESSAGE, until="intake", tenant="short")
+        assert is_session_closed(first["session_id"])  # Same tenant: previous session closed
+        assert get_active_session("short")["id"] == second["session_id"]
+        assert "error" in run_pipeline(self.MESSAGE, until="gate")
+        assert "error" in run_pipeline("   ")
+
+
+# ── Async API ─────────────────────────────────────────────
+
+
+class TestAsyncEngine:
+    CONTEXT = "Build a CSV parser that rejects malformed rows.\n\nSuccess means every test passes."
+
+    def _pair(self):
+        return [storage.create_session("TASK", "Build a CSV parser") for _ in range(2)]
+
+    def test_amap_matches_map_and_fetches_ahead(self, monkeypatch, mock_server, use_provider):
+        use_provider(mock_server, "ollama")
+        sync_sid, async_sid = self._pair()
+        expected = engine.map_dimensions(sync_sid, self.CONTEXT)
+        calls = mock_server.stats["/api/chat"]
+        monkeypatch.setattr(providers, "chat", lambda *a, **k: pytest.fail("sync provider call"))
+        assert asyncio.run(engine.amap_dimensions(async_sid, self.CONTEXT)) == expected
+        assert mock_server.stats["/api/chat"] == 2 * calls
+        assert asyncio.run(engine.agenerate_elicitation(async_sid))
+        assert asyncio.run(engine.agenerate_assumptions(async_sid))
+
+    def test_amap_embedding_mode_warms_cache_in_one_batch(self, monkeypatch, mock_server, use_provider):
+        use_provider(mock_server, "ollama")
+        monkeypatch.setattr(providers, "LLM_MODEL", "")
+        sync_sid, async_sid = self._pair()
+        expected = engine.map_dimensions(sync_sid, self.CONTEXT)
+        use_provider(mock_server, "ollama")
+        monkeypatch.setattr(providers, "LLM_MODEL", "")
+        before = mock_server.stats["/api/embed"]
+        assert asyncio.run(engine.amap_dimensions(async_sid, self.CONTEXT)) == expected
+        assert mock_server.stats["/api/embed"] == before + 1
+
+    def test_agenerate_assumptions_matches_sync(self, mock_server, use_provider):
+        use_provider(mock_server, "ollama")
+        sync_sid, async_sid = self._pair()
+        for sid in (sync_sid, async_sid):
+            engine.map_dimensions(sid, self.CONTEXT)
+        assert asyncio.run(engine.agenerate_assumptions(async_sid)) == engine.generate_assumptions(sync_sid)
+        assert asyncio.run(engine.acheck_gate(async_sid)) == engine.check_gate(sync_sid)
+
+    def test_aclassify_and_closed_session(self, mock_server, use_provider):
+        use_provider(mock_server, "ollama")
+        message = "please make the thing nicer somehow"
+        assert asyncio.run(engine.aclassify_tier(message)) == engine.classify_tier(message)
+        sid = storage.create_session("TASK", "x")
+        storage.close_session(sid)
+        assert "error" in asyncio.run(engine.amap_dimensions(sid, self.CONTEXT))
+
+
 # ── Provider Configuration ────────────────────────────────
 
 
@@ -0,0 +1,304 @@
+"""Tests for HMAC assertion signing, verification and nonce allocation."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+if "DRAFT_DB_PATH" not in os.environ:
+    os.environ["DRAFT_DB_PATH"] = tempfile.mktemp(suffix=".db")
+
+import pytest
+
+from draft_protocol import hmac_utils, storage
+from draft_protocol.hmac_utils import NonceAllocator
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+def _counting_reserve():
+    calls = []
+    state = {"high": 0}
+
+    def reserve(count):
+        calls.append(count)
+        state["high"] += count
+        return state["high"] - count + 1
+
+    return reserve, calls
+
+
+def _sign_in_subprocess(db_path: str, count: int) -> list[int]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(SRC), env.get("PYTHONPATH", "")) if p)
+    env["DRAFT_DB_PATH"] = db_path
+    env["DRAFT_DEV_MODE"] = "1"
+    code = (
+        "import json\n"
+        "from draft_protocol.hmac_utils import sign_assertion\n"
+        f"print(json.dumps([sign_assertion('t', {{}})['nonce'] for _ in range({count})]))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+class TestNonceAllocator:
+    def test_reserves_one_block_per_block_size(self):
+        reserve, calls = _counting_reserve()
+        alloc = NonceAllocator(reserve, block_size=4)
+        assert [alloc.next() for _ in range(10)] == list(range(1, 11))
+        assert calls == [4, 4, 4]
+
+    def test_thread_safe_and_unique(self):
+        reserve, _ = _counting_reserve()
+        alloc = NonceAllocator(reserve, block_size=16)
+        seen: list[int] = []
+
+        def work():
+            seen.extend(alloc.next() for _ in range(500))
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(seen) == len(set(seen)) == 4000
+
+    def test_reset_skips_rest_of_block(self):
+        reserve, _ = _counting_reserve()
+        alloc = NonceAllocator(reserve, block_size=100)
+        assert alloc.next() == 1
+        alloc.reset()
+        assert alloc.next() == 101
+
+    def test_invalid_block_size(self):
+        with pytest.raises(ValueError):
+            NonceAllocator(lambda n: 1, block_size=0)
+
+
+class TestPersistedNonces:
+    def test_storage_blocks_are_disjoint_and_increasing(self):
+        a = storage.reserve_nonces(10)
+        b = storage.reserve_nonces(10)
+        assert b == a + 10
+
+    def test_reserve_rejects_non_positive(self):
+        with pytest.raises(ValueError):
+            storage.reserve_nonces(0)
+
+    def test_signed_nonces_increase(self):
+        first = hmac_utils.sign_assertion("t", {})["nonce"]
+        second = hmac_utils.sign_assertion("t", {})["nonce"]
+        assert second > first
+
+    def test_monotonic_across_restarts_and_processes(self):
+        db_path = os.path.join(tempfile.mkdtemp(), "draft.db")
+        first = _sign_in_subprocess(db_path, 3)
+        second = _sign_in_subprocess(db_path, 3)
+        assert first == sorted(first) and second == sorted(second)
+        assert min(second) > max(first)
+
+    def test_configure_worker_drops_inherited_block(self, monkeypatch):
+        reserve, calls = _counting_reserve()
+        monkeypatch.setattr(hmac_utils, "_nonce_allocator", NonceAllocator(reserve, block_size=50))
+        parent = hmac_utils._next_nonce()
+        hmac_utils.configure_worker(1)
+        child = hmac_utils._next_nonce()
+        assert (parent, child) == (1, 51)
+        assert calls == [50, 50]
+
+    def test_negative_worker_id_rejected(self):
+        with pytest.raises(ValueError):
+            hmac_utils.configure_worker(-1)
+
+
+class TestSignVerify:
+    def test_round_trip(self):
+        signed = hmac_utils.sign_assertion("draft_gate_passed", {"session_id": "abc"})
+        assert hmac_utils.verify_assertion(signed) == {
+            "valid": True,
+            "type": "draft_gate_passed",
+            "payload": {"session_id": "abc"},
+        }
+
+    def test_tampered_payload_rejected(self):
+        signed = hmac_utils.sign_assertion("draft_gate_passed", {"session_id": "abc"})
+        signed["payload"]["session_id"] = "xyz"
+        assert hmac_utils.verify_assertion(signed)["valid"] is False
+
+    def test_legacy_gate_pass(self):
+        sig = hmac_utils.sign_gate_pass("sid")
+        assert hmac_utils.verify_gate_pass("sid", sig)
+        assert not hmac_utils.verify_gate_pass("other", sig)
+
+
+class TestReplayProtection:
+    def test_without_cache_replays_pass(self):
+        signed = hmac_utils.sign_assertion("t", {"n": 1})
+        assert hmac_utils.verify_assertion(signed)["valid"]
+        assert hmac_utils.verify_assertion(signed)["valid"]
+
+    @pytest.mark.parametrize("cache_cls", [hmac_utils.ReplayCache, hmac_utils.SharedReplayCache])
+    def test_second_use_rejected(self, cache_cls):
+        cache = cache_cls()
+        signed = hmac_utils.sign_assertion("t", {"n": 1})
+        assert hmac_utils.verify_assertion(signed, replay_cache=cache)["valid"]
+        result = hmac_utils.verify_assertion(signed, replay_cache=cache)
+        assert result["valid"] is False and "Replay" in result["reason"]
+        other = hmac_utils.sign_assertion("t", {"n": 1})
+        assert hmac_utils.verify_assertion(other, replay_cache=cache)["valid"]
+
+    def test_forged_assertion_not_cached(self):
+        cache = hmac_utils.ReplayCache()
+        signed = hmac_utils.sign_assertion("t", {})
+        hmac_utils.verify_assertion({**signed, "hmac": "0" * 64}, replay_cache=cache)
+        assert len(cache) == 0
+        assert hmac_utils.verify_assertion(signed, replay_cache=cache)["valid"]
+
+    def test_entries_expire_by_bucket(self, monkeypatch):
+        now = [1_000_000]
+        monkeypatch.setattr(hmac_utils.time, "time", lambda: now[0])
+        cache = hmac_utils.ReplayCache(bucket_seconds=10)
+        assert cache.seen(("t", "1", "sig"), now[0] + 300) is False
+        now[0] += 299
+        assert cache.seen(("t", "1", "sig"), now[0] + 300) is True
+        now[0] += 20
+        assert len(cache) == 1 and cache.seen(("t", "2", "sig"), now[0] + 300) is False
+        assert len(cache) == 1  # the first key expired
+
+    def test_full_cache_fails_closed(self):
+        cache = hmac_utils.ReplayCache(max_entries=2)
+        expires = int(time.time()) + 300
+        assert not cache.seen(("t", "1", "a"), expires)
+        assert not cache.seen(("t", "2", "b"), expires)
+        assert cache.seen(("t", "3", "c"), expires)
+
+    def test_shared_cache_across_instances(self):
+        signed = hmac_utils.sign_assertion("t", {"shared": True})
+        assert hmac_utils.verify_assertion(signed, replay_cache=hmac_utils.SharedReplayCache())["valid"]
+        assert not hmac_utils.verify_assertion(signed, replay_cache=hmac_utils.SharedReplayCache())["valid"]
+
+    def test_shared_expired_key_can_be_reclaimed(self):
+        past = int(time.time()) - 1
+        assert storage.claim_replay_key("t|expired|sig", past)
+        assert storage.claim_replay_key("t|expired|sig", past + 600)
+        assert not storage.claim_replay_key("t|expired|sig", past + 600)
+        assert storage.purge_replay_keys(past + 601) >= 1
+
+
+@pytest.fixture
+def keyenv(monkeypatch):
+    """Isolated key configuration; reloads the key ring around the test."""
+    for name in ("GATE_HMAC_SECRET", "GATE_HMAC_KEYS", "GATE_HMAC_ACTIVE_KID", "VECTORLAB_ROOT"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(hmac_utils, "_ENV_FILE_CHECK_INTERVAL", 0.0)
+    hmac_utils.reload_keys()
+    yield monkeypatch
+    hmac_utils.reload_keys()
+
+
+class TestKeyRing:
+    def test_keys_loaded_once(self, keyenv):
+        calls = []
+        real = hmac_utils._load_keyring
+        keyenv.setattr(hmac_utils, "_load_keyring", lambda: calls.append(1) or real())
+        for _ in range(5):
+            hmac_utils.verify_assertion(hmac_utils.sign_assertion("t", {}))
+        assert len(calls) == 1
+
+    def test_env_file_reloaded_on_mtime_change(self, keyenv, tmp_path):
+        env_file = tmp_path / ".env"
+        env_file.write_text("GATE_HMAC_SECRET=first\n")
+        keyenv.setenv("VECTORLAB_ROOT", str(tmp_path))
+        signed = hmac_utils.sign_assertion("t", {})
+        env_file.write_text("GATE_HMAC_SECRET=second\n")
+        os.utime(env_file, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+        assert hmac_utils.verify_assertion(signed)["valid"] is False
+
+    def test_legacy_single_secret_has_no_kid(self, keyenv):
+        keyenv.setenv("GATE_HMAC_SECRET", "legacy")
+        assert "kid" not in hmac_utils.sign_assertion("t", {})
+
+    def test_rotation_with_key_ids(self, keyenv):
+        keyenv.setenv("GATE_HMAC_KEYS", "old:aaa")
+        old = hmac_utils.sign_assertion("t", {})
+        assert old["kid"] == "old"
+        keyenv.setenv("GATE_HMAC_KEYS", "new:bbb,old:aaa")
+        new = hmac_utils.sign_assertion("t", {})
+        assert new["kid"] == "new"
+        assert hmac_utils.verify_assertion(old)["valid"]
+        assert hmac_utils.verify_assertion(new)["valid"]
+        keyenv.setenv("GATE_HMAC_KEYS", "new:bbb")
+        assert "Unknown key id" in hmac_utils.verify_assertion(old)["reason"]
+
+    def test_active_kid_override(self, keyenv):
+        keyenv.setenv("GATE_HMAC_KEYS", "a:one,b:two")
+        keyenv.setenv("GATE_HMAC_ACTIVE_KID", "b")
+        assert hmac_utils.sign_assertion("t", {})["kid"] == "b"
+
+    def test_legacy_assertions_verify_after_adding_kids(self, keyenv):
+        keyenv.setenv("GATE_HMAC_SECRET", "legacy")
+        legacy = hmac_utils.sign_assertion("t", {})
+        gate = hmac_utils.sign_gate_pass("sid")
+        keyenv.setenv("GATE_HMAC_KEYS", "new:bbb")
+        assert hmac_utils.sign_assertion("t", {})["kid"] == "new"
+        assert hmac_utils.verify_assertion(legacy)["valid"]
+        assert hmac_utils.verify_gate_pass("sid", gate)
+
+    def test_reload_keys_forces_reload(self, keyenv):
+        keyenv.setenv("GATE_HMAC_SECRET", "x")
+        ring = hmac_utils.get_keyring()
+        assert hmac_utils.get_keyring() is ring
+        hmac_utils.reload_keys()
+        assert hmac_utils.get_keyring() is not ring
+
+    def test_missing_secret_raises(self, keyenv):
+        keyenv.delenv("DRAFT_DEV_MODE", raising=False)
+        with pytest.raises(RuntimeError, match="GATE_HMAC_SECRET"):
+            hmac_utils.sign_assertion("t", {})
+
+    def test_malformed_keys_rejected(self, keyenv):
+        keyenv.setenv("GATE_HMAC_KEYS", "no-secret-here")
+        with pytest.raises(RuntimeError, match="kid:secret"):
+            hmac_utils.get_keyring()
+
+
+class TestBulkVerify:
+    def test_results_in_order_with_counts(self):
+        signed = [hmac_utils.sign_assertion("t", {"i": i}) for i in range(5)]
+        signed[2] = {**signed[2], "payload": {"i": 99}}
+        report = hmac_utils.verify_assertions([*signed, "junk", {"type": "t"}])
+        assert (report["total"], report["valid"], report["invalid"]) == (7, 4, 3)
+        assert [r["valid"] for r in report["results"]] == [True, True, False, True, True, False, False]
+        assert report["results"][4]["payload"] == {"i": 4}
+        assert "Missing fields" in report["results"][6]["reason"]
+
+    def test_matches_single_verify(self):
+        signed = [hmac_utils.sign_assertion("t", {"i": i}) for i in range(3)]
+        stale = {**signed[0], "timestamp": 0}
+        batch = [*signed, stale]
+        assert hmac_utils.verify_assertions(batch)["results"] == [hmac_utils.verify_assertion(a) for a in batch]
+
+    def test_thread_pool_keeps_order(self):
+        signed = [hmac_utils.sign_assertion("t", {"i": i}) for i in range(50)]
+        report = hmac_utils.verify_assertions(signed, max_workers=4)
+        assert report["valid"] == 50
+        assert [r["payload"]["i"] for r in report["results"]] == list(range(50))
+
+    def test_duplicates_in_batch_caught_by_replay_cache(self):
+        signed = hmac_utils.sign_assertion("t", {})
+        report = hmac_utils.verify_assertions([signed, signed], replay_cache=hmac_utils.ReplayCache())
+        assert report["valid"] == 1
+        assert "Replay" in report["results"][1]["reason"]
+
+    def test_keys_resolved_once_per_batch(self, keyenv):
+        signed = [hmac_utils.sign_assertion("t", {}) for _ in range(3)]
+        calls = []
+        real = hmac_utils.get_keyring
+        keyenv.setattr(hmac_utils, "get_keyring", lambda: calls.append(1) or real())
+        assert hmac_utils.verify_assertions(signed)["valid"] == 3
+        assert len(calls) == 1
@@ -0,0 +1,201 @@
+"""Tests for hook dispatch: inline, sync (timeouts, retries) and queued async delivery."""
+
+import os
+import tempfile
+import threading
+import time
+
+if "DRAFT_DB_PATH" not in os.environ:
+    os.environ["DRAFT_DB_PATH"] = tempfile.mktemp(suffix=".db")
+
+import pytest
+
+from draft_protocol import engine, hooks, instrumentation, metrics, storage
+from draft_protocol.extension_points import (
+    add_classify_hook,
+    clear_all_hooks,
+    get_classify_hook,
+    register_classify_hook,
+    register_post_gate_hook,
+    unless_confident,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    yield
+    clear_all_hooks()
+    hooks.set_dispatcher(None)
+
+
+@pytest.fixture
+def histogram():
+    collector = instrumentation.HistogramCollector()
+    instrumentation.set_collector(collector)
+    yield collector
+    instrumentation.set_collector(None)
+
+
+def _passing_session() -> str:
+    sid = storage.create_session("TASK", "Build a CSV parser")
+    engine.map_dimensions(sid, "Build a CSV parser that rejects malformed rows")
+    dims = storage.get_session(sid)["dimensions"]
+    fields = {
+        fk: f"Substantive answer for {fk} with enough content"
+        for dim in dims.values()
+        if not dim.get("_screened")
+        for fk in dim
+        if not fk.startswith("_")
+    }
+    engine.confirm_batch(sid, fields)
+    return sid
+
+
+class TestModes:
+    def test_inline_suppresses_errors(self):
+        hooks.set_dispatcher(hooks.HookDispatcher(mode="inline"))
+        seen = []
+        assert hooks.get_dispatcher().dispatch("t", seen.append, 1)
+        assert not hooks.get_dispatcher().dispatch("t", lambda: 1 / 0)
+        assert seen == [1]
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError, match="Invalid hook mode"):
+            hooks.HookDispatcher(mode="later")
+
+    def test_sync_times_out_and_retries(self, histogram):
+        dispatcher = hooks.HookDispatcher(mode="sync", timeout=0.1, retries=2, backoff=0.01)
+        release = threading.Event()
+        started = time.perf_counter()
+        assert not dispatcher.dispatch("slow", release.wait)
+        release.set()
+        assert time.perf_counter() - started < 1.0
+        counters = {(c["tags"]["hook"], c["tags"]["result"]): c["value"] for c in histogram.counters()}
+        assert counters[("slow", "timeout")] == 3
+
+    def test_sync_timeout_leaves_caller_args_alone(self):
+        release = threading.Event()
+        result = {"passed": True}
+
+        def late_mutation(payload):
+            release.wait()
+            payload["passed"] = False
+
+        assert not hooks.HookDispatcher(mode="sync", timeout=0.05, retries=0).dispatch("late", late_mutation, result)
+        release.set()
+        time.sleep(0.05)  # The abandoned hook finishes on its own thread
+        assert result == {"passed": True}
+
+    def test_sync_retry_recovers(self):
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise ConnectionError("down")
+
+        assert hooks.HookDispatcher(mode="sync", retries=2, backoff=0.01).dispatch("flaky", flaky)
+        assert len(attempts) == 2
+
+    def test_async_returns_immediately_and_flushes(self):
+        dispatcher = hooks.HookDispatcher(mode="async", workers=1)
+        seen = []
+        payload = {"n": 1}
+        started = time.perf_counter()
+        for i in range(3):
+            assert dispatcher.dispatch("slow", lambda i, p: (time.sleep(0.05), seen.append((i, p["n"]))), i, payload)
+        assert time.perf_counter() - started < 0.05
+        payload["n"] = 2  # Queued arguments are copies
+        assert dispatcher.flush(timeout=2)
+        assert seen == [(0, 1), (1, 1), (2, 1)]
+        dispatcher.stop()
+
+    def test_async_full_queue_drops(self, histogram):
+        dispatcher = hooks.HookDispatcher(mode="async", workers=1, queue_size=1)
+        release = threading.Event()
+        assert dispatcher.dispatch("block", release.wait)
+        time.sleep(0.05)  # The worker takes the first event
+        assert dispatcher.dispatch("block", release.wait)
+        assert dispatcher.depth() == 1
+        assert not dispatcher.dispatch("block", release.wait)
+        release.set()
+        dispatcher.stop(timeout=2)
+        counters = {(c["tags"]["hook"], c["tags"]["result"]): c["value"] for c in histogram.counters()}
+        assert counters[("block", "dropped")] == 1
+
+
+class TestPostGate:
+    def test_hung_hook_does_not_block_gate(self):
+        hooks.set_dispatcher(hooks.HookDispatcher(mode="async", timeout=0.2, retries=0))
+        release = threading.Event()
+        calls = []
+        register_post_gate_hook(lambda sid, result: (calls.append(result["passed"]), release.wait()))
+        sid = _passing_session()
+        started = time.perf_counter()
+        gate = engine.check_gate(sid)
+        assert gate["passed"]
+        assert time.perf_counter() - started < 0.2
+        assert hooks.get_dispatcher().flush(timeout=2)
+        assert calls == [True]
+        release.set()
+
+    def test_metrics_exposition(self, histogram):
+        hooks.set_dispatcher(hooks.HookDispatcher(mode="sync"))
+        register_post_gate_hook(lambda sid, result: None)
+        engine.check_gate(_passing_session())
+        text = metrics.render_prometheus()
+        assert 'draft_hook_calls_total{hook="post_gate",result="ok"} 1' in text
+        assert "draft_hook_duration_seconds_count" in text
+        assert "draft_hook_queue_depth 0" in text
+
+
+class TestClassifyChain:
+    def test_single_hook_backward_compatible(self):
+        register_classify_hook(lambda m: ("CONSEQUENTIAL", "gde", 0.99))
+        assert engine.classify_tier("read the docs") == ("CONSEQUENTIAL", "gde", 0.99)
+        register_classify_hook(lambda m: None)  # Replaces, falls through
+        assert len(get_classify_hook()) == 1
+        assert engine.classify_tier("ok")[0] == "TRIVIAL"
+
+    def test_chain_order_and_fallthrough(self):
+        calls = []
+        add_classify_hook(lambda m: calls.append("a"), name="a")
+        add_classify_hook(lambda m: (calls.append("b"), ("MULTI", "b", 0.9))[1], name="b")
+        add_classify_hook(lambda m: calls.append("c"), name="c")
+        assert engine.classify_tier("hello there friend") == ("MULTI", "b", 0.9)
+        assert calls == ["a", "b"]
+        add_classify_hook(lambda m: None, name="b")  # Same name replaces in place
+        assert [h.name for h in get_classify_hook().hooks] == ["a", "b", "c"]
+
+    def test_errors_and_timeouts_fall_through(self):
+        release = threading.Event()
+        add_classify_hook(lambda m: 1 / 0, name="broken")
+        add_classify_hook(lambda m: release.wait(), name="hung", timeout=0.1)
+        started = time.perf_counter()
+        assert engine.classify_tier("change the governance policy")[0] == "CONSEQUENTIAL"
+        release.set()
+        assert time.perf_counter() - started < 1.0
+        stats = get_classify_hook().stats()
+        assert stats["broken"]["errors"] == 1
+        assert stats["hung"]["timeouts"] == 1
+
+    def test_prefilter_skips_confident_messages(self):
+        seen = []
+        register_classify_hook(lambda m: seen.append(m), name="gde", when=unless_confident())
+        for message in ("ok", "thanks", "change the governance policy", "what about the other one then"):
+            engine.classify_tier(message)
+        assert seen == ["what about the other one then"]
+        assert get_classify_hook().stats()["gde"]["skipped"] == 3
+
+    def test_memoized_per_message(self, histogram):
+        calls = []
+        register_classify_hook(lambda m: (calls.append(m), ("TASK", "gde", 0.8))[1], name="gde", cache_size=2)
+        for message in ("one thing", "one thing", "two things", "three things", "one thing"):
+            assert engine.classify_tier(message)[1] == "gde"
+        assert calls == ["one thing", "two things", "three things", "one thing"]  # LRU evicted "one thing"
+        stats = get_classify_hook().stats()["gde"]
+        assert stats["cache_hits"] == 1 and stats["calls"] == 4
+        assert stats["cache_hit_rate"] == 0.2 and stats["decided_rate"] == 1.0
+        text = metrics.render_prometheus()
+        assert 'draft_cache_requests_total{cache="classify:gde",result="hit"} 1' in text
+        assert 'draft_hook_duration_seconds_count{hook="classify:gde"} 4' in text
@@ -0,0 +1,196 @@
+"""Tests for latency instrumentation: spans, collectors, capture and wiring."""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from io import BytesIO
+
+if "DRAFT_DB_PATH" not in os.environ:
+    os.environ["DRAFT_DB_PATH"] = tempfile.mktemp(suffix=".db")
+
+import pytest
+
+from draft_protocol import engine, instrumentation, providers, storage
+from draft_protocol.instrumentation import (
+    HistogramCollector,
+    LogCollector,
+    NoopCollector,
+    capture_timings,
+    instrument_handler,
+    span,
+    summarize_timings,
+    timed,
+)
+from draft_protocol.mock_provider import MockProviderServer
+from draft_protocol.rest import DraftHandler
+
+
+@pytest.fixture
+def histogram():
+    collector = HistogramCollector()
+    instrumentation.set_collector(collector)
+    yield collector
+    instrumentation.set_collector(NoopCollector())
+
+
+def _handler(method, path, body=None, headers=None):
+    body_bytes = json.dumps(body).encode() if body is not None else b""
+    handler = DraftHandler.__new__(DraftHandler)
+    handler.rfile = BytesIO(body_bytes)
+    handler.wfile = BytesIO()
+    handler.path = path
+    handler.headers = {"Content-Type": "application/json", "Content-Length": str(len(body_bytes)), **(headers or {})}
+    handler.requestline = f"{method} {path} HTTP/1.1"
+    handler.request_version = "HTTP/1.1"
+    handler.command = method
+    handler.client_address = ("127.0.0.1", 0)
+    handler.close_connection = True
+    handler.log_message = lambda *a: None
+    return handler
+
+
+def _response(handler):
+    raw = handler.wfile.getvalue().decode()
+    return json.loads(raw.split("\r\n\r\n", 1)[1])
+
+
+class TestSpans:
+    def test_noop_by_default_returns_shared_null_span(self):
+        assert span("a") is span("b")
+
+    def test_histogram_records_count_and_tags(self, histogram):
+        for _ in range(3):
+            with span("unit.test", site="x"):
+                pass
+        (series,) = histogram.series()
+        assert series["name"] == "unit.test"
+        assert series["tags"] == {"site": "x"}
+        assert series["count"] == 3
+        assert histogram.snapshot()["unit.test{site=x}"]["count"] == 3
+
+    def test_exception_is_tagged_and_propagates(self, histogram):
+        with pytest.raises(KeyError), span("unit.fail"):
+            raise KeyError("boom")
+        assert histogram.series()[0]["tags"] == {"error": "KeyError"}
+
+    def test_quantiles_use_bucket_bounds(self):
+        collector = HistogramCollector(buckets_ms=(1, 10, 100))
+        for ms in (0.5, 0.5, 5, 50, 500):
+            collector.record("q", ms / 1000, {})
+        snap = collector.snapshot()["q"]
+        assert snap["p50_ms"] == 10
+        assert snap["p99_ms"] == float("inf")
+
+    def test_log_collector_emits_line(self, caplog):
+        instrumentation.set_collector(LogCollector())
+        try:
+            with caplog.at_level(logging.INFO, logger="draft_protocol.timings"), span("unit.log", site="y"):
+                pass
+        finally:
+            instrumentation.set_collector(NoopCollector())
+        assert "span unit.log" in caplog.text and "site=y" in caplog.text
+
+    def test_timed_decorator_preserves_function(self, histogram):
+        @timed("unit.timed")
+        def double(x):
+            """Doc."""
+            return x * 2
+
+        assert double(4) == 8
+        assert double.__name__ == "double" and double.__doc__ == "Doc."
+        assert histogram.series()[0]["name"] == "unit.timed"
+
+
+class TestCapture:
+    def test_capture_works_without_collector(self):
+        with capture_timings() as records, span("unit.cap", site="s"):
+            pass
+        assert len(records) == 1
+        block = summarize_timings(records, 0.5)
+        assert block["spans"]["unit.cap:s"]["count"] == 1
+        assert block["total_ms"] == 500.0
+
+    def test_capture_is_scoped(self):
+        with capture_timings():
+            pass
+        assert span("after") is span("again")
+
+    def test_instrument_handler_attaches_timings_when_enabled(self, monkeypatch):
+        monkeypatch.setattr(instrumentation, "TIMINGS", True)
+
+        @instrument_handler("mcp.fake")
+        def tool():
+            with span("inner"):
+                return {"ok": True}
+
+        result = tool()
+        assert result["ok"] is True
+        assert set(result["timings"]["spans"]) == {"inner", "mcp.fake"}
+
+    def test_async_handler_captures_offloaded_spans(self, monkeypatch):
+        monkeypatch.setattr(instrumentation, "TIMINGS", True)
+
+        def work():
+            with span("inner"):
+                return {"ok": True}
+
+        @instrument_handler("mcp.fake")
+        async def tool():
+            return await engine.offload(work)
+
+        result = asyncio.run(tool())
+        assert result["ok"] is True
+        assert set(result["timings"]["spans"]) == {"inner", "mcp.fake"}
+
+    def test_instrument_handler_passthrough_when_disabled(self):
+        @instrument_handler("mcp.fake")
+        def tool():
+            return {"ok": True}
+
+        assert tool() == {"ok": True}
+
+
+class TestWiring:
+    def test_classify_stages_are_timed(self, histogram):
+        engine.classify_tier("What is the capital of France?")
+        names = {s["name"] for s in histogram.series()}
+        assert {"classify.keywords", "classify.fallback"} <= names
+
+    def test_storage_operations_are_timed(self, histogram):
+        sid = storage.create_session("TASK", "instrumented")
+        storage.get_session(sid)
+        storage.close_session(sid)
+        names = {s["name"] for s in histogram.series()}
+        assert {"storage.create_session", "storage.get_session", "storage.close_session"} <= names
+
+    def test_provider_calls_tagged_with_site(self, monkeypatch, histogram):
+        with MockProviderServer() as server:
+            monkeypatch.setattr(providers, "LLM_PROVIDER", "ollama")
+            monkeypatch.setattr(providers, "LLM_MODEL", "mock-llm")
+            monkeypatch.setattr(providers, "EMBED_MODEL", "")
+            monkeypatch.setattr(providers, "API_BASE", server.url)
+            sid = storage.create_session("TASK", "Build a CSV parser")
+            engine.map_dimensions(sid, "Build a CSV parser that rejects malformed rows")
+        sites = {s["tags"].get("site") for s in histogram.series() if s["name"] == "provider.chat"}
+        assert "_assess_field_llm" in sites
+        assert all(s["tags"]["provider"] == "ollama" for s in histogram.series() if s["name"] == "provider.chat")
+
+    def test_rest_timings_via_header(self):
+        handler = _handler("POST", "/classify", {"message": "hello there"}, {"X-Draft-Timings": "1"})
+        handler.do_POST()
+        body = _response(handler)
+        assert "tier" in body
+        assert "classify.keywords" in body["timings"]["spans"]
+        assert body["timings"]["total_ms"] >= 0
+
+    def test_rest_no_timings_by_default(self):
+        handler = _handler("POST", "/classify", {"message": "hello there"})
+        handler.do_POST()
+        assert "timings" not in _response(handler)
+
+    def test_rest_unknown_path_tagged_unmatched(self, histogram):
+        handler = _handler("GET", "/nope")
+        handler.do_GET()
+        assert histogram.series()[0]["tags"] == {"route": "unmatched"}
@@ -0,0 +1,280 @@
+"""Tests for session TTL expiry and the background sweeper."""
+
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+if "DRAFT_DB_PATH" not in os.environ:
+    os.environ["DRAFT_DB_PATH"] = tempfile.mktemp(suffix=".db")
+
+import pytest
+
+from draft_protocol import config, maintenance, storage
+
+
+def _age(session_id: str, created_s: int = 0, idle_s: int = 0) -> None:
+    """Backdate a session's created_at / updated_at by the given seconds."""
+    now = datetime.now(timezone.utc)
+    conn = storage.get_db()
+    try:
+        conn.execute(
+            "UPDATE sessions SET created_at = ?, updated_at = ? WHERE id = ?",
+            (
+                (now - timedelta(seconds=created_s)).isoformat(),
+                (now - timedelta(seconds=idle_s)).isoformat(),
+                session_id,
+            ),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _audit(session_id: str) -> list[tuple[str, str]]:
+    conn = storage.get_db()
+    try:
+        rows = conn.execute("SELECT action, detail FROM audit_log WHERE session_id = ?", (session_id,)).fetchall()
+    finally:
+        conn.close()
+    return [tuple(r) for r in rows]
+
+
+@pytest.fixture
+def ttls(monkeypatch):
+    monkeypatch.setattr(config, "SESSION_IDLE_TTL", dict.fromkeys(config.ALL_TIERS, 600))
+    monkeypatch.setattr(config, "SESSION_MAX_TTL", dict.fromkeys(config.ALL_TIERS, 3600))
+    return monkeypatch
+
+
+class TestTierSeconds:
+    def test_defaults(self, monkeypatch):
+        monkeypatch.delenv("DRAFT_SESSION_IDLE_TTL", raising=False)
+        assert config._tier_seconds("DRAFT_SESSION_IDLE_TTL", {"TASK": 5}) == {"TASK": 5}
+
+    def test_expiry_off_by_default(self):
+        assert set(config._DEFAULT_IDLE_TTL.values()) == {0}
+        assert set(config._DEFAULT_MAX_TTL.values()) == {0}
+
+    def test_single_value_applies_to_all(self, monkeypatch):
+        monkeypatch.setenv("DRAFT_SESSION_IDLE_TTL", "0")
+        assert config._tier_seconds("DRAFT_SESSION_IDLE_TTL", {"TASK": 5, "MULTI": 6}) == {"TASK": 0, "MULTI": 0}
+
+    def test_per_tier_overrides(self, monkeypatch):
+        monkeypatch.setenv("DRAFT_SESSION_IDLE_TTL", "task=10, MULTI=0")
+        assert config._tier_seconds("DRAFT_SESSION_IDLE_TTL", {"TASK": 5, "MULTI": 6, "LOOKUP": 7}) == {
+            "TASK": 10,
+            "MULTI": 0,
+            "LOOKUP": 7,
+        }
+
+    def test_unknown_tier_rejected(self, monkeypatch):
+        monkeypatch.setenv("DRAFT_SESSION_IDLE_TTL", "BOGUS=1")
+        with pytest.raises(ValueError, match="BOGUS"):
+            config._tier_seconds("DRAFT_SESSION_IDLE_TTL", {"TASK": 5})
+
+
+class TestExpiry:
+    def test_idle_session_expires_lazily(self, ttls):
+        sid = storage.create_session("TASK", "idle")
+        assert not storage.is_session_closed(sid)
+        _age(sid, created_s=700, idle_s=700)
+        assert storage.is_session_closed(sid)
+        assert storage.get_session(sid)["closed_at"] is not None
+        assert _audit(sid) == [("expired", "reason=idle")]
+
+    def test_absolute_ttl_despite_activity(self, ttls):
+        sid = storage.create_session("TASK", "busy")
+        _age(sid, created_s=4000, idle_s=1)
+        assert storage.is_session_closed(sid)
+        assert _audit(sid) == [("expired", "reason=max_age")]
+
+    def test_per_tier_ttl_and_zero_disables(self, ttls):
+        ttls.setitem(config.SESSION_IDLE_TTL, "CONSEQUENTIAL", 0)
+        ttls.setitem(config.SESSION_MAX_TTL, "CONSEQUENTIAL", 0)
+        task = storage.create_session("TASK", "short")
+        cons = storage.create_session("CONSEQUENTIAL", "forever")
+        _age(task, created_s=10_000, idle_s=10_000)
+        _age(cons, created_s=10_000, idle_s=10_000)
+        assert storage.is_session_closed(task)
+        assert not storage.is_session_closed(cons)
+        storage.close_session(cons)
+
+    def test_active_session_skips_expired(self, ttls):
+        live = storage.create_session("TASK", "live")
+        stale = storage.create_session("TASK", "stale")
+        _age(live)
+        _age(stale, idle_s=700)
+        assert storage.get_active_session()["id"] == live
+        assert storage.get_session(stale)["closed_at"] is not None
+        storage.close_session(live)
+
+    def test_active_session_lookup_only_expires_its_own_row(self, ttls):
+        other = storage.create_session("TASK", "other tenant", tenant="other")
+        mine = storage.create_session("TASK", "mine", tenant="me")
+        _age(other, idle_s=700)
+        _age(mine, idle_s=700)
+        assert storage.get_active_session("me") is None
+        assert storage.get_session(mine)["closed_at"] is not None
+        assert storage.get_session(other)["closed_at"] is None
+        storage.close_session(other)
+
+    def test_expire_in_batches(self, ttls):
+        sids = [storage.create_session("LOOKUP", f"bulk {i}") for i in range(5)]
+        for sid in sids:
+            _age(sid, idle_s=700)
+        first = storage.expire_sessions(limit=3)
+        rest = storage.expire_sessions(limit=3)
+        assert len(first) == 3
+        assert set(first) | set(rest) >= set(sids)
+        assert all(storage.get_session(sid)["closed_at"] for sid in sids)
+
+    def test_no_ttls_configured(self, monkeypatch):
+        monkeypatch.setattr(config, "SESSION_IDLE_TTL", {})
+        monkeypatch.setattr(config, "SESSION_MAX_TTL", {})
+        assert storage.expire_sessions() == []
+
+
+class TestSweeper:
+    def test_task_without_run_once_fails_at_creation(self):
+        class Forgetful(maintenance._PeriodicTask):
+            pass
+
+        with pytest.raises(TypeError, match="run_once"):
+            Forgetful(interval=1)
+
+    def test_sweep_once_drains_all_batches(self, ttls):
+        sids = [storage.create_session("TASK", f"sweep {i}") for i in range(5)]
+        for sid in sids:
+            _age(sid, idle_s=700)
+        assert maintenance.SessionSweeper(interval=60, batch_size=2).sweep_once() >= 5
+        assert all(storage.get_session(sid)["closed_at"] for sid in sids)
+
+    def test_thread_sweeps_periodically(self, ttls):
+        sid = storage.create_session("TASK", "background")
+        _age(sid, idle_s=700)
+        sweeper = maintenance.SessionSweeper(interval=0.05).start()
+        try:
+            for _ in range(100):
+                if storage.get_session(sid)["closed_at"]:
+                    break
+                sweeper._stop.wait(0.05)
+        finally:
+            sweeper.stop(timeout=5)
+        assert storage.get_session(sid)["closed_at"] is not None
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError):
+            maintenance.SessionSweeper(interval=0)
+
+    def test_start_sweeper_disabled(self, monkeypatch):
+        monkeypatch.setattr(maintenance, "SESSION_SWEEP_INTERVAL", 0)
+        assert maintenance.start_sweeper() is None
+
+
+@pytest.fixture
+def isolated_db(tmp_path, monkeypatch):
+    """Fresh database so retention never touches other tests' audit rows."""
+    monkeypatch.setattr(storage, "DB_PATH", tmp_path / "draft.db")
+    yield tmp_path
+
+
+def _insert_audit(rows: list[tuple[str, str]]) -> None:
+    """Insert (session_id, created_at) audit rows directly."""
+    conn = storage.get_db()
+    try:
+        conn.executemany(
+            "INSERT OR IGNORE INTO sessions (id, created_at, updated_at) VALUES (?, ?, ?)",
+            [(sid, ts, ts) for sid, ts in rows],
+        )
+        conn.executemany(
+            "INSERT INTO audit_log (session_id, tool_name, action, detail, created_at) VALUES (?, 't', 'a', '', ?)",
+            rows,
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _days_ago(days: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+class TestAuditRetention:
+    def test_age_policy_archives_by_month(self, isolated_db):
+        _insert_audit([("s1", "2025-01-05T00:00:00+00:00"), ("s1", "2025-02-01T00:00:00+00:00"), ("s2", _days_ago(1))])
+        result = maintenance.archive_audit(retention_days=30, max_rows=0, archive_dir=isolated_db / "arc")
+        assert result["archived"] == 2
+        assert sorted(p.name for p in (isolated_db / "arc").iterdir()) == [
+            "audit-2025-01.ndjson.gz",
+            "audit-2025-02.ndjson.gz",
+        ]
+        assert [r["session_id"] for r in storage.iter_audit()] == ["s2"]
+
+    def test_size_policy_keeps_newest_rows(self, isolated_db):
+        _insert_audit([("s", _days_ago(1)) for _ in range(10)])
+        maintenance.archive_audit(retention_days=0, max_rows=3, archive_dir=isolated_db / "arc")
+        assert [r["id"] for r in storage.iter_audit()] == [8, 9, 10]
+
+    def test_deletes_in_bounded_batches(self, isolated_db, monkeypatch):
+        _insert_audit([("s", "2025-01-05T00:00:00+00:00") for _ in range(7)])
+        deletes = []
+        real = storage.delete_audit_range
+        monkeypatch.setattr(
+            storage, "delete_audit_range", lambda a, b, **kw: deletes.append((a, b)) or real(a, b, **kw)
+        )
+        maintenance.archive_audit(retention_days=30, archive_dir=isolated_db / "arc", batch_size=3)
+        assert deletes == [(0, 3), (3, 6), (6, 7)]
+
+    def test_history_spans_archive_and_live(self, isolated_db):
+        _insert_audit([("a", "2025-01-05T00:00:00+00:00"), ("b", "2025-03-01T00:00:00+00:00"), ("a", _days_ago(1))])
+        maintenance.archive_audit(retention_days=30, archive_dir=isolated_db / "arc")
+        history = list(maintenance.iter_audit_history(archive_dir=isolated_db / "arc"))
+        assert [r["id"] for r in history] == [1, 2, 3]
+        only_a = maintenance.iter_audit_history(session_id="a", archive_dir=isolated_db / "arc")
+        assert [r["id"] for r in only_a] == [1, 3]
+        window = maintenance.iter_audit_history(since="2025-02-01", until="2025-04-01", archive_dir=isolated_db / "arc")
+        assert [r["id"] for r in window] == [2]
+
+    def test_interrupted_run_does_not_duplicate(self, isolated_db):
+        _insert_audit([("s", "2025-01-05T00:00:00+00:00") for _ in range(3)])
+        rows = storage.fetch_audit_range(0, 3)
+        maintenance._append_segment(maintenance._segment_path(isolated_db / "arc", "2025-01"), rows)
+        maintenance.archive_audit(retention_days=30, archive_dir=isolated_db / "arc")
+        assert [r["id"] for r in maintenance.iter_audit_history(archive_dir=isolated_db / "arc")] == [1, 2, 3]
+
+    def test_history_keeps_rows_out_of_month_order(self, isolated_db):
+        # A writer racing the month boundary: id 1 lands in February, id 2 in January
+        _insert_audit([("a", "2025-02-01T00:00:00.001+00:00"), ("b", "2025-01-31T23:59:59.999+00:00")])
+        # A moved session keeps its January timestamps but gets new, higher ids
+        other = isolated_db / "other.db"
+        conn = storage.get_db(other)
+        try:
+            conn.execute("INSERT INTO sessions (id, created_at, updated_at) VALUES ('m', '2025-01-10', '2025-01-10')")
+            conn.execute(
+                "INSERT INTO audit_log (session_id, tool_name, action, detail, created_at) "
+                "VALUES ('m', 't', 'a', '', '2025-01-10T00:00:00+00:00')"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        storage.move_session("m", other, storage.shard_paths()[0])
+        _insert_audit([("c", "2025-03-01T00:00:00+00:00"), ("live", _days_ago(1))])
+        maintenance.archive_audit(retention_days=30, archive_dir=isolated_db / "arc")
+        history = list(maintenance.iter_audit_history(archive_dir=isolated_db / "arc"))
+        assert [r["session_id"] for r in history] == ["a", "b", "m", "c", "live"]
+        assert [r["id"] for r in history] == sorted(r["id"] for r in history)
+        resumed = maintenance.iter_audit_history(archive_dir=isolated_db / "arc", after_id=history[1]["id"])
+        assert [r["session_id"] for r in resumed] == ["m", "c", "live"]
+
+    def test_run_once_compacts_after_archiving(self, isolated_db):
+        _insert_audit([("s" * 200, "2025-01-05T00:00:00+00:00") for _ in range(2000)])
+        task = maintenance.AuditRetention(interval=60, retention_days=30, archive_dir=isolated_db / "arc", pause=0)
+        result = task.run_once()
+        assert result["archived"] == 2000
+        assert result["vacuumed"] is True
+        assert task.run_once() == {"archived": 0, "through_id": 0}
+
+    def test_no_policy_is_noop(self, isolated_db):
+        _insert_audit([("s", "2025-01-05T00:00:00+00:00")])
+        assert maintenance.archive_audit(retention_days=0, max_rows=0, archive_dir=isolated_db / "arc")["archived"] == 0
+        assert not (isolated_db / "arc").exists()
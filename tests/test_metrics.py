@@ -0,0 +1,138 @@
+"""Tests for the Prometheus /metrics endpoint and the counters behind it."""
+
+import json
+import os
+import tempfile
+from io import BytesIO
+
+if "DRAFT_DB_PATH" not in os.environ:
+    os.environ["DRAFT_DB_PATH"] = tempfile.mktemp(suffix=".db")
+
+import pytest
+
+from draft_protocol import engine, instrumentation, metrics, providers, storage
+from draft_protocol.instrumentation import HistogramCollector, NoopCollector, span
+from draft_protocol.mock_provider import MockProviderServer
+from draft_protocol.rest import DraftHandler
+
+
+@pytest.fixture
+def histogram():
+    collector = HistogramCollector()
+    instrumentation.set_collector(collector)
+    yield collector
+    instrumentation.set_collector(NoopCollector())
+
+
+def _request(method, path, body=None):
+    body_bytes = json.dumps(body).encode() if body is not None else b""
+    handler = DraftHandler.__new__(DraftHandler)
+    handler.rfile = BytesIO(body_bytes)
+    handler.wfile = BytesIO()
+    handler.path = path
+    handler.headers = {"Content-Type": "application/json", "Content-Length": str(len(body_bytes))}
+    handler.requestline = f"{method} {path} HTTP/1.1"
+    handler.request_version = "HTTP/1.1"
+    handler.command = method
+    handler.client_address = ("127.0.0.1", 0)
+    handler.close_connection = True
+    handler.log_message = lambda *a: None
+    getattr(handler, f"do_{method}")()
+    head, _, payload = handler.wfile.getvalue().decode().partition("\r\n\r\n")
+    return head, payload
+
+
+def _counter(collector, name, **tags):
+    return sum(c["value"] for c in collector.counters() if c["name"] == name and tags.items() <= c["tags"].items())
+
+
+class TestExposition:
+    def test_histogram_is_cumulative_with_inf_bucket(self, histogram):
+        histogram.record("storage.get_session", 0.002, {})
+        histogram.record("storage.get_session", 0.020, {})
+        text = metrics.render_prometheus()
+        assert "# TYPE draft_storage_duration_seconds histogram" in text
+        assert 'draft_storage_duration_seconds_bucket{le="0.0025",op="get_session"} 1' in text
+        assert 'draft_storage_duration_seconds_bucket{le="+Inf",op="get_session"} 2' in text
+        assert 'draft_storage_duration_seconds_count{op="get_session"} 2' in text
+
+    def test_unknown_prefix_uses_generic_family(self, histogram):
+        with span("custom"):
+            pass
+        assert 'draft_span_duration_seconds_count{span="custom"} 1' in metrics.render_prometheus()
+
+    def test_label_values_are_escaped(self, histogram):
+        instrumentation.count("draft_test_total", note='a "quoted"\nvalue')
+        assert 'note="a \\"quoted\\"\\nvalue"' in metrics.render_prometheus()
+
+    def test_without_histogram_collector_only_gauges(self):
+        text = metrics.render_prometheus()
+        assert "DRAFT_METRICS=histogram" in text
+        assert "# TYPE draft_active_sessions gauge" in text
+
+    def test_broken_gauge_is_skipped(self, monkeypatch):
+        monkeypatch.setattr(metrics, "_gauges", dict(metrics._gauges))
+        metrics.register_gauge("draft_broken", lambda: 1 / 0, "Always fails.")
+        metrics.register_gauge("draft_fine", lambda: 3, "Always 3.")
+        text = metrics.render_prometheus()
+        assert "draft_broken" not in text
+        assert "draft_fine 3" in text
+
+
+class TestCounters:
+    def test_classify_counts_by_tier_and_path(self, histogram):
+        engine.classify_tier("deploy the governance policy to production")
+        engine.classify_tier("update 5 files in the repo")
+        engine.classify_tier("thanks")
+        engine.classify_tier("   ")
+        assert _counter(histogram, "draft_classify_total", tier="CONSEQUENTIAL", path="keyword") == 1
+        assert _counter(histogram, "draft_classify_total", tier="MULTI", path="regex") == 1
+        assert _counter(histogram, "draft_classify_total", tier="TRIVIAL", path="fallback") == 1
+        assert _counter(histogram, "draft_classify_total", tier="REJECTED", path="rejected") == 1
+
+    def test_classify_hook_path(self, histogram, monkeypatch):
+        monkeypatch.setattr(engine, "get_classify_hook", lambda: lambda m: ("TASK", "hook", 0.9))
+        assert engine.classify_tier("anything") == ("TASK", "hook", 0.9)
+        assert _counter(histogram, "draft_classify_total", path="hook") == 1
+
+    def test_field_embedding_cache_hits(self, histogram, monkeypatch):
+        monkeypatch.setattr(engine, "_field_question_embeddings", {})
+        monkeypatch.setattr(engine, "_embed", lambda text, site="": [1.0, 0.0])
+        engine._get_field_embedding("D1")
+        engine._get_field_embedding("D1")
+        assert _counter(histogram, "draft_cache_requests_total", result="miss") == 1
+        assert _counter(histogram, "draft_cache_requests_total", result="hit") == 1
+
+    @pytest.mark.parametrize(
+        ("kwargs", "kind"), [({"error_rate": 1.0}, "http"), ({"timeout_rate": 1.0, "stall_s": 5}, "timeout")]
+    )
+    def test_provider_errors_by_kind(self, histogram, monkeypatch, kwargs, kind):
+        with MockProviderServer(**kwargs) as server:
+            monkeypatch.setattr(providers, "LLM_PROVIDER", "ollama")
+            monkeypatch.setattr(providers, "LLM_MODEL", "mock-llm")
+            monkeypatch.setattr(providers, "API_BASE", server.url)
+            assert providers.chat("hello", engine.TIER_SCHEMA, timeout=1) is None
+        assert _counter(histogram, "draft_provider_errors_total", op="chat", kind=kind) == 1
+
+    def test_active_sessions_gauge(self):
+        before = storage.count_active_sessions()
+        sid = storage.create_session("TASK", "gauge")
+        assert storage.count_active_sessions() == before + 1
+        storage.close_session(sid)
+        assert storage.count_active_sessions() == before
+
+
+class TestEndpoint:
+    def test_metrics_endpoint_serves_text(self, histogram):
+        _request("POST", "/classify", {"message": "what is the status"})
+        head, payload = _request("GET", "/metrics")
+        assert "Content-Type: text/plain; version=0.0.4" in head
+        assert 'draft_rest_requests_total{method="POST",route="/classify",status="200"} 1' in payload
+        assert 'draft_rest_request_duration_seconds_count{method="POST",route="/classify"} 1' in payload
+        assert "draft_active_sessions " in payload
+
+    def test_error_status_is_counted(self, histogram):
+        _request("POST", "/classify", {"message": ""})
+        _request("GET", "/missing")
+        assert _counter(histogram, "draft_rest_requests_total", route="/classify", status="400") == 1
+        assert _counter(histogram, "draft_rest_requests_total", route="unmatched", status="404") == 1
@@ -0,0 +1,158 @@
+"""Tests for the bundled mock LLM/embedding server."""
+
+import asyncio
+import os
+import tempfile
+import time
+
+if "DRAFT_DB_PATH" not in os.environ:
+    os.environ["DRAFT_DB_PATH"] = tempfile.mktemp(suffix=".db")
+
+import pytest
+
+from draft_protocol import engine, providers, storage
+from draft_protocol.mock_provider import MockProviderServer, deterministic_embedding, schema_instance
+
+
+class TestDeterministicContent:
+    def test_embedding_is_deterministic_and_normalized(self):
+        a = deterministic_embedding("build a governance engine")
+        assert a == deterministic_embedding("build a governance engine")
+        assert abs(sum(x * x for x in a) - 1.0) < 1e-9
+
+    def test_similar_texts_score_higher(self):
+        base = deterministic_embedding("build a governance engine for tool calls")
+        near = deterministic_embedding("build a governance engine")
+        far = deterministic_embedding("bake sourdough bread at home")
+        assert engine._cosine_sim(base, near) > engine._cosine_sim(base, far)
+
+    def test_schema_instance_respects_enum_and_range(self):
+        for seed in range(50):
+            value = schema_instance(engine.FIELD_SCHEMA, seed)
+            assert value["status"] in ("SATISFIED", "AMBIGUOUS", "MISSING")
+            assert 0.0 <= value["confidence"] <= 1.0
+            assert isinstance(value["extracted"], str)
+
+
+class TestProviderShapes:
+    @pytest.mark.parametrize(("provider", "suffix"), [("ollama", ""), ("openai", "/v1"), ("anthropic", "/v1")])
+    def test_chat_returns_schema_valid_json(self, mock_server, provider, suffix, use_provider):
+        use_provider(mock_server, provider, suffix)
+        result = providers.chat("Classify: hello", engine.TIER_SCHEMA)
+        assert result is not None
+        assert result["tier"] in engine.TIER_SCHEMA["properties"]["tier"]["enum"]
+        assert result == providers.chat("Classify: hello", engine.TIER_SCHEMA)
+
+    @pytest.mark.parametrize(("provider", "suffix"), [("ollama", ""), ("openai", "/v1")])
+    def test_embed_matches_deterministic_embedding(self, mock_server, provider, suffix, use_provider):
+        use_provider(mock_server, provider, suffix)
+        assert providers.embed("hello world") == pytest.approx(deterministic_embedding("hello world"))
+
+    def test_engine_llm_path_runs_against_mock(self, mock_server, use_provider):
+        use_provider(mock_server, "ollama")
+        sid = storage.create_session("TASK", "Build a CSV parser")
+        dims = engine.map_dimensions(sid, "Build a CSV parser that rejects malformed rows")
+        assert "D" in dims and "D1" in dims["D"]
+        assert mock_server.stats.get("/api/chat", 0) > 0
+
+
+class TestChunkedEmbedding:
+    FILLER = "The weather was mild that day. " * 100
+    ANSWER = "The required evidence includes test results and verification data."
+
+    @pytest.mark.parametrize(("provider", "suffix"), [("ollama", ""), ("openai", "/v1")])
+    def test_embed_many_batches_in_order(self, monkeypatch, mock_server, provider, suffix, use_provider):
+        use_provider(mock_server, provider, suffix)
+        monkeypatch.setattr(providers, "EMBED_BATCH_SIZE", 2)
+        texts = [f"text number {i}" for i in range(5)]
+        vectors = providers.embed_many(texts)
+        assert vectors == [pytest.approx(deterministic_embedding(t)) for t in texts]
+        assert mock_server.stats["/embeddings" if suffix else "/api/embed"] == 3
+
+    def test_field_found_past_old_window(self, mock_server, use_provider):
+        use_provider(mock_server, "ollama")
+        context = self.FILLER + self.ANSWER
+        assert context.index(self.ANSWER) > 2000
+        sim, chunk = engine._chunk_matches(context)["T4"]
+        assert self.ANSWER in chunk and sim > 0
+        assessed = engine._assess_field_embedding("T4", "", context, {"T4": (0.8, chunk)})
+        assert assessed["status"] == "SATISFIED"
+        assert assessed["extracted"] == self.ANSWER
+
+    def test_appending_reuses_cached_chunks(self, mock_server, use_provider):
+        use_provider(mock_server, "ollama")
+        before = engine._chunk_context(self.FILLER)
+        after = engine._chunk_context(self.FILLER + self.ANSWER)
+        assert after[: len(before) - 1] == before[:-1]
+        engine._embed_chunks(before)
+        requests = mock_server.stats["/api/embed"]
+        engine._embed_chunks(before)
+        assert mock_server.stats["/api/embed"] == requests
+        engine._embed_chunks(after)
+        assert mock_server.stats["/api/embed"] == requests + 1
+
+    def test_pure_python_matrix_matches_cosine(self, monkeypatch):
+        monkeypatch.setattr(engine, "_numpy", lambda: None)
+        rows = [deterministic_embedding(t) for t in ("build a tool", "test evidence")]
+        cols = [deterministic_embedding(t) for t in ("build a service", "evidence of tests", "bread")] + [[]]
+        matrix = engine._similarity_matrix(rows, cols)
+        for r, row in zip(rows, matrix, strict=True):
+            assert row == pytest.approx([engine._cosine_sim(r, c) for c in cols])
+
+
+class TestAsyncProviders:
+    @pytest.mark.parametrize(("provider", "suffix"), [("ollama", ""), ("openai", "/v1"), ("anthropic", "/v1")])
+    def test_achat_matches_chat(self, mock_server, provider, suffix, use_provider):
+        use_provider(mock_server, provider, suffix)
+        result = asyncio.run(providers.achat("Classify: hello", engine.TIER_SCHEMA))
+        assert result is not None and result == providers.chat("Classify: hello", engine.TIER_SCHEMA)
+
+    @pytest.mark.parametrize(("provider", "suffix"), [("ollama", ""), ("openai", "/v1")])
+    def test_aembed_and_batches(self, monkeypatch, mock_server, provider, suffix, use_provider):
+        use_provider(mock_server, provider, suffix)
+        monkeypatch.setattr(providers, "EMBED_BATCH_SIZE", 2)
+        texts = [f"text number {i}" for i in range(5)]
+        assert asyncio.run(providers.aembed_many(texts)) == [pytest.approx(deterministic_embedding(t)) for t in texts]
+        assert asyncio.run(providers.aembed("hello world")) == pytest.approx(deterministic_embedding("hello world"))
+
+    def test_requests_run_concurrently(self, use_provider):
+        with MockProviderServer(latency_ms=200) as server:
+            use_provider(server, "ollama")
+
+            async def many():
+                return await asyncio.gather(*(providers.achat(f"p{i}", engine.TIER_SCHEMA) for i in range(10)))
+
+            started = time.perf_counter()
+            assert all(asyncio.run(many()))
+            assert time.perf_counter() - started < 1.0  # Ten 200 ms calls, not two seconds
+
+    def test_failures_return_none(self, use_provider):
+        with MockProviderServer(error_rate=1.0) as server:
+            use_provider(server, "ollama")
+            assert asyncio.run(providers.achat("hello", engine.TIER_SCHEMA)) is None
+        with MockProviderServer(timeout_rate=1.0, stall_s=5) as server:
+            use_provider(server, "ollama")
+            assert asyncio.run(providers.achat("hello", engine.TIER_SCHEMA, timeout=1)) is None
+
+
+class TestFaultInjection:
+    def test_error_rate_makes_chat_fail_gracefully(self, use_provider):
+        with MockProviderServer(error_rate=1.0) as server:
+            use_provider(server, "ollama")
+            assert providers.chat("hello", engine.TIER_SCHEMA) is None
+            assert server.stats["errors"] == 1
+
+    def test_stall_triggers_client_timeout(self, use_provider):
+        with MockProviderServer(timeout_rate=1.0, stall_s=5) as server:
+            use_provider(server, "ollama")
+            assert providers.chat("hello", engine.TIER_SCHEMA, timeout=1) is None
+            assert server.stats["stalled"] == 1
+
+    def test_latency_draws_are_reproducible(self):
+        a = MockProviderServer(latency_ms=20, jitter_ms=10, seed=7)
+        b = MockProviderServer(latency_ms=20, jitter_ms=10, seed=7)
+        try:
+            assert [a._draw() for _ in range(5)] == [b._draw() for _ in range(5)]
+        finally:
+            a._httpd.server_close()
+            b._httpd.server_close()
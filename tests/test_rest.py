@@ -117,6 +117,51 @@ class TestSessionEndpoint:
         assert status == 400
 
 
+class TestPipelineEndpoint:
+    def test_runs_through_elicit(self):
+        handler, wfile = make_handler(
+            "POST", "/pipeline", {"message": "build a REST API", "context": "It returns JSON."}
+        )
+        handler.do_POST()
+        status, body = parse_response(wfile)
+        assert status == 200
+        assert body["stages"] == ["intake", "open_elicit", "map", "elicit"]
+        assert body["session_id"] and body["dimensions"] and "questions" in body
+
+    def test_invalid_stage_rejected(self):
+        handler, wfile = make_handler("POST", "/pipeline", {"message": "build a REST API", "until": "gate"})
+        handler.do_POST()
+        status, body = parse_response(wfile)
+        assert status == 400
+        assert "Invalid stage" in body["error"]
+
+
+class TestElicitStreamEndpoint:
+    def test_streams_server_sent_events(self):
+        from draft_protocol import engine, storage
+
+        sid = storage.create_session("TASK", "build a REST API")
+        engine.map_dimensions(sid, "It returns JSON.")
+        handler, wfile = make_handler("POST", "/elicit/stream", {"session_id": sid})
+        handler.do_POST()
+        head, _, body = wfile.getvalue().decode().partition("\r\n\r\n")
+        assert " 200 " in head.splitlines()[0]
+        assert "Content-Type: text/event-stream" in head
+        frames = [frame.split("\n") for frame in body.strip().split("\n\n")]
+        events = [(kind[len("event: ") :], json.loads(data[len("data: ") :])) for kind, data in frames]
+        questions = [data["question"] for kind, data in events if kind == "question"]
+        assert questions == engine.generate_elicitation(sid)
+        assert events[-1] == ("done", {"event": "done", "question_count": len(questions)})
+        close_session(sid)
+
+    def test_get_requires_session_id(self):
+        handler, wfile = make_handler("GET", "/elicit/stream")
+        handler.do_GET()
+        status, body = parse_response(wfile)
+        assert status == 400
+        assert "session_id" in body["error"]
+
+
 class TestNotFoundEndpoint:
     def test_get_unknown_path(self):
         handler, wfile = make_handler("GET", "/nonexistent")
@@ -129,3 +174,116 @@ class TestNotFoundEndpoint:
         handler.do_POST()
         status, _body = parse_response(wfile)
         assert status == 404
+
+
+class TestConflict:
+    def test_exhausted_retries_return_409(self, monkeypatch):
+        from draft_protocol import engine
+        from draft_protocol.storage import ConcurrentModificationError
+
+        def conflict(*args):
+            raise ConcurrentModificationError("s", 3)
+
+        monkeypatch.setattr(engine, "confirm_field", conflict)
+        handler, wfile = make_handler("POST", "/confirm", {"session_id": "s", "field_key": "D1", "value": "abc"})
+        handler.do_POST()
+        status, body = parse_response(wfile)
+        assert status == 409
+        assert "modified concurrently" in body["error"]
+
+
+class TestAuditEndpoint:
+    def test_streams_ndjson_with_filters(self):
+        from draft_protocol import storage
+
+        sid = storage.create_session("TASK", "audit endpoint")
+        storage.log_audit(sid, "draft_map", "map", "one")
+        storage.log_audit(sid, "draft_gate", "check", "two")
+        handler, wfile = make_handler("GET", f"/audit?session_id={sid}&tool=draft_gate")
+        handler.do_GET()
+        head, _, body = wfile.getvalue().decode().partition("\r\n\r\n")
+        assert " 200 " in head.splitlines()[0]
+        assert "Content-Type: application/x-ndjson" in head
+        rows = [json.loads(line) for line in body.splitlines()]
+        assert [(r["action"], r["detail"]) for r in rows] == [("check", "two")]
+        close_session(sid)
+
+    def test_scoped_to_tenant(self):
+        from draft_protocol import storage
+
+        own = storage.create_session("TASK", "audit tenant a", tenant="team-a")
+        other = storage.create_session("TASK", "audit tenant b", tenant="team-b")
+        storage.log_audit(own, "draft_map", "map", "mine")
+        storage.log_audit(other, "draft_map", "map", "theirs")
+        handler, wfile = make_handler("GET", "/audit?tool=draft_map")
+        handler.headers["X-Draft-Tenant"] = "team-a"
+        handler.do_GET()
+        head, _, body = wfile.getvalue().decode().partition("\r\n\r\n")
+        assert "Access-Control-Allow-Origin" not in head
+        assert [json.loads(line)["detail"] for line in body.splitlines()] == ["mine"]
+        close_session(own)
+        close_session(other)
+
+    def test_header_cannot_read_api_key_tenant(self):
+        from draft_protocol import storage
+
+        handler, wfile = make_handler("GET", "/audit")
+        handler.headers["X-Draft-Tenant"] = storage.KEY_TENANT_PREFIX + "0123456789abcdef"
+        handler.do_GET()
+        assert parse_response(wfile)[0] == 400
+
+    def test_bad_cursor_rejected(self):
+        handler, wfile = make_handler("GET", "/audit?after=abc")
+        handler.do_GET()
+        status, body = parse_response(wfile)
+        assert status == 400
+        assert "after" in body["error"]
+
+
+class TestTenantScoping:
+    def _session(self, headers: dict) -> str:
+        handler, wfile = make_handler("POST", "/session", {"message": "Build a tenant-scoped feature"})
+        handler.headers.update(headers)
+        handler.do_POST()
+        return parse_response(wfile)[1]["session_id"]
+
+    def _status(self, headers: dict) -> dict:
+        handler, wfile = make_handler("GET", "/status")
+        handler.headers.update(headers)
+        handler.do_GET()
+        return parse_response(wfile)[1]
+
+    def test_tenants_do_not_close_each_others_sessions(self):
+        a = self._session({"X-Draft-Tenant": "team-a"})
+        b = self._session({"X-Draft-Tenant": "team-b"})
+        assert self._status({"X-Draft-Tenant": "team-a"})["session_id"] == a
+        assert self._status({"X-Draft-Tenant": "team-b"})["session_id"] == b
+        close_session(a)
+        close_session(b)
+
+    def test_api_key_identifies_tenant(self):
+        from draft_protocol.storage import get_session
+
+        sid = self._session({"Authorization": "Bearer secret-key", "X-Draft-Tenant": "spoofed"})
+        tenant = get_session(sid)["tenant"]
+        assert tenant.startswith("key:") and "secret-key" not in tenant
+        assert self._status({"Authorization": "Bearer secret-key"})["session_id"] == sid
+        assert self._status({"X-Draft-Tenant": "spoofed"}).get("session_id") != sid
+        close_session(sid)
+
+    def test_invalid_tenant_header(self):
+        handler, wfile = make_handler("GET", "/status")
+        handler.headers["X-Draft-Tenant"] = "x" * 500
+        handler.do_GET()
+        assert parse_response(wfile)[0] == 400
+
+    def test_header_cannot_claim_api_key_tenant(self):
+        from draft_protocol.storage import get_session
+
+        sid = self._session({"Authorization": "Bearer owner-key"})
+        handler, wfile = make_handler("GET", "/status")
+        handler.headers["X-Draft-Tenant"] = get_session(sid)["tenant"]
+        handler.do_GET()
+        status, body = parse_response(wfile)
+        assert status == 400 and "reserved" in body["error"]
+        close_session(sid)
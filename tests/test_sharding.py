@@ -0,0 +1,182 @@
+"""Tests for sharded storage (DRAFT_DB_SHARDS) and shard rebalancing."""
+
+import os
+import sqlite3
+import tempfile
+
+if "DRAFT_DB_PATH" not in os.environ:
+    os.environ["DRAFT_DB_PATH"] = tempfile.mktemp(suffix=".db")
+
+import pytest
+
+from draft_protocol import maintenance, storage
+from draft_protocol.extension_points import clear_all_hooks, register_storage_path_hook
+
+
+@pytest.fixture
+def shards(tmp_path, monkeypatch):
+    """Three fresh shard files under tmp_path; returns their paths."""
+    monkeypatch.setattr(storage, "DB_PATH", tmp_path / "draft.db")
+    monkeypatch.setattr(storage, "DB_SHARDS", 3)
+    storage.init_db()
+    yield storage.shard_paths()
+    clear_all_hooks()
+
+
+def _ids_in(path) -> set[str]:
+    conn = sqlite3.connect(str(path))
+    try:
+        return {r[0] for r in conn.execute("SELECT id FROM sessions")}
+    finally:
+        conn.close()
+
+
+class TestHashRing:
+    def test_lookup_is_stable_and_balanced(self):
+        ring = storage.HashRing(["a", "b", "c"])
+        keys = [f"session-{i}" for i in range(6000)]
+        placed = [ring.lookup(k) for k in keys]
+        assert placed == [storage.HashRing(["a", "b", "c"]).lookup(k) for k in keys]
+        for shard in range(3):
+            assert 1200 < placed.count(shard) < 2800
+
+    def test_adding_a_shard_moves_a_minority_of_keys(self):
+        keys = [f"session-{i}" for i in range(6000)]
+        before = storage.HashRing(["a", "b", "c"])
+        after = storage.HashRing(["a", "b", "c", "d"])
+        moved = [k for k in keys if before.lookup(k) != after.lookup(k)]
+        assert len(moved) < len(keys) * 0.4
+        assert all(after.lookup(k) == 3 for k in moved)  # Keys only move to the new shard
+
+
+class TestRouting:
+    def test_shard_paths_sit_next_to_home(self, shards, tmp_path):
+        assert [p.name for p in shards] == ["draft.db", "draft-1.db", "draft-2.db"]
+
+    def test_sessions_live_in_their_shard(self, shards):
+        sids = [storage.create_session("TASK", f"s{i}") for i in range(30)]
+        for sid in sids:
+            assert sid in _ids_in(storage.path_for(sid))
+            assert storage.get_session(sid)["intent"]
+        assert all(_ids_in(p) for p in shards)  # 30 sessions reach every shard
+
+    def test_active_session_and_count_span_shards(self, shards):
+        sids = [storage.create_session("TASK", f"s{i}", tenant="t") for i in range(6)]
+        assert storage.get_active_session("t")["id"] == sids[-1]
+        assert storage.count_active_sessions() == 6
+        storage.update_session(sids[-1], closed_at=storage._now())
+        assert storage.get_active_session("t")["id"] == sids[-2]
+
+    def test_hook_with_session_id_maps_explicitly(self, shards):
+        register_storage_path_hook(lambda session_id: shards[2])
+        sid = storage.create_session("TASK", "pinned")
+        assert _ids_in(shards[2]) == {sid}
+        assert storage.get_session(sid)["intent"] == "pinned"
+
+    def test_legacy_hook_moves_home(self, shards, tmp_path):
+        register_storage_path_hook(lambda: tmp_path / "elsewhere" / "main.db")
+        assert [p.name for p in storage.shard_paths()] == ["main.db", "main-1.db", "main-2.db"]
+
+    def test_expiry_sweeps_every_shard(self, shards, monkeypatch):
+        sids = [storage.create_session("TRIVIAL", f"s{i}") for i in range(9)]
+        monkeypatch.setitem(storage.config.SESSION_IDLE_TTL, "TRIVIAL", 1)
+        for path in shards:
+            conn = sqlite3.connect(str(path))
+            conn.execute("UPDATE sessions SET updated_at = '2000-01-01T00:00:00+00:00'")
+            conn.commit()
+            conn.close()
+        assert sorted(storage.expire_sessions(limit=100)) == sorted(sids)
+
+
+class TestCrossShardAudit:
+    def test_ids_unique_and_merged_in_order(self, shards):
+        sids = [storage.create_session("TASK", f"s{i}") for i in range(12)]
+        storage.log_audit_many([(sid, "draft_map", "map", str(n)) for n, sid in enumerate(sids)])
+        rows = list(storage.iter_audit(batch_size=2))
+        ids = [r["id"] for r in rows]
+        assert len(rows) == 12 and ids == sorted(set(ids))
+        seen, cursor = [], 0
+        while cursor is not None:
+            page = storage.query_audit(after_id=cursor, limit=5)
+            seen += [e["id"] for e in page["entries"]]
+            cursor = page["next_cursor"]
+        assert seen == ids
+
+    def test_session_filter_reads_one_shard(self, shards):
+        sid = storage.create_session("TASK", "one")
+        storage.log_audit(sid, "draft_gate", "check", "x")
+        assert [r["detail"] for r in storage.iter_audit(sid)] == ["x"]
+
+    def test_archive_and_history_per_shard(self, shards, tmp_path):
+        per_shard = {p: 0 for p in shards}
+        while min(per_shard.values()) < 2:
+            sid = storage.create_session("TASK", "s")
+            storage.log_audit(sid, "draft_map", "map")
+            per_shard[storage.path_for(sid)] += 1
+        live = [r["id"] for r in storage.iter_audit()]
+        result = maintenance.archive_audit(retention_days=0, max_rows=1, archive_dir=tmp_path / "arc")
+        assert result["archived"] == len(live) - 3  # max_rows applies per shard
+        names = {p.name.split(".")[1] for p in (tmp_path / "arc").iterdir()}
+        assert names == {"ndjson", "s1", "s2"}
+        history = [r["id"] for r in maintenance.iter_audit_history(archive_dir=tmp_path / "arc")]
+        assert history == live
+
+
+class TestRebalance:
+    def test_growing_shards_moves_sessions_and_audit(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(storage, "DB_PATH", tmp_path / "draft.db")
+        monkeypatch.setattr(storage, "DB_SHARDS", 1)
+        sids = [storage.create_session("TASK", f"s{i}") for i in range(20)]
+        storage.log_audit_many([(sid, "draft_map", "map", sid) for sid in sids])
+        monkeypatch.setattr(storage, "DB_SHARDS", 3)
+
+        plan = maintenance.rebalance_shards(dry_run=True)
+        assert plan["moved"] > 0 and plan["audit_rows"] == 0
+        assert len(_ids_in(tmp_path / "draft.db")) == 20
+
+        result = maintenance.rebalance_shards()
+        assert result["moved"] == plan["moved"] == result["audit_rows"]
+        for sid in sids:
+            assert sid in _ids_in(storage.path_for(sid))
+            assert [r["detail"] for r in storage.iter_audit(sid)] == [sid]
+        assert maintenance.rebalance_shards()["moved"] == 0
+
+    def test_shrinking_drains_leftover_files(self, shards, tmp_path, monkeypatch):
+        sids = [storage.create_session("TASK", f"s{i}") for i in range(12)]
+        monkeypatch.setattr(storage, "DB_SHARDS", 1)
+        assert [p.name for p in storage.shard_files()] == ["draft.db", "draft-1.db", "draft-2.db"]
+        maintenance.rebalance_shards()
+        assert _ids_in(tmp_path / "draft.db") == set(sids)
+        stats = storage.shard_stats()
+        assert [s["sessions"] for s in stats] == [12, 0, 0]
+
+
+class TestPool:
+    def test_closed_connections_are_reused(self, shards):
+        conn = storage.get_db()
+        conn.close()
+        again = storage.get_db()
+        try:
+            assert again is conn
+        finally:
+            again.close()
+
+    def test_uncommitted_work_is_rolled_back_on_release(self, shards):
+        conn = storage.get_db()
+        conn.execute("INSERT INTO replay_keys (key, expires_at) VALUES ('k', 1)")
+        conn.close()
+        conn = storage.get_db()
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM replay_keys").fetchone()[0] == 0
+        finally:
+            conn.close()
+
+    def test_close_pools_drops_idle_connections(self, shards):
+        conn = storage.get_db()
+        conn.close()
+        storage.close_pools()
+        again = storage.get_db()
+        try:
+            assert again is not conn
+        finally:
+            again.close()
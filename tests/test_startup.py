@@ -0,0 +1,82 @@
+"""Tests for side-effect-free import and lazy initialization."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import draft_protocol
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+def _run(code: str, db_path: str) -> dict:
+    """Run code in a fresh interpreter; it must print one JSON object."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(SRC), env.get("PYTHONPATH", "")) if p)
+    env["DRAFT_DB_PATH"] = db_path
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+class TestSideEffectFreeImport:
+    def test_import_does_not_touch_filesystem(self):
+        db_path = os.path.join(tempfile.mkdtemp(), "missing", "draft.db")
+        result = _run(
+            "import json, os, draft_protocol\n"
+            "print(json.dumps({'dir': os.path.isdir(os.path.dirname(os.environ['DRAFT_DB_PATH']))}))",
+            db_path,
+        )
+        assert result["dir"] is False
+
+    def test_import_does_not_load_engine_or_fastmcp(self):
+        db_path = os.path.join(tempfile.mkdtemp(), "draft.db")
+        result = _run(
+            "import json, sys, draft_protocol\n"
+            "print(json.dumps(sorted(m for m in sys.modules if m.startswith(('draft_protocol', 'fastmcp')))))",
+            db_path,
+        )
+        assert result == ["draft_protocol"]
+
+    def test_engine_import_skips_hook_dispatch_and_inspect(self):
+        db_path = os.path.join(tempfile.mkdtemp(), "draft.db")
+        result = _run(
+            "import json, sys, draft_protocol.engine\n"
+            "print(json.dumps([m for m in ('draft_protocol.hooks', 'inspect', 'asyncio') if m in sys.modules]))",
+            db_path,
+        )
+        assert result == []
+
+    def test_db_created_on_first_use(self):
+        db_path = os.path.join(tempfile.mkdtemp(), "nested", "draft.db")
+        result = _run(
+            "import json, os, draft_protocol\n"
+            "sid = draft_protocol.create_session('TASK', 'build a parser')\n"
+            "print(json.dumps({'exists': os.path.exists(os.environ['DRAFT_DB_PATH']),"
+            " 'found': draft_protocol.get_session(sid) is not None}))",
+            db_path,
+        )
+        assert result == {"exists": True, "found": True}
+
+
+class TestLazyPublicAPI:
+    def test_all_names_resolve(self):
+        for name in draft_protocol.__all__:
+            assert getattr(draft_protocol, name) is not None
+
+    def test_lazy_attribute_is_engine_function(self):
+        from draft_protocol import engine
+
+        assert draft_protocol.classify_tier is engine.classify_tier
+
+    def test_dir_lists_lazy_names(self):
+        assert "classify_tier" in dir(draft_protocol)
+        assert "get_session" in dir(draft_protocol)
+
+    def test_unknown_attribute_raises(self):
+        with pytest.raises(AttributeError, match="does_not_exist"):
+            draft_protocol.does_not_exist  # noqa: B018
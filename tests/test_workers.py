@@ -0,0 +1,115 @@
+"""Tests for pre-fork REST workers."""
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+posix_only = pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork workers need os.fork")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _children(pid: int) -> set[int]:
+    path = Path(f"/proc/{pid}/task/{pid}/children")
+    if not path.exists():
+        pytest.skip("needs /proc/<pid>/task/<pid>/children")
+    return {int(p) for p in path.read_text().split()}
+
+
+def _post(port: int, path: str, body: dict) -> dict:
+    req = urllib.request.Request(
+        f"http://127.0.0.1:{port}{path}",
+        data=json.dumps(body).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return json.loads(resp.read())
+
+
+def _wait_until(predicate, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.05)
+    raise AssertionError("condition not met in time")
+
+
+@pytest.fixture
+def prefork():
+    port = _free_port()
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(SRC), env.get("PYTHONPATH", "")) if p)
+    env["DRAFT_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "draft.db")
+    env["DRAFT_DEV_MODE"] = "1"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "draft_protocol", "--transport", "rest", "--port", str(port), "--workers", "2"],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    def healthy():
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as resp:
+                return resp.status == 200
+        except OSError:
+            return False
+
+    try:
+        _wait_until(healthy)
+        yield proc, port
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+
+@posix_only
+class TestPrefork:
+    def test_workers_serve_concurrent_writes(self, prefork):
+        proc, port = prefork
+        assert len(_children(proc.pid)) == 2
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: _post(port, "/session", {"message": f"build feature {i}"}), range(40)))
+        assert len({r["session_id"] for r in results}) == 40
+
+    def test_dead_worker_is_replaced(self, prefork):
+        proc, port = prefork
+        victim = min(_children(proc.pid))
+        os.kill(victim, signal.SIGKILL)
+        _wait_until(lambda: victim not in _children(proc.pid) and len(_children(proc.pid)) == 2)
+        assert _post(port, "/classify", {"message": "hello"})["tier"]
+
+    def test_sighup_rolls_all_workers(self, prefork):
+        proc, _ = prefork
+        before = _children(proc.pid)
+        proc.send_signal(signal.SIGHUP)
+        _wait_until(lambda: len(_children(proc.pid)) == 2 and not (_children(proc.pid) & before))
+
+    def test_sigterm_drains_and_exits_cleanly(self, prefork):
+        proc, _ = prefork
+        children = _children(proc.pid)
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=15) == 0
+        for pid in children:
+            with pytest.raises(ProcessLookupError):
+                os.kill(pid, 0)